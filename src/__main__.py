@@ -0,0 +1,121 @@
+"""
+Point d'entrée unique du jeu : python -m src <commande>.
+
+    python -m src console [--size 10] [--seed 42]
+    python -m src pygame
+    python -m src simulate --games 1000 --a ai --b random --seed 7 [--workers 0] [--json] [--profile]
+    python -m src benchmark [--sizes 10 20] [--output bench.json] ...
+
+Chaque commande n'importe que ce dont elle a besoin : pygame n'est chargé que par
+`pygame`, NumPy que par les moteurs qui s'en servent, et multiprocessing que par une
+simulation sur plusieurs processus. Une simulation sans interface démarre ainsi en
+quelques dizaines de millisecondes, sans jamais initialiser SDL.
+"""
+import argparse
+import sys
+
+# Joueurs disponibles pour `simulate` : nom -> (module, classe), importés à la demande
+PLAYER_CLASSES = {
+    "ai": ("ai_player", "AIPlayer"),
+    "montecarlo": ("monte_carlo_ai", "MonteCarloAIPlayer"),
+    "random": ("simulation", "RandomPlayer"),
+}
+
+
+def _player_class(name: str) -> type:
+    import importlib
+    module_name, class_name = PLAYER_CLASSES[name]
+    return getattr(importlib.import_module(f".{module_name}", __package__), class_name)
+
+
+def run_console(args) -> int:
+    from .game import Game
+    Game(board_size=args.size, seed=args.seed).start_game()
+    return 0
+
+
+def run_pygame(args) -> int:
+    from .pygame_app import main
+    main()
+    return 0
+
+
+def run_simulate(args) -> int:
+    import json
+    from .simulation import simulate
+
+    stats = simulate(
+        args.games,
+        player_a=(_player_class(args.a), {}),
+        player_b=(_player_class(args.b), {}),
+        board_size=args.size,
+        workers=args.workers or None,
+        chunk_size=args.chunk_size,
+        seed=args.seed,
+        record_path=args.record,
+        profile=args.profile,
+    )
+    if args.json:
+        print(json.dumps(stats.as_dict(), ensure_ascii=False))
+        return 0
+    print(f"Parties jouées : {stats.games} ({stats.forfeits} par forfait)")
+    for player, name in enumerate((args.a, args.b)):
+        print(f"{name} : {stats.wins[player]} victoires ({stats.win_rate(player) * 100:.1f} %), "
+              f"{stats.mean_shots_to_win(player):.2f} tirs par victoire")
+    if stats.profile is not None:
+        print()
+        print(stats.profile.format_table())
+    return 0
+
+
+def run_benchmark(args, extra) -> int:
+    from .benchmark import main
+    return main(extra)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src", description="Bataille Navale.")
+    commands = parser.add_subparsers(dest="command", metavar="commande")
+    commands.required = True
+
+    console = commands.add_parser("console", help="partie contre l'IA dans le terminal")
+    console.add_argument("--size", type=int, default=10, help="taille des plateaux")
+    console.add_argument("--seed", type=int, default=None, help="graine de la partie")
+    console.set_defaults(run=run_console)
+
+    gui = commands.add_parser("pygame", help="partie contre l'IA dans une fenêtre Pygame")
+    gui.set_defaults(run=run_pygame)
+
+    sim = commands.add_parser("simulate", help="parties sans interface entre deux joueurs automatiques")
+    sim.add_argument("--games", type=int, default=1000, help="nombre de parties")
+    sim.add_argument("--a", choices=sorted(PLAYER_CLASSES), default="ai", help="joueur 0")
+    sim.add_argument("--b", choices=sorted(PLAYER_CLASSES), default="random", help="joueur 1")
+    sim.add_argument("--size", type=int, default=10, help="taille des plateaux")
+    sim.add_argument("--workers", type=int, default=1,
+                     help="nombre de processus (0 : un par processeur ; 1 : le processus courant)")
+    sim.add_argument("--chunk-size", type=int, default=100, help="parties envoyées à un processus en une fois")
+    sim.add_argument("--seed", type=int, default=None, help="graine racine des parties")
+    sim.add_argument("--record", metavar="FICHIER", help="enregistre les parties dans FICHIER")
+    sim.add_argument("--profile", action="store_true", help="mesure chaque phase de décision des IA")
+    sim.add_argument("--json", action="store_true", help="écrit les résultats en JSON")
+    sim.set_defaults(run=run_simulate)
+
+    bench = commands.add_parser("benchmark", help="banc d'essai (options de python -m src.benchmark)",
+                                add_help=False)
+    bench.set_defaults(run=run_benchmark)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    # Les options de `benchmark` sont celles de python -m src.benchmark, transmises telles quelles
+    args, extra = parser.parse_known_args(argv)
+    if args.run is run_benchmark:
+        return run_benchmark(args, extra)
+    if extra:
+        parser.error(f"arguments non reconnus : {' '.join(extra)}")
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,91 @@
-import random
-from typing import Tuple, List, Optional
-from .player import Player
+import time
+from array import array
+from typing import Dict, Tuple, List, Optional
+from .player import NoMovesLeft, Player
 from .ship import Ship 
+from .events import AIModeChanged, AIStrategyAdapted, EventBus, FleetPlaced
+from .placement_counts import make_placement_counts
+from .coordinate_set import CoordinateSet, IndexedSet, full_board_set
+from .fleet_sampler import sample_fleet
+from .profiling import AIProfile
+from .target_solver import ClusterTargetSolver
+from .transposition import TranspositionTable, shared_table
+
+# Modes de décision de l'IA, publiés dans les événements AIModeChanged
+MODE_TARGET = "ciblage actif"
+MODE_ENDGAME = "fin de jeu"
+MODE_PROBABILITY = "grille de probabilités"
+MODE_PARITY = "parité"
+MODE_RANDOM = "aléatoire"
+# Phase de mise à jour après un tir, mesurée avec les modes dans un AIProfile
+PHASE_PROCESS = "process_shot_result"
+# Phase du choix anticipé du coup de repli, à chaque coup soumis à une échéance (qu'il soit joué ou non)
+PHASE_FALLBACK = "repli anticipé"
+
+# Niveaux de raffinement atteints par un coup soumis à une échéance (AIPlayer.last_refinement)
+REFINE_FALLBACK = "repli"     # Seul le coup de repli (parité ou hasard) a pu être choisi
+REFINE_PARTIAL = "partiel"    # La recherche de la meilleure case a été interrompue par l'échéance
+REFINE_COMPLETE = "complet"   # Toute la logique de décision a été déroulée
+
+# Nombre de cases examinées entre deux lectures de l'horloge pendant la chasse
+DEADLINE_CHECK_INTERVAL = 64
 
 class AIPlayer(Player):
     """
     Implémentation d'un joueur IA avec une logique de tir plus avancée (chasse et ciblage).
     """
-    def __init__(self, name: str = "IA", board_size: int = 10):
-        super().__init__(name, board_size)
+    def __init__(self, name: str = "IA", board_size: int = 10,
+                 events: Optional[EventBus] = None, uniform_placement: bool = False,
+                 endgame_threshold: int = 3, rng=None,
+                 transposition_table: Optional[TranspositionTable] = None,
+                 profile: Optional[AIProfile] = None, probability_engine: str = "auto"):
+        """
+        Args:
+            name (str): Le nom de l'IA.
+            board_size (int): La taille des plateaux.
+            events (EventBus, optional): Le bus sur lequel publier les décisions de l'IA.
+            uniform_placement (bool): Tire la disposition de la flotte exactement au hasard parmi
+                                      toutes les dispositions valides (pondérées par l'écart aux bords),
+                                      si le tirage par rejet aboutit (voir place_ships).
+            endgame_threshold (int): Points de vie adverses restants à partir desquels l'IA passe
+                                     en mode fin de jeu.
+            rng (random.Random, optional): Le générateur aléatoire de l'IA (le module random par défaut).
+            transposition_table (TranspositionTable, optional): Cache des positions de chasse déjà
+                                                                calculées (par défaut, la table partagée
+                                                                par toutes les IA du processus).
+            profile (AIProfile, optional): Reçoit le temps passé et le travail fait dans chaque
+                                           phase de décision (aucune mesure par défaut).
+            probability_engine (str): Moteur de la grille complète (probability_grid) : "numpy",
+                                      "python", ou "auto" (NumPy s'il est installé).
+        """
+        super().__init__(name, board_size, events, rng)
+        self.uniform_placement = uniform_placement
+        self.uniform_fleet = False # La flotte placée a-t-elle été tirée exactement au hasard ?
+        self.current_mode: Optional[str] = None # Dernier mode de décision utilisé
+        self.last_refinement: str = REFINE_COMPLETE # Niveau de raffinement du dernier coup
+        # Densité de placements de la flotte adverse (supposée identique à la mienne),
+        # mise à jour à chaque résultat de tir plutôt que recalculée à chaque coup
+        self.probability_counts = make_placement_counts(board_size, [ship.length for ship in self.ships_to_place])
+        self.transposition_table = transposition_table if transposition_table is not None else shared_table()
+        self.profile = profile
+        self.probability_engine = probability_engine
+        self._density_engine = None # Résolu au premier calcul de la grille complète
+        self.hunt_cells_evaluated: int = 0 # Cases examinées par les parcours de la grille de densité
         
-        self.untried_coordinates: List[Tuple[int, int]] = []
+        # Cases pas encore tirées : appartenance, retrait et tirage au hasard en O(1)
+        self.untried_coordinates: CoordinateSet = CoordinateSet()
         self._initialize_untried_coordinates()
 
-        self.hits_to_process: List[Tuple[int, int]] = [] 
-        self.potential_next_shots: List[Tuple[int, int]] = [] 
-        self.sunk_ships_coords: List[Tuple[int, int]] = [] 
-
-        self.current_target_direction: Optional[str] = None
-        self.current_hit_series: List[Tuple[int, int]] = []
+        # Hits pas encore attribués à un navire coulé, regroupés en grappes pour le ciblage
+        self.target_solver = ClusterTargetSolver(board_size)
+        self.last_sunk_cells: List[Tuple[int, int]] = [] # Cases du dernier navire coulé
 
         # Grille pour suivre les tirs de l'adversaire sur le plateau de l'IA
-        self.opponent_shot_tracking_grid: List[List[str]] = [['U' for _ in range(board_size)] for _ in range(board_size)]
+        # Creuse : seules les cases visées sont notées, les autres restent 'U' (Untouched)
+        self.opponent_shot_tracking_grid: Dict[Tuple[int, int], str] = {}
         self.opponent_shots_made: List[Tuple[int, int]] = []
 
-        self.endgame_threshold: int = 3 
+        self.endgame_threshold: int = endgame_threshold
         
         # Statistiques pour l'adaptation dynamique
         self.shots_fired: int = 0
@@ -39,357 +100,312 @@ class AIPlayer(Player):
 
     def _initialize_untried_coordinates(self):
         """
-        Initialise la liste de toutes les coordonnées non encore tirées.
-        Utilise une stratégie en damier pour la phase de recherche.
+        Initialise l'ensemble de toutes les coordonnées non encore tirées.
+        Utilise une stratégie en damier pour la phase de recherche : l'ensemble est
+        partitionné par parité (r+c) % 2 et chaque couleur du damier est mélangée séparément.
         """
-        checkered_coords_even = [] # (r+c) % 2 == 0
-        checkered_coords_odd = [] # (r+c) % 2 == 1
-
-        for r in range(self.own_board.size):
-            for c in range(self.own_board.size):
-                if (r + c) % 2 == 0:
-                    checkered_coords_even.append((r, c))
-                else:
-                    checkered_coords_odd.append((r, c))
-        
-        # Mélange les deux listes séparément pour introduire un peu d'aléatoire
-        # mais toujours favoriser un pattern en damier
-        random.shuffle(checkered_coords_even)
-        random.shuffle(checkered_coords_odd)
-
-        # L'IA commencera par les cases 'paires' pour une meilleure couverture initiale
-        self.untried_coordinates = checkered_coords_even + checkered_coords_odd
-        # Si on veut alterner, on peut faire:
-        # self.untried_coordinates = [None] * (self.own_board.size * self.own_board.size)
-        # i, j = 0, 0
-        # for k in range(len(checkered_coords_even)):
-        #     self.untried_coordinates[i] = checkered_coords_even[k]
-        #     i += 2
-        # for k in range(len(checkered_coords_odd)):
-        #     self.untried_coordinates[j+1] = checkered_coords_odd[k]
-        #     j += 2
-        # (Cette alternance n'est pas strictement nécessaire pour la robustesse, le shuffle est suffisant)
+        # Mélange chaque parité séparément pour introduire un peu d'aléatoire
+        # mais toujours favoriser un pattern en damier (sur un très grand plateau, l'ensemble
+        # ne garde que les cases tirées et tire les autres au sort directement)
+        self.untried_coordinates = full_board_set(self.own_board.size, self.rng)
 
     def place_ships(self):
         """
         L'IA place ses navires de manière stratégique pour maximiser ses chances de survie.
-        """
-        # Utilise une copie mélangée pour éviter de toujours placer les navires au même endroit
-        ships_to_place_shuffled = list(self.ships_to_place)
-        random.shuffle(ships_to_place_shuffled)
+        Chaque navire est tiré directement parmi ses placements libres (avec retour arrière
+        si la flotte est dense), les gros navires étant tenus de préférence loin des bords,
+        souvent ciblés en premier.
 
-        # Stratégie de placement : éviter les patterns prévisibles
-        # 1. Placer les gros navires en premier (plus difficiles à placer)
-        # 2. Éviter les coins et les bords (souvent ciblés en premier)
-        # 3. Créer des "zones mortes" pour tromper l'adversaire
-        
-        for ship in ships_to_place_shuffled:
-            placed = False
-            attempts = 0
-            max_attempts = 1000  # Éviter les boucles infinies
-            
-            while not placed and attempts < max_attempts:
-                attempts += 1
-                
-                # Stratégie de placement intelligente
-                if ship.length >= 4:  # Gros navires
-                    # Éviter les bords pour les gros navires
-                    r = random.randint(2, self.own_board.size - 3)
-                    c = random.randint(2, self.own_board.size - 3)
-                else:  # Petits navires
-                    # Plus de liberté pour les petits navires
-                    r = random.randint(0, self.own_board.size - 1)
-                    c = random.randint(0, self.own_board.size - 1)
-                
-                orientation = random.choice(['H', 'V'])
-                
-                # Vérifier si le placement est valide
-                placed = self.own_board.place_ship(ship, (r, c), orientation)
-                
-                # Si pas placé après beaucoup d'essais, relâcher les contraintes
-                if not placed and attempts > 500:
-                    r = random.randint(0, self.own_board.size - 1)
-                    c = random.randint(0, self.own_board.size - 1)
-                    orientation = random.choice(['H', 'V'])
-                    placed = self.own_board.place_ship(ship, (r, c), orientation)
-        
-        if attempts >= max_attempts:
-            print(f"ATTENTION: Impossible de placer tous les navires de {self.name} !")
-        
-        print(f"Tous les navires de {self.name} sont placés. Préparez-vous !")
-        # Note : Je n'affiche pas mon propre plateau, c'est un secret !
+        Avec uniform_placement, si le tirage exact par rejet échoue (flotte très dense pour le
+        plateau), la disposition vient du retour arrière, et uniform_fleet vaut False.
 
-    def _get_occupied_own_coordinates(self) -> List[Tuple[int, int]]:
+        Raises:
+            FleetPlacementError: La flotte ne tient pas sur le plateau (aucun navire n'est placé).
         """
-        Je récupère la liste de toutes les coordonnées où se trouvent MES PROPRES navires.
-        C'est pour être sûr de ne JAMAIS tirer sur moi-même. Ce serait bête, non ?
-        """
-        occupied_coords = []
-        for ship in self.ships_to_place:
-            occupied_coords.extend(ship.coordinates)
-        return occupied_coords
+        size, lengths = self.own_board.size, [ship.length for ship in self.ships_to_place]
+        layout = None
+        if self.uniform_placement:
+            layout = sample_fleet(size, lengths, self.rng, avoid_edges=True, uniform=True)
+        self.uniform_fleet = layout is not None
+        if layout is None:
+            layout = sample_fleet(size, lengths, self.rng, avoid_edges=True)
+        for ship, (r, c, orientation) in zip(self.ships_to_place, layout):
+            self.own_board.place_ship(ship, (r, c), orientation)
+        
+        if self.events.sinks:
+            self.events.emit(FleetPlaced(self.name, len(self.own_board.ships) == len(self.ships_to_place)))
+        # Note : Je n'affiche pas mon propre plateau, c'est un secret !
 
     def update_untried_coordinates_after_placement(self):
         """
-        Une fois que j'ai placé tous mes navires, je nettoie ma liste de cibles potentielles.
-        Je retire toutes les cases où se trouvent MES PROPRES navires.
-        Je ne vais quand même pas me saboter !
+        Une fois que j'ai placé tous mes navires, je remélange ma liste de cibles potentielles.
+        Mes navires sont sur MON plateau, alors que je tire sur celui de l'adversaire :
+        il n'y a donc aucune case à retirer (les retirer m'empêchait de finir certaines parties).
         """
-        own_ship_coords = self._get_occupied_own_coordinates()
-        self.untried_coordinates = [
-            coord for coord in self.untried_coordinates 
-            if coord not in own_ship_coords
-        ]
         # Je mélange à nouveau, juste pour le plaisir.
-        random.shuffle(self.untried_coordinates)
+        self.untried_coordinates.shuffle(self.rng)
 
     def analyze_opponent_shot(self, shot_coord: Tuple[int, int], result: str):
         """
         Ah, l'adversaire a tiré ! Laissez-moi noter ça sur ma carte secrète.
         C'est super important pour ma stratégie future, croyez-moi !
         """
-        r, c = shot_coord
         self.opponent_shots_made.append(shot_coord) # Je garde une trace de TOUS vos tirs
 
         # Et je mets à jour ma grille de suivi : X si touché, O si raté.
         if result == 'hit' or result == 'sunk':
-            self.opponent_shot_tracking_grid[r][c] = 'X'
+            self.opponent_shot_tracking_grid[shot_coord] = 'X'
         elif result == 'miss':
-            self.opponent_shot_tracking_grid[r][c] = 'O'
+            self.opponent_shot_tracking_grid[shot_coord] = 'O'
         # Si vous n'avez pas tiré dans une zone, elle reste 'U' (Untouched).
         # Et ça, c'est une information précieuse pour moi...
 
-    def get_shot_coordinates(self, opponent_remaining_hp: Optional[int] = None) -> Tuple[int, int]:
+    def get_shot_coordinates(self, opponent_remaining_hp: Optional[int] = None,
+                             budget_ms: Optional[float] = None,
+                             deadline: Optional[float] = None) -> Tuple[int, int]:
         """
         C'est l'heure de mon coup ! Je vais décider où tirer.
         Ma logique est en plusieurs étapes, par ordre de priorité :
 
-        1.  Je finis le navire que j'ai déjà bien entamé (mode "ciblage actif").
-        2.  Si la partie est presque finie (vous avez peu de points de vie),
-            je reviens sur n'importe quel autre navire que j'ai touché par le passé,
-            pour l'achever (mode "fin de jeu").
+        1.  Je finis les navires que j'ai touchés sans les couler (mode "ciblage actif") :
+            mes hits non résolus sont regroupés en grappes, et je tire sur la case de la plus
+            grande grappe que le plus de placements des navires restants peuvent couvrir.
+        2.  Si la partie est presque finie (vous avez peu de points de vie), je pèse
+            toutes les grappes à la fois pour achever le navire le plus probable (mode "fin de jeu").
         3.  Sinon, je pars à la "chasse" : je cherche de nouveaux navires,
             en privilégiant les zones où VOUS n'avez pas tiré (mode "chasse intelligente").
+
+        Avec une échéance, je choisis d'abord un coup de repli immédiat (parité, sinon hasard),
+        puis je déroule les étapes ci-dessus tant qu'il reste du temps : le coup est rendu au
+        plus tard à l'échéance (à une évaluation de grappe ou DEADLINE_CHECK_INTERVAL cases près),
+        et last_refinement indique jusqu'où la recherche est allée.
+
+        Args:
+            opponent_remaining_hp (int, optional): Les parties de navires encore à flot chez l'adversaire.
+            budget_ms (float, optional): Temps accordé pour ce coup, en millisecondes.
+            deadline (float, optional): Échéance absolue, sur l'horloge time.perf_counter().
+                                        Si les deux sont donnés, la plus proche l'emporte.
         """
-        # Obtenir les coordonnées de mes propres navires pour éviter de me tirer dessus
-        own_ship_coords = self._get_occupied_own_coordinates()
-
-        # Priorité 1: Phase de ciblage active
-        # Si j'ai des hits à traiter ET une série de hits en cours (ou que j'initialise une nouvelle série)
-        while self.hits_to_process:
-            # Si ma série de hits actuelle est vide OU que le premier hit de ma série n'est plus dans mes hits à traiter
-            # (ça peut arriver si un bateau est coulé et que hits_to_process n'a pas été entièrement nettoyé,
-            # ou si current_hit_series a été vidée et qu'il reste d'autres hits à explorer).
-            if not self.current_hit_series or self.current_hit_series[0] not in self.hits_to_process:
-                # Je me réinitialise pour cibler le premier hit non résolu.
-                self.current_hit_series = [self.hits_to_process[0]]
-                # Je cherche les voisins autour de ce hit, en évitant mes propres bateaux.
-                self.potential_next_shots = [
-                    coord for coord in self._get_surrounding_coordinates(self.hits_to_process[0][0], self.hits_to_process[0][1])
-                    if coord in self.untried_coordinates and coord not in own_ship_coords
-                ]
-                random.shuffle(self.potential_next_shots)
-                self.current_target_direction = None # Réinitialiser la direction car je change de cible "principale"
-
-            # Si j'ai au moins deux hits dans ma série et que je n'ai plus de tirs potentiels,
-            # c'est que je dois déduire la direction du navire pour continuer.
-            if len(self.current_hit_series) >= 2 and not self.potential_next_shots:
-                self._determine_and_extend_direction() # J'affine ma stratégie pour prolonger la ligne
-
-            # Si après tout ça, ma liste de tirs potentiels est vide (j'ai tout exploré autour du hit initial
-            # ou mes prolongements n'ont rien donné), je reprends autour du DERNIER hit de ma série.
-            if not self.potential_next_shots:
-                last_series_hit = self.current_hit_series[-1]
-                self.potential_next_shots = [
-                    coord for coord in self._get_surrounding_coordinates(last_series_hit[0], last_series_hit[1])
-                    if coord in self.untried_coordinates and coord not in own_ship_coords # Toujours filtrer mes bateaux !
-                ]
-                random.shuffle(self.potential_next_shots)
-
-            # Si j'ai des tirs potentiels, j'en prends un et je le joue.
-            if self.potential_next_shots:
-                shot_coord = self.potential_next_shots.pop(0)
-                if shot_coord in self.untried_coordinates: # S'assurer que je ne l'ai pas déjà tiré par accident
-                    self.untried_coordinates.remove(shot_coord)
-                    print(f"{self.name} cible à {chr(65 + shot_coord[1])}{shot_coord[0] + 1} (mode ciblage actif) !")
-                    return shot_coord
-                self.potential_next_shots = [] # Si le coup n'est plus valide, vider pour recalculer
-
-            # Si je n'ai plus de tirs potentiels pour le hit en cours, ça veut dire que ce hit
-            # ne m'a pas mené à couler un bateau (peut-être un coup isolé ou un navire coulé par un autre moyen).
-            # Je le retire donc de ma liste de hits à traiter et je réinitialise ma série.
-            if self.hits_to_process: # S'assurer qu'il y a quelque chose à pop
-                 self.hits_to_process.pop(0)
-            self.current_hit_series = []
-            self.current_target_direction = None
-            self.potential_next_shots = []
-
-        # Priorité 2: Stratégie de fin de jeu (mon mode "finisher" !)
-        # Si vous n'avez presque plus de vie ET qu'il me reste des hits "dormants" (navires touchés mais pas coulés).
-        if opponent_remaining_hp is not None and opponent_remaining_hp <= self.endgame_threshold:
-            # Je filtre les hits qui n'ont pas encore été traités et qui ne sont pas des bateaux coulés.
-            dormant_hits = [
-                h for h in self.hits_to_process if h not in self.sunk_ships_coords
-            ]
-            random.shuffle(dormant_hits) # Un peu d'aléatoire pour rester imprévisible
-
-            if dormant_hits:
-                # Je choisis le premier hit dormant et je le traite comme un nouveau point de départ.
-                first_dormant_hit = dormant_hits[0]
-                self.current_hit_series = [first_dormant_hit] # Je le mets dans ma série actuelle
-                self.potential_next_shots = [
-                    coord for coord in self._get_surrounding_coordinates(first_dormant_hit[0], first_dormant_hit[1])
-                    if coord in self.untried_coordinates and coord not in own_ship_coords # Toujours mes propres bateaux... non !
-                ]
-                random.shuffle(self.potential_next_shots)
-
-                if self.potential_next_shots:
-                    shot_coord = self.potential_next_shots.pop(0)
-                    if shot_coord in self.untried_coordinates:
-                        self.untried_coordinates.remove(shot_coord)
-                        print(f"{self.name} (MODE FIN DE JEU) cible un ancien hit à {chr(65 + shot_coord[1])}{shot_coord[0] + 1} !")
-                        return shot_coord
-                    self.potential_next_shots = [] # Si le coup n'est plus valide
+        profile = self.profile
+        deadline = _move_deadline(budget_ms, deadline)
+        fallback = None
+        if deadline is not None:
+            if profile is not None:
+                start = time.perf_counter()
+            fallback = self._fallback_shot()
+            if profile is not None:
+                profile.record(PHASE_FALLBACK, time.perf_counter() - start)
+            if time.perf_counter() >= deadline:
+                return self._play_fallback(fallback, REFINE_FALLBACK)
+
+        # Priorités 1 et 2: Ciblage des grappes de hits non résolus
+        endgame = opponent_remaining_hp is not None and opponent_remaining_hp <= self.endgame_threshold
+        solver = self.target_solver
+        targeting = profile is not None and bool(solver.unresolved)
+        if targeting:
+            start, cells, placements = time.perf_counter(), solver.cells_evaluated, solver.placements_evaluated
+        targets = solver.best_targets(
+            self.target_board, self.probability_counts.remaining_lengths, all_clusters=endgame
+        )
+        targets = [coord for coord in targets if coord in self.untried_coordinates]
+        if targeting:
+            profile.record(MODE_ENDGAME if endgame else MODE_TARGET, time.perf_counter() - start,
+                           solver.cells_evaluated - cells, solver.placements_evaluated - placements)
+        if targets:
+            shot_coord = self.rng.choice(targets)
+            self.untried_coordinates.remove(shot_coord)
+            return self._select_shot(shot_coord, MODE_ENDGAME if endgame else MODE_TARGET)
+
+        if deadline is not None and time.perf_counter() >= deadline:
+            return self._play_fallback(fallback, REFINE_FALLBACK)
 
         # Priorité 3: Phase de chasse améliorée (je cherche de nouvelles cibles intelligemment)
-        # Utiliser la grille de probabilités sophistiquée
-        prob_grid = self._compute_probability_grid()
-        
-        # Trouver les cases avec la probabilité maximale
-        max_prob = 0
-        best_coords = []
-        
-        for r in range(self.own_board.size):
-            for c in range(self.own_board.size):
-                if (r, c) in self.untried_coordinates and (r, c) not in own_ship_coords:
-                    if prob_grid[r][c] > max_prob:
-                        max_prob = prob_grid[r][c]
-                        best_coords = [(r, c)]
-                    elif prob_grid[r][c] == max_prob and max_prob > 0:
-                        best_coords.append((r, c))
+        if profile is not None:
+            start, cells = time.perf_counter(), self.hunt_cells_evaluated
+        max_prob, best_coords, complete = self._best_hunt_coordinates(deadline)
+        if profile is not None:
+            profile.record(MODE_PROBABILITY, time.perf_counter() - start, self.hunt_cells_evaluated - cells)
+        refinement = REFINE_COMPLETE if complete else REFINE_PARTIAL
         
         # Si on a des cases avec une probabilité élevée, les utiliser
         if best_coords and max_prob > 0:
+            if not complete:
+                # Recherche interrompue : garder le repli s'il vaut mieux que les cases examinées
+                r, c = fallback[0]
+                if self.probability_counts.value(r * self.probability_counts.size + c) >= max_prob:
+                    return self._play_fallback(fallback, refinement)
             # Privilégier la parité parmi les meilleures cases
             parity_best = [(r, c) for (r, c) in best_coords if (r + c) % 2 == 0]
             candidates = parity_best if parity_best else best_coords
-            shot_coord = random.choice(candidates)
+            shot_coord = self.rng.choice(candidates)
             self.untried_coordinates.remove(shot_coord)
-            print(f"{self.name} utilise la grille de probabilités avancée à {chr(65 + shot_coord[1])}{shot_coord[0] + 1} !")
-            return shot_coord
-        
-        # Si pas de probabilités élevées, utiliser la stratégie de parité optimisée
+            return self._select_shot(shot_coord, MODE_PROBABILITY, refinement)
+
+        # Si pas de probabilités élevées, utiliser la stratégie de parité optimisée, sinon un tir
+        # aléatoire : c'est justement le coup de repli, s'il a déjà été choisi
+        if fallback is not None:
+            return self._play_fallback(fallback, refinement)
+        if profile is not None:
+            start = time.perf_counter()
+        fallback = self._fallback_shot()
+        return self._play_fallback(fallback, refinement, 0.0 if profile is None else time.perf_counter() - start)
+
+    def _fallback_shot(self) -> Tuple[Tuple[int, int], str]:
+        """
+        Le coup de repli : une case de la parité la plus fournie (ou n'importe quelle case
+        non tirée), choisie en temps constant. Le mode n'est mesuré que si le coup est joué
+        (voir _play_fallback).
+        """
         optimal_parity_coords = self._get_optimal_parity_coordinates()
         if optimal_parity_coords:
-            shot_coord = random.choice(optimal_parity_coords)
-            self.untried_coordinates.remove(shot_coord)
-            print(f"{self.name} utilise la stratégie de parité optimisée à {chr(65 + shot_coord[1])}{shot_coord[0] + 1} !")
-            return shot_coord
-        
-        # Fallback : tir aléatoire parmi les coordonnées non essayées
-        available_coords = [coord for coord in self.untried_coordinates if coord not in own_ship_coords]
-        if available_coords:
-            shot_coord = random.choice(available_coords)
-            self.untried_coordinates.remove(shot_coord)
-            print(f"{self.name} utilise un tir aléatoire à {chr(65 + shot_coord[1])}{shot_coord[0] + 1} !")
-            return shot_coord
-        
-        # Si, par un miracle ou un bug, je n'ai plus aucune coordonnée à tirer,
-        # c'est que quelque chose ne va pas.
-        raise Exception("L'IA n'a plus de coups possibles ! (Tous les navires devraient être coulés ou jeu buggé)")
-
-    def _get_surrounding_coordinates(self, r: int, c: int) -> List[Tuple[int, int]]:
-        """Retourne les coordonnées adjacentes (haut, bas, gauche, droite) d'une cellule."""
-        coords = []
-        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]: # Haut, Bas, Gauche, Droite
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < self.own_board.size and 0 <= nc < self.own_board.size:
-                coords.append((nr, nc))
-        return coords
-
-    def _determine_and_extend_direction(self):
-        """
-        Détermine ou confirme la direction d'un navire touché et génère les tirs suivants.
-        """
-        print("IA: Début _determine_and_extend_direction.")
-        if len(self.current_hit_series) < 2:
-            # Pas assez de hits pour déterminer une direction claire
-            # Ceci est géré par _generate_surrounding_shots si c'est le premier hit.
-            return 
-
-        # Triez la série pour garantir que les coordonnées sont dans l'ordre (pour déterminer la direction)
-        self.current_hit_series.sort() 
-        first_hit = self.current_hit_series[0]
-        second_hit = self.current_hit_series[1]
-
-        # Déterminer la direction
-        if first_hit[0] == second_hit[0]: # Même ligne -> Horizontal
-            self.current_target_direction = 'H'
-        elif first_hit[1] == second_hit[1]: # Même colonne -> Vertical
-            self.current_target_direction = 'V'
+            fallback = optimal_parity_coords.choice(self.rng), MODE_PARITY
+        elif self.untried_coordinates:
+            fallback = self.untried_coordinates.choice(self.rng), MODE_RANDOM
         else:
-            # Si les hits ne sont ni sur la même ligne ni sur la même colonne,
-            # c'est une situation inattendue pour une ligne droite de navire.
-            # Cela pourrait signifier un bug, ou que hits_to_process n'est pas bien géré.
-            # On réinitialise la direction et on tente autour du dernier hit.
-            self.current_target_direction = None
-            self._generate_surrounding_shots(self.current_hit_series[-1])
-            return
+            # Si, par un miracle ou un bug, je n'ai plus aucune coordonnée à tirer,
+            # c'est que quelque chose ne va pas.
+            raise NoMovesLeft("L'IA n'a plus de coups possibles ! (Tous les navires devraient être coulés ou jeu buggé)")
+        return fallback
 
-        # Tenter d'étendre la série dans les deux directions (avant et après)
-        self.potential_next_shots = []
-        last_hit = self.current_hit_series[-1]
-        
-        # Extensions dans la direction déterminée
-        if self.current_target_direction == 'H':
-            # Vers la droite
-            next_c_right = last_hit[1] + 1
-            if next_c_right < self.own_board.size and (last_hit[0], next_c_right) in self.untried_coordinates:
-                self.potential_next_shots.append((last_hit[0], next_c_right))
-            # Vers la gauche (à partir du premier hit de la série)
-            next_c_left = self.current_hit_series[0][1] - 1
-            if next_c_left >= 0 and (self.current_hit_series[0][0], next_c_left) in self.untried_coordinates:
-                self.potential_next_shots.append((self.current_hit_series[0][0], next_c_left))
-        elif self.current_target_direction == 'V':
-            # Vers le bas
-            next_r_down = last_hit[0] + 1
-            if next_r_down < self.own_board.size and (next_r_down, last_hit[1]) in self.untried_coordinates:
-                self.potential_next_shots.append((next_r_down, last_hit[1]))
-            # Vers le haut (à partir du premier hit de la série)
-            next_r_up = self.current_hit_series[0][0] - 1
-            if next_r_up >= 0 and (next_r_up, self.current_hit_series[0][1]) in self.untried_coordinates:
-                self.potential_next_shots.append((next_r_up, self.current_hit_series[0][1]))
-
-        # Filtrez les tirs déjà faits ou hors limites
-        self.potential_next_shots = [
-            coord for coord in self.potential_next_shots
-            if 0 <= coord[0] < self.own_board.size and 0 <= coord[1] < self.own_board.size and \
-               self.target_board.grid[coord[0]][coord[1]] == '~' # Assure que ce n'est pas déjà tiré
-        ]
-        random.shuffle(self.potential_next_shots) # Mélange pour un peu d'aléatoire
-        print("IA: Fin _determine_and_extend_direction.")
-
-    def _generate_surrounding_shots(self, hit_coord: Tuple[int, int]):
-        """Génère les tirs autour d'une coordonnée touchée (utilisé pour le premier hit d'un navire)."""
-        print(f"IA: Début _generate_surrounding_shots pour {hit_coord}.")
-        r, c = hit_coord
-        potential_coords = self._get_surrounding_coordinates(r, c)
-        
-        # Filtre et ajoute aux tirs potentiels
-        self.potential_next_shots.extend([
-            coord for coord in potential_coords 
-            if coord in self.untried_coordinates # Doit être une coordonnée non encore essayée
-            and self.target_board.grid[coord[0]][coord[1]] == '~' # Ne pas tirer sur des cases déjà connues
-        ])
-        random.shuffle(self.potential_next_shots)
-        print("IA: Fin _generate_surrounding_shots.")
+    def _play_fallback(self, fallback: Tuple[Tuple[int, int], str], refinement: str,
+                       elapsed: float = 0.0) -> Tuple[int, int]:
+        """
+        Joue le coup de repli, et note son mode (parité ou hasard) dans le profil. `elapsed`
+        est le temps de son choix, nul s'il a été anticipé (il est alors compté dans PHASE_FALLBACK).
+        """
+        shot_coord, mode = fallback
+        if self.profile is not None:
+            self.profile.record(mode, elapsed)
+        self.untried_coordinates.remove(shot_coord)
+        return self._select_shot(shot_coord, mode, refinement)
+
+    def _best_hunt_coordinates(self, deadline: Optional[float] = None) -> Tuple[int, List[Tuple[int, int]], bool]:
+        """
+        Les cases non tirées de densité maximale, cette densité, et si toutes les cases ont
+        été examinées.
+
+        La densité de placements est maintenue de tir en tir par process_shot_result, avec
+        les cases rangées par densité brute : il suffit de lire les niveaux les plus hauts,
+        sans parcourir le plateau. Le résultat (densité maximale et index plats des cases)
+        est gardé dans la table de transposition sous le hachage de Zobrist de la position,
+        et les cases sont triées pour que le choix aléatoire parmi elles ne dépende pas du cache. Si l'échéance tombe pendant le
+        parcours, on s'arrête sur les cases déjà examinées (sans rien garder). Sur un plateau
+        creux, on s'arrête aussi après counts.tie_limit cases ex aequo au niveau le plus
+        haut, parcourues dans un ordre mélangé.
+        """
+        counts = self.probability_counts
+        size = counts.size
+        key = ("chasse", size, counts.zobrist)
+        entry = self.transposition_table.get(key)
+        if entry is not None:
+            max_prob, cached = entry
+            best_coords = [coord for coord in (divmod(index, size) for index in cached)
+                           if coord in self.untried_coordinates]
+            if best_coords or not cached:
+                return max_prob, best_coords, True
+
+        untried = self.untried_coordinates
+        tie_limit = counts.tie_limit
+        # Trouver les cases avec la probabilité maximale, en ne lisant que les niveaux de
+        # densité brute qui peuvent encore l'atteindre
+        max_prob = 0
+        best_coords = []
+        examined = 0
+
+        for level, cells in counts.candidates():
+            if level < max_prob or (tie_limit is not None and max_prob == level and len(best_coords) >= tie_limit):
+                break
+            for index in cells:
+                coord = divmod(index, size)
+                if coord not in untried:
+                    continue
+                examined += 1
+                prob = counts.value(index)
+                if prob > max_prob:
+                    max_prob = prob
+                    best_coords = [coord]
+                elif prob == max_prob and max_prob > 0:
+                    best_coords.append(coord)
+                    # Aucune case restante ne dépasse ce niveau : assez d'ex aequo
+                    if tie_limit is not None and max_prob == level and len(best_coords) >= tie_limit:
+                        break
+                if deadline is not None and examined % DEADLINE_CHECK_INTERVAL == 0 and time.perf_counter() >= deadline:
+                    self.hunt_cells_evaluated += examined
+                    best_coords.sort()
+                    return max_prob, best_coords, False
+        self.hunt_cells_evaluated += examined
+        best_coords.sort()
+        indexes = array("q", [r * size + c for r, c in best_coords])
+        self.transposition_table.put(key, (max_prob, indexes), indexes.itemsize * len(indexes))
+        return max_prob, best_coords, True
+
+    def _get_density_engine(self):
+        """
+        Retourne le module de densité NumPy si le moteur choisi le permet, sinon None.
+        L'import est fait au premier appel pour ne pas charger NumPy inutilement.
+        """
+        if self._density_engine is None:
+            engine = False
+            if self.probability_engine != "python":
+                try:
+                    from . import density as engine
+                except ImportError:
+                    if self.probability_engine == "numpy":
+                        raise
+            self._density_engine = engine
+        return self._density_engine or None
+
+    def probability_grid(self) -> List[List[int]]:
+        """
+        La grille de probabilités complète (densités finales, liste de lignes), par exemple
+        pour l'afficher ou l'analyser. La chasse n'en a pas besoin : elle ne lit que les
+        niveaux de densité les plus hauts des compteurs incrémentaux.
 
-    def process_shot_result(self, shot_coord: Tuple[int, int], result: str):
+        Avec NumPy, la grille est recalculée d'un bloc depuis les tirs du plateau de cible
+        (density.py) ; sinon, elle est lue case par case dans PlacementCounts. Les deux
+        moteurs donnent la même grille.
+        """
+        engine = self._get_density_engine()
+        if engine is None:
+            return self.probability_counts.grid()
+        target = self.target_board
+        return engine.compute_probability_grid(
+            target.size, target.hit_bits, target.miss_bits, self.probability_counts.remaining_lengths
+        ).tolist()
+
+    def _select_shot(self, shot_coord: Tuple[int, int], mode: str,
+                     refinement: str = REFINE_COMPLETE) -> Tuple[int, int]:
+        """
+        Retourne le tir choisi en notant le mode de décision utilisé et le niveau de raffinement atteint.
+        Publie un événement AIModeChanged quand ce mode change d'un coup à l'autre.
+        """
+        self.last_refinement = refinement
+        if mode != self.current_mode:
+            previous_mode = self.current_mode
+            self.current_mode = mode
+            if self.events.sinks:
+                self.events.emit(AIModeChanged(self.name, mode, previous_mode, shot_coord))
+        return shot_coord
+
+    def _report_adaptation(self, reason: str):
+        """Publie un ajustement des paramètres adaptatifs."""
+        if self.events.sinks:
+            self.events.emit(AIStrategyAdapted(self.name, reason, self.aggression_level, self.parity_preference))
+
+    def process_shot_result(self, shot_coord: Tuple[int, int], result: str, sunk_length: Optional[int] = None):
         """
         Met à jour l'état interne de l'IA en fonction du résultat de son tir.
         Inclut l'adaptation dynamique de la stratégie basée sur les performances.
+
+        Args:
+            shot_coord (tuple): Les coordonnées (row, col) du tir.
+            result (str): Le résultat du tir ('miss', 'hit', 'sunk').
+            sunk_length (int, optional): La longueur du navire coulé, si l'adversaire l'annonce.
+                                         Sinon, elle est déduite de l'alignement des hits.
         """
-        print(f"IA: Début process_shot_result pour {shot_coord}, résultat: {result}.")
+        profile = self.profile
+        if profile is not None:
+            start = time.perf_counter()
         r, c = shot_coord
         
         # Mettre à jour les statistiques
@@ -397,144 +413,67 @@ class AIPlayer(Player):
         self.last_shot_result = result
         
         # Assurez-vous de retirer la coordonnée des tirs non essayés
-        if shot_coord in self.untried_coordinates:
-            self.untried_coordinates.remove(shot_coord)
+        self.untried_coordinates.discard(shot_coord)
+
+        # Mise à jour incrémentale de la densité : seuls les placements passant par ce tir disparaissent
+        self.probability_counts.record_shot(r * self.own_board.size + c, result in ('hit', 'sunk'))
 
         if result == 'hit':
             self.hits_achieved += 1
             self.consecutive_misses = 0  # Reset les misses consécutifs
-            self.target_board.grid[r][c] = 'X'
-            # Ajouter à hits_to_process si ce n'est pas déjà un doublon
-            if shot_coord not in self.hits_to_process:
-                self.hits_to_process.append(shot_coord)
-            # Ajouter à current_hit_series pour la détection de ligne
-            if shot_coord not in self.current_hit_series:
-                self.current_hit_series.append(shot_coord)
-            self.potential_next_shots = [] # Vider, car on va en regénérer des meilleurs
+            self.target_board.set_cell(shot_coord, 'X')
+            self.target_solver.record_hit(shot_coord)
 
         elif result == 'miss':
             self.consecutive_misses += 1
-            self.target_board.grid[r][c] = 'O'
-            # Si on a manqué alors qu'on était en mode ciblage/extension
-            # et que potential_next_shots est vide ou que la direction n'est plus viable
-            # Il faut peut-être invalider la direction actuelle si le miss brise une série
-            if self.current_target_direction:
-                # Si le miss est adjacent à la current_hit_series mais ne l'étend pas
-                # cela signifie que cette direction est bloquée pour ce navire.
-                # On réinitialise la direction et on vide les tirs potentiels.
-                # La logique pour revenir aux autres hits_to_process se fera dans get_shot_coordinates
-                # lors du prochain appel.
-                self.current_target_direction = None
-                self.potential_next_shots = []
-                # Et on retire le dernier hit de la série si elle ne peut plus être prolongée
-                # et qu'il n'y a plus d'autres hits à explorer
-                if len(self.current_hit_series) == 1 and self.current_hit_series[0] in self.hits_to_process:
-                    self.hits_to_process.remove(self.current_hit_series[0])
-                self.current_hit_series = [] # Vider la série actuelle car la direction est brisée
+            self.target_board.set_cell(shot_coord, 'O')
 
         elif result == 'sunk':
             self.hits_achieved += 1
             self.ships_sunk += 1
             self.consecutive_misses = 0
-            self.target_board.grid[r][c] = 'X' 
-            # Quand un navire est coulé, retirer toutes les coordonnées de hits_to_process
-            # qui faisaient partie de la série coulé (current_hit_series)
-            for hit in self.current_hit_series:
-                if hit in self.hits_to_process:
-                    self.hits_to_process.remove(hit)
-
-            self.sunk_ships_coords.extend(self.current_hit_series)
-            self.current_hit_series = [] 
-            self.current_target_direction = None 
-            self.potential_next_shots = [] 
+            self.target_board.set_cell(shot_coord, 'X') 
+            # Le navire coulé ne compte plus dans la densité de placements
+            if sunk_length is None:
+                sunk_length = self._infer_sunk_length(shot_coord)
+            self.probability_counts.retire_length(sunk_length)
+            # Ses cases sortent des grappes ; les hits d'un navire voisin restent à cibler
+            self.last_sunk_cells = self.target_solver.record_sunk(shot_coord, sunk_length)
         
         # Adaptation dynamique de la stratégie
         self._adapt_strategy()
-            
-        print(f"IA: Fin process_shot_result. Stats: {self.hits_achieved}/{self.shots_fired} hits, {self.ships_sunk} coulés.")
 
-        # Dans tous les cas, ce coup a été joué, donc je le retire de ma liste de coups à essayer.
-        if shot_coord in self.untried_coordinates:
-            self.untried_coordinates.remove(shot_coord)
+        if profile is not None:
+            profile.record(PHASE_PROCESS, time.perf_counter() - start, 1,
+                           self.probability_counts.covering_count(r * self.own_board.size + c))
 
-    def _compute_probability_grid(self) -> List[List[int]]:
+    def _infer_sunk_length(self, shot_coord: Tuple[int, int]) -> int:
         """
-        Calcule une grille de probabilités sophistiquée pour optimiser la recherche de navires.
-        Prend en compte les navires restants, les patterns de tir, et les contraintes géométriques.
+        Devine la longueur du navire qui vient d'être coulé à partir des hits non résolus
+        alignés avec le tir (horizontalement et verticalement).
         """
-        size = self.own_board.size
-        prob_grid = [[0 for _ in range(size)] for _ in range(size)]
-        
-        # Obtenir les navires non coulés et leurs tailles
-        ships_left = []
-        for ship in self.ships_to_place:
-            if not ship.is_sunk():
-                ships_left.append(ship.length)
-        
-        # Si aucun navire restant, retourner une grille vide
-        if not ships_left:
-            return prob_grid
-        
-        # Créer un ensemble des cases déjà tirées
-        shot_cells = set()
-        for r in range(size):
-            for c in range(size):
-                if self.target_board.grid[r][c] != '~':
-                    shot_cells.add((r, c))
-        
-        # Pour chaque navire restant, calculer toutes les positions possibles
-        for ship_length in ships_left:
-            # Positions horizontales
-            for r in range(size):
-                for c in range(size - ship_length + 1):
-                    positions = [(r, c + i) for i in range(ship_length)]
-                    # Vérifier si toutes les positions sont valides
-                    if all(pos not in shot_cells for pos in positions):
-                        # Vérifier qu'aucune position n'est un miss ('O')
-                        if all(self.target_board.grid[pos[0]][pos[1]] != 'O' for pos in positions):
-                            # Augmenter la probabilité pour chaque position
-                            for pos in positions:
-                                prob_grid[pos[0]][pos[1]] += 1
-            
-            # Positions verticales
-            for c in range(size):
-                for r in range(size - ship_length + 1):
-                    positions = [(r + i, c) for i in range(ship_length)]
-                    # Vérifier si toutes les positions sont valides
-                    if all(pos not in shot_cells for pos in positions):
-                        # Vérifier qu'aucune position n'est un miss ('O')
-                        if all(self.target_board.grid[pos[0]][pos[1]] != 'O' for pos in positions):
-                            # Augmenter la probabilité pour chaque position
-                            for pos in positions:
-                                prob_grid[pos[0]][pos[1]] += 1
-        
-        # Bonus pour les cases adjacentes aux hits (stratégie de ciblage)
-        for r in range(size):
-            for c in range(size):
-                if self.target_board.grid[r][c] == 'X':  # Hit
-                    # Ajouter un bonus aux cases adjacentes
-                    for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                        nr, nc = r + dr, c + dc
-                        if 0 <= nr < size and 0 <= nc < size:
-                            if self.target_board.grid[nr][nc] == '~':  # Case non tirée
-                                prob_grid[nr][nc] += 2  # Bonus pour les cases adjacentes
-        
-        # Pénalité pour les cases isolées (stratégie de parité)
-        for r in range(size):
-            for c in range(size):
-                if prob_grid[r][c] > 0:
-                    # Vérifier si la case est isolée (pas de navire adjacent possible)
-                    isolated = True
-                    for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                        nr, nc = r + dr, c + dc
-                        if 0 <= nr < size and 0 <= nc < size:
-                            if prob_grid[nr][nc] > 0:
-                                isolated = False
-                                break
-                    if isolated:
-                        prob_grid[r][c] = max(0, prob_grid[r][c] - 1)  # Légère pénalité
-        
-        return prob_grid
+        r, c = shot_coord
+        unresolved = self.target_solver.unresolved
+        runs = []
+        for dr, dc in [(0, 1), (1, 0)]:
+            run = 1
+            for sign in (1, -1):
+                nr, nc = r + sign * dr, c + sign * dc
+                while (nr, nc) in unresolved:
+                    run += 1
+                    nr, nc = nr + sign * dr, nc + sign * dc
+            runs.append(run)
+
+        remaining = self.probability_counts.remaining_lengths
+        if not remaining:
+            return max(runs)
+        # Une longueur encore à flot qui correspond exactement à une des séries
+        exact = [length for length in remaining if length in runs]
+        if exact:
+            return max(exact)
+        # Sinon, le plus grand navire qui tient dans la plus longue série (navires collés)
+        fitting = [length for length in remaining if length <= max(runs)]
+        return max(fitting) if fitting else min(remaining)
 
     def _adapt_strategy(self):
         """
@@ -549,40 +488,32 @@ class AIPlayer(Player):
         # Adapter le niveau d'agression
         if hit_rate < 0.2:  # Performance faible
             self.aggression_level = min(2.0, self.aggression_level + 0.1)
-            print(f"IA: Performance faible ({hit_rate:.2f}), augmentation de l'agression à {self.aggression_level:.2f}")
+            self._report_adaptation(f"Performance faible ({hit_rate:.2f}), augmentation de l'agression")
         elif hit_rate > 0.6:  # Performance excellente
             self.aggression_level = max(0.5, self.aggression_level - 0.05)
-            print(f"IA: Performance excellente ({hit_rate:.2f}), réduction de l'agression à {self.aggression_level:.2f}")
+            self._report_adaptation(f"Performance excellente ({hit_rate:.2f}), réduction de l'agression")
         
         # Adapter la préférence de parité
         if self.consecutive_misses >= 3:
             self.parity_preference = max(0.5, self.parity_preference - 0.1)
-            print(f"IA: Miss consécutifs, réduction de la préférence de parité à {self.parity_preference:.2f}")
+            self._report_adaptation("Miss consécutifs, réduction de la préférence de parité")
         elif self.last_shot_result == 'hit':
             self.parity_preference = min(1.5, self.parity_preference + 0.05)
-            print(f"IA: Hit récent, augmentation de la préférence de parité à {self.parity_preference:.2f}")
+            self._report_adaptation("Hit récent, augmentation de la préférence de parité")
 
-    def _get_optimal_parity_coordinates(self) -> List[Tuple[int, int]]:
+    def _get_optimal_parity_coordinates(self) -> Optional[IndexedSet]:
         """
         Retourne les coordonnées optimales basées sur la parité pour maximiser la couverture.
-        Utilise une stratégie en damier optimisée pour trouver les navires plus efficacement.
+        Utilise une stratégie en damier optimisée pour trouver les navires plus efficacement :
+        la couleur du damier qui a le plus de cases restantes, directement depuis la partition
+        de l'ensemble des cases non tirées (sans reparcourir le plateau).
         """
-        even_coords = []
-        odd_coords = []
-        
-        for r in range(self.own_board.size):
-            for c in range(self.own_board.size):
-                if (r + c) % 2 == 0:
-                    even_coords.append((r, c))
-                else:
-                    odd_coords.append((r, c))
-        
-        # Filtrer les coordonnées déjà tirées
-        even_available = [coord for coord in even_coords if coord in self.untried_coordinates]
-        odd_available = [coord for coord in odd_coords if coord in self.untried_coordinates]
-        
-        # Retourner la liste avec le plus de coordonnées disponibles
-        if len(even_available) >= len(odd_available):
-            return even_available
-        else:
-            return odd_available
+        return self.untried_coordinates.larger_parity()
+
+
+def _move_deadline(budget_ms: Optional[float], deadline: Optional[float]) -> Optional[float]:
+    """L'échéance d'un coup (time.perf_counter()), la plus proche des deux si les deux sont donnés."""
+    if budget_ms is not None:
+        budget_deadline = time.perf_counter() + budget_ms / 1000.0
+        deadline = budget_deadline if deadline is None else min(deadline, budget_deadline)
+    return deadline
@@ -0,0 +1,329 @@
+"""
+Banc d'essai des chemins critiques du moteur et de l'IA.
+
+Mesure le temps par opération (meilleur et médian sur plusieurs répétitions) et les
+allocations mémoire (pic et blocs conservés, via tracemalloc) de :
+    - Board.receive_shot, Board.place_ship ;
+    - PlacementCounts.record_shot (mise à jour de la densité après un tir) ;
+    - la recherche des meilleures cases de chasse (sans table de transposition) et la
+      grille de probabilités complète (AIPlayer.probability_grid) ;
+    - AIPlayer.get_shot_coordinates, place_ships ;
+    - parties complètes sans interface (AIPlayer contre RandomPlayer).
+
+Usage :
+    python -m src.benchmark --output bench.json
+    python -m src.benchmark --compare bench.json --threshold 0.2
+
+En mode comparaison, chaque mesure plus lente que la référence de plus de `threshold`
+(en proportion du temps médian) est signalée, et le code de sortie vaut 1.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .ai_player import AIPlayer
+from .board import Board
+from .fleet_sampler import sample_fleet
+from .placement_counts import PlacementCounts
+from .simulation import RandomPlayer, play_game
+from .transposition import TranspositionTable
+
+DEFAULT_SIZES = (10, 20, 50, 100)
+
+# setup(size, rng) prépare l'état (non chronométré) et retourne (run, nombre d'opérations dans run)
+Setup = Callable[[int, random.Random], Tuple[Callable[[], object], int]]
+
+
+class Benchmark(NamedTuple):
+    """Une mesure du banc d'essai."""
+    name: str
+    setup: Setup
+    max_size: Optional[int] = None # Taille de plateau au-delà de laquelle la mesure est sautée
+
+
+def _fleet_board(size: int, rng: random.Random) -> Board:
+    """Un plateau avec la flotte standard placée au hasard."""
+    board = Board(size)
+    fleet = RandomPlayer("flotte", size).ships_to_place
+    layout = sample_fleet(size, [ship.length for ship in fleet], rng)
+    for ship, (r, c, orientation) in zip(fleet, layout):
+        board.place_ship(ship, (r, c), orientation)
+    return board
+
+
+def _cold_ai(name: str, size: int) -> AIPlayer:
+    """
+    Une IA avec sa propre table de transposition, vide : les positions de chasse déjà
+    évaluées par les répétitions précédentes (dans la table partagée du processus) ne
+    faussent pas la mesure.
+    """
+    return AIPlayer(name, size, transposition_table=TranspositionTable())
+
+
+def _ai_mid_game(size: int, rng: random.Random) -> AIPlayer:
+    """Une IA qui a déjà manqué 20 % des cases du plateau adverse."""
+    ai = _cold_ai("IA", size)
+    ai.place_ships()
+    ai.update_untried_coordinates_after_placement()
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    for coord in rng.sample(cells, size * size // 5):
+        ai.target_board.mark_shot(coord, 'miss')
+        ai.process_shot_result(coord, 'miss')
+    return ai
+
+
+def _setup_receive_shot(size, rng):
+    board = _fleet_board(size, rng)
+    shots = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(shots)
+
+    def run():
+        for coord in shots:
+            board.receive_shot(coord)
+    return run, len(shots)
+
+
+def _setup_place_ship(size, rng):
+    board = Board(size)
+    fleet = RandomPlayer("flotte", size).ships_to_place
+    layout = sample_fleet(size, [ship.length for ship in fleet], rng)
+
+    def run():
+        for ship, (r, c, orientation) in zip(fleet, layout):
+            board.place_ship(ship, (r, c), orientation)
+    return run, len(fleet)
+
+
+def _setup_record_shot(size, rng):
+    counts = PlacementCounts(size, [ship.length for ship in RandomPlayer("flotte", size).ships_to_place])
+    shots = rng.sample(range(size * size), size * size // 5)
+
+    def run():
+        for index in shots:
+            counts.record_shot(index, False)
+    return run, len(shots)
+
+
+def _setup_hunt_scan(size, rng):
+    """La recherche des meilleures cases de chasse, recalculée à chaque opération (aucune position gardée)."""
+    ai = _ai_mid_game(size, rng)
+    ai.transposition_table = TranspositionTable(max_entries=0)
+    scans = 10
+
+    def run():
+        for _ in range(scans):
+            ai._best_hunt_coordinates()
+    return run, scans
+
+
+def _setup_probability_grid(size, rng):
+    """La grille complète, avec le moteur par défaut de l'IA (NumPy s'il est installé)."""
+    ai = _ai_mid_game(size, rng)
+    ai._get_density_engine() # NumPy est importé hors de la mesure
+    return ai.probability_grid, 1
+
+
+def _setup_get_shot_coordinates(size, rng):
+    """Chaque opération inclut l'enregistrement du résultat (manqué) du tir choisi."""
+    ai = _ai_mid_game(size, rng)
+    turns = 10
+
+    def run():
+        for _ in range(turns):
+            coord = ai.get_shot_coordinates()
+            ai.target_board.mark_shot(coord, 'miss')
+            ai.process_shot_result(coord, 'miss')
+    return run, turns
+
+
+def _setup_place_ships(size, rng):
+    ai = _cold_ai("IA", size)
+    return ai.place_ships, 1
+
+
+def _setup_full_game(size, rng):
+    players = [_cold_ai("A", size), RandomPlayer("B", size)]
+    return (lambda: play_game(players)), 1
+
+
+def default_benchmarks() -> List[Benchmark]:
+    """Les mesures du banc d'essai."""
+    return [
+        Benchmark("Board.receive_shot", _setup_receive_shot),
+        Benchmark("Board.place_ship", _setup_place_ship),
+        Benchmark("PlacementCounts.record_shot", _setup_record_shot),
+        Benchmark("AIPlayer._best_hunt_coordinates", _setup_hunt_scan),
+        Benchmark("AIPlayer.probability_grid", _setup_probability_grid),
+        Benchmark("AIPlayer.get_shot_coordinates", _setup_get_shot_coordinates),
+        Benchmark("AIPlayer.place_ships", _setup_place_ships),
+        # Une partie complète sur 100 x 100 dure plusieurs minutes
+        Benchmark("game.ai_vs_random", _setup_full_game, max_size=50),
+    ]
+
+
+def _measure_allocations(benchmark: Benchmark, size: int, seed: int) -> Tuple[int, int]:
+    """Pic de mémoire (octets) et blocs conservés après une exécution de la mesure."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    run, _ = benchmark.setup(size, rng)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        baseline_memory = tracemalloc.get_traced_memory()[0]
+        run()
+        peak = tracemalloc.get_traced_memory()[1] - baseline_memory
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return max(peak, 0), blocks
+
+
+def run_benchmark(benchmark: Benchmark, size: int, repeat: int = 5, seed: int = 0) -> Dict:
+    """
+    Exécute une mesure sur une taille de plateau.
+
+    Args:
+        benchmark (Benchmark): La mesure.
+        size (int): La taille du plateau.
+        repeat (int): Nombre de répétitions chronométrées (chacune avec un état neuf).
+        seed (int): Graine des générateurs aléatoires ; la répétition i utilise seed + i.
+
+    Returns:
+        Dict: Le résultat sérialisable en JSON (temps par opération en secondes).
+    """
+    timings = []
+    ops = 1
+    for i in range(repeat):
+        rng = random.Random(seed + i)
+        random.seed(seed + i)
+        run, ops = benchmark.setup(size, rng)
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) / ops)
+    peak_bytes, blocks = _measure_allocations(benchmark, size, seed)
+    return {
+        "name": benchmark.name,
+        "size": size,
+        "repeat": repeat,
+        "ops": ops,
+        "best": min(timings),
+        "median": statistics.median(timings),
+        "peak_bytes": peak_bytes,
+        "retained_blocks": blocks,
+    }
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat: int = 5, seed: int = 0, only: Optional[str] = None,
+              benchmarks: Optional[List[Benchmark]] = None, progress=None) -> Dict:
+    """
+    Exécute toutes les mesures sur toutes les tailles de plateau.
+
+    Args:
+        sizes: Les tailles de plateau.
+        repeat (int): Nombre de répétitions chronométrées par mesure.
+        seed (int): Graine des générateurs aléatoires.
+        only (str, optional): Ne garde que les mesures dont le nom contient cette chaîne.
+        benchmarks (list, optional): Les mesures (par défaut, default_benchmarks()).
+        progress (callable, optional): Appelé avec chaque résultat dès qu'il est disponible.
+
+    Returns:
+        Dict: Le rapport complet (environnement et résultats), sérialisable en JSON.
+    """
+    results = []
+    for benchmark in benchmarks if benchmarks is not None else default_benchmarks():
+        if only and only not in benchmark.name:
+            continue
+        for size in sizes:
+            if benchmark.max_size is not None and size > benchmark.max_size:
+                continue
+            result = run_benchmark(benchmark, size, repeat, seed)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(report: Dict, baseline: Dict, threshold: float = 0.2) -> List[Dict]:
+    """
+    Compare un rapport à une référence.
+
+    Returns:
+        List[Dict]: Les régressions : mesures présentes dans les deux rapports dont le temps
+                    médian dépasse celui de la référence de plus de `threshold` (0.2 = +20 %).
+    """
+    reference = {(result["name"], result["size"]): result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        previous = reference.get((result["name"], result["size"]))
+        if previous is None or previous["median"] <= 0:
+            continue
+        ratio = result["median"] / previous["median"]
+        if ratio > 1 + threshold:
+            regressions.append({
+                "name": result["name"],
+                "size": result["size"],
+                "baseline": previous["median"],
+                "median": result["median"],
+                "ratio": ratio,
+            })
+    return regressions
+
+
+def _format_result(result: Dict) -> str:
+    return (f"{result['name']:<45} {result['size']:>4}  "
+            f"médiane {result['median'] * 1e6:>12.1f} µs/op  "
+            f"meilleur {result['best'] * 1e6:>12.1f} µs/op  "
+            f"pic {result['peak_bytes'] / 1024:>9.1f} Kio  "
+            f"blocs {result['retained_blocks']:>7}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Banc d'essai du moteur et de l'IA de bataille navale.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="tailles de plateau (par défaut : 10 20 50 100)")
+    parser.add_argument("--repeat", type=int, default=5, help="répétitions chronométrées par mesure")
+    parser.add_argument("--seed", type=int, default=0, help="graine des générateurs aléatoires")
+    parser.add_argument("--only", help="ne lance que les mesures dont le nom contient cette chaîne")
+    parser.add_argument("--output", help="fichier JSON où écrire le rapport")
+    parser.add_argument("--compare", metavar="BASELINE", help="rapport JSON de référence à comparer")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="ralentissement toléré avant de signaler une régression (0.2 = +20 %%)")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.repeat, args.seed, args.only,
+                       progress=lambda result: print(_format_result(result), flush=True))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Rapport écrit dans {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"RÉGRESSION {regression['name']} (taille {regression['size']}) : "
+                  f"{regression['baseline'] * 1e6:.1f} -> {regression['median'] * 1e6:.1f} µs/op "
+                  f"(x{regression['ratio']:.2f})")
+        if regressions:
+            return 1
+        print("Aucune régression.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,82 @@
+from .events import EventBus, ShipHit, ShipSunk
+from .placements import placements_for
 from .ship import Ship
-from .utils import get_coordinates, is_valid_ship_placement
-from typing import List, Tuple
+from .utils import get_coordinates, is_valid_ship_placement, iter_bits
+from typing import Dict, List, Optional, Tuple
+
+
+class _GridRow:
+    """
+    Vue d'une ligne de la grille, calculée à la volée à partir des bitboards.
+    Supporte la lecture (`row[c]`) et l'écriture (`row[c] = 'X'`) comme une liste.
+    """
+    __slots__ = ("_board", "_row")
+
+    def __init__(self, board: "Board", row: int):
+        self._board = board
+        self._row = row
+
+    def __getitem__(self, c: int) -> str:
+        return self._board.get_cell((self._row, c))
+
+    def __setitem__(self, c: int, symbol: str):
+        self._board.set_cell((self._row, c), symbol)
+
+    def __len__(self) -> int:
+        return self._board.size
+
+    def __iter__(self):
+        for c in range(self._board.size):
+            yield self._board.get_cell((self._row, c))
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class _GridView:
+    """
+    Vue paresseuse de la grille `size x size` de symboles ('~', 'S', 'X', 'O').
+    Rien n'est alloué tant qu'une ligne n'est pas lue : l'état réel vit dans les bitboards.
+    """
+    __slots__ = ("_board",)
+
+    def __init__(self, board: "Board"):
+        self._board = board
+
+    def __getitem__(self, r: int) -> _GridRow:
+        if not 0 <= r < self._board.size:
+            raise IndexError("grid row out of range")
+        return _GridRow(self._board, r)
+
+    def __len__(self) -> int:
+        return self._board.size
+
+    def __iter__(self):
+        for r in range(self._board.size):
+            yield _GridRow(self._board, r)
+
+    def __repr__(self) -> str:
+        return repr([list(row) for row in self])
+
 
 class Board:
     """
     Représente le plateau de jeu de la Bataille Navale.
 
+    L'état est stocké sous forme de bitboards : un entier Python par couche, où le bit
+    `r * size + c` correspond à la case (r, c). Une table case -> navire permet de
+    résoudre un tir en O(1).
+
     Attributes:
         size (int): La taille du plateau (ex: 10 pour 10x10).
-        grid (list of list of str): La grille de jeu. Chaque cellule contient un symbole
-                                    représentant son état (vide, navire, touché, manqué).
+        ship_bits (int): Masque des cases occupées par un navire (touché ou non).
+        hit_bits (int): Masque des tirs ayant touché ('X').
+        miss_bits (int): Masque des tirs dans l'eau ('O').
+        grid (_GridView): Vue de la grille de jeu, construite à la demande à partir des
+                          bitboards. Chaque cellule contient un symbole :
                                     - '~' : Eau (vide)
                                     - 'S' : Navire (pour l'affichage du joueur, ou masqué pour l'adversaire)
                                     - 'X' : Navire touché
@@ -17,19 +84,116 @@ class Board:
         name (str): Le nom du propriétaire du plateau (ex: "Joueur", "IA").
     """
 
-    def __init__(self, size=10, name="Board"):
+    def __init__(self, size=10, name="Board", events: Optional[EventBus] = None):
         """
         Initialise un nouveau plateau de jeu vide.
 
         Args:
             size (int): La taille de la grille (par défaut 10).
             name (str): Le nom de ce plateau.
+            events (EventBus, optional): Le bus sur lequel publier les navires touchés et coulés.
         """
         self.size = size
-        # Initialise la grille avec des tildes '~' pour représenter l'eau
-        self.grid = [['~' for _ in range(size)] for _ in range(size)]
+        self.ship_bits = 0
+        self.hit_bits = 0
+        self.miss_bits = 0
+        # Index de case -> (index du navire dans self.ships, index de la partie du navire)
+        self.cell_to_ship: Dict[int, Tuple[int, int]] = {}
         self.ships = []  # Liste des objets Ship sur ce plateau
+        self.last_sunk_ship = None  # Dernier navire coulé par receive_shot
+        # Parties de navires encore intactes sur tout le plateau, tenu à jour par place_ship et receive_shot
+        self.remaining_ship_cells = 0
         self.name = name
+        self.events = events if events is not None else EventBus()
+        self._grid_view = None
+
+    @property
+    def grid(self) -> _GridView:
+        """Vue de la grille (créée au premier accès), pour display() et les interfaces."""
+        if self._grid_view is None:
+            self._grid_view = _GridView(self)
+        return self._grid_view
+
+    def cell_index(self, coord: Tuple[int, int]) -> int:
+        """Retourne l'index de bit de la case (row, col)."""
+        return coord[0] * self.size + coord[1]
+
+    def index_to_coord(self, index: int) -> Tuple[int, int]:
+        """Retourne la case (row, col) correspondant à un index de bit."""
+        return divmod(index, self.size)
+
+    def get_cell(self, coord: Tuple[int, int]) -> str:
+        """
+        Retourne le symbole de la case (row, col), déduit des bitboards.
+        """
+        r, c = coord
+        if not (0 <= r < self.size and 0 <= c < self.size):
+            raise IndexError("grid index out of range")
+        bit = 1 << (r * self.size + c)
+        if self.hit_bits & bit:
+            return 'X'
+        if self.miss_bits & bit:
+            return 'O'
+        if self.ship_bits & bit:
+            return 'S'
+        return '~'
+
+    def set_cell(self, coord: Tuple[int, int], symbol: str):
+        """
+        Écrit un symbole dans une case, en mettant à jour les bitboards.
+        Utilisé par les plateaux de cible, où l'on note le résultat de ses propres tirs.
+        """
+        r, c = coord
+        if not (0 <= r < self.size and 0 <= c < self.size):
+            raise IndexError("grid index out of range")
+        bit = 1 << (r * self.size + c)
+        if symbol == 'X':
+            self.hit_bits |= bit
+            self.miss_bits &= ~bit
+        elif symbol == 'O':
+            self.miss_bits |= bit
+            self.hit_bits &= ~bit
+        elif symbol == 'S':
+            self.ship_bits |= bit
+            self.hit_bits &= ~bit
+            self.miss_bits &= ~bit
+        elif symbol == '~':
+            self.ship_bits &= ~bit
+            self.hit_bits &= ~bit
+            self.miss_bits &= ~bit
+        else:
+            raise ValueError(f"Symbole de case inconnu : {symbol!r}")
+
+    def mark_shot(self, shot_coord: Tuple[int, int], result: str):
+        """
+        Note sur ce plateau (de cible) le résultat d'un tir : 'X' pour un coup au but, 'O' sinon.
+        """
+        bit = 1 << (shot_coord[0] * self.size + shot_coord[1])
+        if result == 'hit' or result == 'sunk':
+            self.hit_bits |= bit
+        elif result == 'miss':
+            self.miss_bits |= bit
+
+    def is_shot(self, coord: Tuple[int, int]) -> bool:
+        """Indique si la case a déjà été ciblée (touchée ou manquée)."""
+        return bool((self.hit_bits | self.miss_bits) >> (coord[0] * self.size + coord[1]) & 1)
+
+    def is_hit(self, coord: Tuple[int, int]) -> bool:
+        """Indique si la case a été touchée ('X')."""
+        return bool(self.hit_bits >> (coord[0] * self.size + coord[1]) & 1)
+
+    def hit_indexes(self):
+        """Les index des cases touchées, dans l'ordre croissant."""
+        return iter_bits(self.hit_bits)
+
+    def miss_indexes(self):
+        """Les index des tirs dans l'eau, dans l'ordre croissant."""
+        return iter_bits(self.miss_bits)
+
+    @property
+    def shot_bits(self) -> int:
+        """Masque de toutes les cases déjà ciblées."""
+        return self.hit_bits | self.miss_bits
 
     def display(self, hide_ships: bool = True):
         """
@@ -44,13 +208,29 @@ class Board:
             # Afficher le numéro de ligne (1, 2, 3...)
             row_display = [str(r + 1).ljust(2)] # Ajuste pour l'alignement
             for c in range(self.size):
-                cell = self.grid[r][c]
+                cell = self.get_cell((r, c))
                 if hide_ships and cell == 'S':
                     row_display.append('~') # Cache les navires non touchés
                 else:
                     row_display.append(cell)
             print(" ".join(row_display))
 
+    def placement_mask(self, start_coord: Tuple[int, int], length: int, orientation: str) -> int:
+        """
+        Retourne le masque de bits d'un navire posé à start_coord, ou 0 s'il sort du plateau.
+        """
+        table = placements_for(self.size, length)
+        pid = table.find(start_coord, orientation)
+        return 0 if pid is None else table.mask(pid)
+
+    def ship_placement_coords(self, start_coord: Tuple[int, int], length: int,
+                              orientation: str) -> Optional[List[Tuple[int, int]]]:
+        """
+        Retourne les coordonnées d'un navire posé à start_coord s'il tient sur le plateau
+        sans chevaucher un navire (intact ou touché), sinon None.
+        """
+        return is_valid_ship_placement(self, start_coord, length, orientation)
+
     def place_ship(self, ship, start_coord: Tuple[int, int], orientation: str) -> bool:
         """
         Tente de placer un navire sur le plateau.
@@ -63,17 +243,21 @@ class Board:
         Returns:
             bool: True si le navire a été placé avec succès, False sinon.
         """
-        potential_coords = is_valid_ship_placement(self, start_coord, ship.length, orientation)
+        potential_coords = self.ship_placement_coords(start_coord, ship.length, orientation)
 
         if potential_coords is None:
             return False # Placement invalide (hors limites ou chevauchement)
 
-        # Si le placement est valide, mettre à jour la grille et le navire
-        for r, c in potential_coords:
-            self.grid[r][c] = 'S'
-        
+        # Si le placement est valide, mettre à jour les bitboards et le navire
+        ship_id = len(self.ships)
+        for part, (r, c) in enumerate(potential_coords):
+            index = r * self.size + c
+            self.ship_bits |= 1 << index
+            self.cell_to_ship[index] = (ship_id, part)
+
         ship.coordinates = potential_coords # Associe les coordonnées au navire
         self.ships.append(ship) # Ajoute le navire à la liste des navires du plateau
+        self.remaining_ship_cells += ship.remaining
         return True
 
     def receive_shot(self, shot_coord: Tuple[int, int]) -> str:
@@ -92,65 +276,59 @@ class Board:
         if not (0 <= r < self.size and 0 <= c < self.size):
             return "invalid" # ou une autre erreur pour le gérer plus haut
 
-        cell_content = self.grid[r][c]
+        index = r * self.size + c
+        bit = 1 << index
 
-        if cell_content == 'S':
-            # C'est un navire, marquer comme touché
-            self.grid[r][c] = 'X' # 'X' pour touché
-            hit_ship = None
-            for ship in self.ships:
-                if shot_coord in ship.coordinates:
-                    ship.hit_part(shot_coord) # Marque la partie du navire comme touchée
-                    hit_ship = ship
-                    break
-            
-            if hit_ship and hit_ship.is_sunk():
-                # print(f"Vous avez coulé le {hit_ship.name} de {self.name} !") # Laisser la GUI gérer ça
-                return "sunk"
-            else:
-                return "hit"
-        elif cell_content == '~':
-            # C'est de l'eau
-            self.grid[r][c] = 'O' # 'O' pour manqué
-            return "miss"
-        else:
+        if (self.hit_bits | self.miss_bits) & bit:
             # Déjà tiré ici ('X' ou 'O')
             return "already_hit"
 
+        if self.ship_bits & bit:
+            # C'est un navire, marquer comme touché
+            self.hit_bits |= bit
+            owner = self.cell_to_ship.get(index)
+            if owner is None:
+                # Case 'S' écrite à la main dans la grille, sans navire associé
+                return "hit"
+            ship_id, part = owner
+            hit_ship = self.ships[ship_id]
+            if hit_ship.hit_index(part): # Marque la partie du navire comme touchée
+                self.remaining_ship_cells -= 1
+
+            if hit_ship.is_sunk():
+                self.last_sunk_ship = hit_ship
+                if self.events.sinks: # Les interfaces abonnées se chargent de l'affichage
+                    self.events.emit(ShipSunk(self.name, hit_ship.name, hit_ship.length, shot_coord))
+                return "sunk"
+            if self.events.sinks:
+                self.events.emit(ShipHit(self.name, hit_ship.name, shot_coord))
+            return "hit"
+
+        # C'est de l'eau
+        self.miss_bits |= bit
+        return "miss"
+
+    def all_ships_sunk(self) -> bool:
+        """
+        Vérifie si tous les navires placés sur ce plateau sont coulés, en O(1).
+        Un plateau sans navire n'est pas considéré comme vaincu.
+        """
+        return self.remaining_ship_cells == 0 and bool(self.ships)
+
     def get_all_shot_coords(self) -> List[Tuple[int, int]]:
         """
         Retourne une liste de toutes les coordonnées qui ont été ciblées sur ce plateau
         (qu'il y ait eu un coup ('X') ou un manqué ('O')).
         """
-        shot_coords = []
-        for r in range(self.size):
-            for c in range(self.size):
-                if self.grid[r][c] == 'X' or self.grid[r][c] == 'O':
-                    shot_coords.append((r, c))
-        return shot_coords
-    
+        size = self.size
+        return [divmod(index, size) for index in iter_bits(self.hit_bits | self.miss_bits)]
+
     def is_valid_placement_preview(self, ship: Ship, start_coord: Tuple[int, int], orientation: str) -> bool:
         """
         Vérifie si un placement de navire est valide SANS modifier la grille.
         Utilisé pour l'aperçu visuel pendant le placement.
         """
-        r_start, c_start = start_coord
-        ship_length = ship.length
-
-        # Vérifier si toutes les coordonnées sont dans les limites et ne chevauchent pas
-        if orientation == 'H':
-            if c_start + ship_length > self.size:
-                return False  # Dépasse la largeur du plateau
-            for i in range(ship_length):
-                if self.grid[r_start][c_start + i] == 'S':
-                    return False  # Chevauche un autre navire
-        elif orientation == 'V':
-            if r_start + ship_length > self.size:
-                return False  # Dépasse la hauteur du plateau
-            for i in range(ship_length):
-                if self.grid[r_start + i][c_start] == 'S':
-                    return False  # Chevauche un autre navire
-        else:
-            return False # Orientation invalide (devrait pas arriver si bien géré en amont)
-        
-        return True # Le placement est valide pour l'aperçu
+        mask = self.placement_mask(start_coord, ship.length, orientation)
+        if not mask:
+            return False # Dépasse le plateau ou orientation invalide
+        return not (mask & self.ship_bits) # Ne chevauche aucun autre navire
@@ -0,0 +1,283 @@
+import random
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .placements import LARGE_BOARD_SIZE
+
+Coord = Tuple[int, int]
+
+# Tirages rejetés avant qu'un ensemble creux ne parcoure ses cases une à une
+_MAX_REJECTIONS = 64
+
+
+class IndexedSet:
+    """
+    Ensemble de coordonnées avec appartenance, ajout, retrait et tirage au sort en O(1).
+
+    Les éléments sont rangés dans une liste, et un dictionnaire donne la position de
+    chacun : un retrait échange l'élément avec le dernier de la liste puis le dépile.
+    """
+    __slots__ = ("_items", "_positions")
+
+    def __init__(self, coords: Iterable[Coord] = ()):
+        self._items: List[Coord] = []
+        self._positions: Dict[Coord, int] = {}
+        for coord in coords:
+            self.add(coord)
+
+    def add(self, coord: Coord):
+        """Ajoute une coordonnée (sans effet si elle est déjà présente)."""
+        if coord not in self._positions:
+            self._positions[coord] = len(self._items)
+            self._items.append(coord)
+
+    def discard(self, coord: Coord) -> bool:
+        """Retire une coordonnée si elle est présente. Retourne True si elle l'était."""
+        position = self._positions.pop(coord, None)
+        if position is None:
+            return False
+        last = self._items.pop()
+        if position < len(self._items):
+            self._items[position] = last
+            self._positions[last] = position
+        return True
+
+    def remove(self, coord: Coord):
+        """Retire une coordonnée ; lève ValueError si elle est absente (comme list.remove)."""
+        if not self.discard(coord):
+            raise ValueError(f"{coord} n'est pas dans l'ensemble")
+
+    def choice(self, rng=random) -> Coord:
+        """Tire une coordonnée uniformément au hasard."""
+        return self._items[rng.randrange(len(self._items))]
+
+    def shuffle(self, rng=random):
+        """Mélange l'ordre d'itération."""
+        rng.shuffle(self._items)
+        self._positions = {coord: position for position, coord in enumerate(self._items)}
+
+    def __contains__(self, coord) -> bool:
+        return coord in self._positions
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Coord]:
+        return iter(list(self._items))
+
+    def __getitem__(self, position: int) -> Coord:
+        return self._items[position]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._items!r})"
+
+
+class CoordinateSet:
+    """
+    Coordonnées non encore tirées par l'IA, partitionnées par classe de parité (r + c) % 2.
+
+    Chaque classe est un IndexedSet : appartenance, retrait et tirage au hasard restent en
+    O(1), que l'on travaille sur l'ensemble complet ou sur une seule couleur du damier.
+    L'itération parcourt les cases 'paires' puis les 'impaires', comme l'ancienne liste.
+    """
+    __slots__ = ("parity_classes",)
+
+    def __init__(self, coords: Iterable[Coord] = ()):
+        self.parity_classes: Tuple[IndexedSet, IndexedSet] = (IndexedSet(), IndexedSet())
+        for coord in coords:
+            self.add(coord)
+
+    @classmethod
+    def full_board(cls, size: int, rng=random) -> "CoordinateSet":
+        """Toutes les cases d'un plateau size x size, mélangées au sein de chaque parité."""
+        coord_set = cls((r, c) for r in range(size) for c in range(size))
+        coord_set.shuffle(rng)
+        return coord_set
+
+    def add(self, coord: Coord):
+        self.parity_classes[(coord[0] + coord[1]) & 1].add(coord)
+
+    def discard(self, coord: Coord) -> bool:
+        return self.parity_classes[(coord[0] + coord[1]) & 1].discard(coord)
+
+    def remove(self, coord: Coord):
+        self.parity_classes[(coord[0] + coord[1]) & 1].remove(coord)
+
+    def parity(self, parity: int) -> IndexedSet:
+        """Les coordonnées restantes de la classe de parité donnée (0 : paires, 1 : impaires)."""
+        return self.parity_classes[parity]
+
+    def larger_parity(self) -> Optional[IndexedSet]:
+        """La classe de parité qui a le plus de cases restantes (les paires en cas d'égalité)."""
+        even, odd = self.parity_classes
+        if not even and not odd:
+            return None
+        return even if len(even) >= len(odd) else odd
+
+    def choice(self, rng=random) -> Coord:
+        """Tire une coordonnée uniformément parmi toutes les cases restantes."""
+        return self[rng.randrange(len(self))]
+
+    def shuffle(self, rng=random):
+        """Mélange l'ordre d'itération au sein de chaque parité."""
+        for parity_class in self.parity_classes:
+            parity_class.shuffle(rng)
+
+    def __contains__(self, coord) -> bool:
+        return coord in self.parity_classes[(coord[0] + coord[1]) & 1]
+
+    def __len__(self) -> int:
+        return len(self.parity_classes[0]) + len(self.parity_classes[1])
+
+    def __bool__(self) -> bool:
+        return bool(self.parity_classes[0]) or bool(self.parity_classes[1])
+
+    def __iter__(self) -> Iterator[Coord]:
+        yield from self.parity_classes[0]
+        yield from self.parity_classes[1]
+
+    def __getitem__(self, position: int) -> Coord:
+        even = self.parity_classes[0]
+        if position < len(even):
+            return even[position]
+        return self.parity_classes[1][position - len(even)]
+
+
+class _SparseParityClass:
+    """Les cases restantes d'une couleur du damier d'un SparseCoordinateSet (même usage qu'un IndexedSet)."""
+    __slots__ = ("_owner", "_parity")
+
+    def __init__(self, owner: "SparseCoordinateSet", parity: int):
+        self._owner = owner
+        self._parity = parity
+
+    def choice(self, rng=random) -> Coord:
+        """Tire une case de cette couleur uniformément au hasard."""
+        return self._owner._choice(rng, self._parity)
+
+    def __contains__(self, coord) -> bool:
+        return (coord[0] + coord[1]) & 1 == self._parity and coord in self._owner
+
+    def __len__(self) -> int:
+        owner = self._owner
+        return owner._parity_total(self._parity) - owner._removed_by_parity[self._parity]
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Coord]:
+        owner = self._owner
+        for r in range(owner.size):
+            for c in range((self._parity - r) & 1, owner.size, 2):
+                if r * owner.size + c not in owner._removed:
+                    yield r, c
+
+
+class SparseCoordinateSet:
+    """
+    Les cases non tirées d'un très grand plateau, stockées par leur complément : seules les
+    cases retirées sont gardées, la mémoire suit donc le nombre de tirs et non la surface.
+
+    Même usage qu'un CoordinateSet (appartenance, retrait, tirage au sort, classes de
+    parité). Un tirage se fait par rejet parmi toutes les cases du plateau, en O(1) tant
+    que la plupart restent à tirer ; l'itération, elle, parcourt tout le plateau.
+
+    Attributes:
+        size (int): La taille du plateau.
+    """
+    __slots__ = ("size", "_removed", "_removed_by_parity", "parity_classes")
+
+    def __init__(self, size: int, removed: Iterable[Coord] = ()):
+        self.size = size
+        self._removed: Set[int] = set()
+        self._removed_by_parity = [0, 0]
+        self.parity_classes = (_SparseParityClass(self, 0), _SparseParityClass(self, 1))
+        for coord in removed:
+            self.discard(coord)
+
+    @property
+    def removed(self) -> List[Coord]:
+        """Les cases retirées, par index croissant."""
+        return [divmod(index, self.size) for index in sorted(self._removed)]
+
+    def _index(self, coord) -> Optional[int]:
+        r, c = coord
+        if 0 <= r < self.size and 0 <= c < self.size:
+            return r * self.size + c
+        return None
+
+    def _parity_total(self, parity: int) -> int:
+        """Nombre de cases du plateau de cette couleur."""
+        cells = self.size * self.size
+        return (cells + 1 - parity) // 2
+
+    def _choice(self, rng, parity: Optional[int] = None) -> Coord:
+        size, removed = self.size, self._removed
+        for _ in range(_MAX_REJECTIONS):
+            index = rng.randrange(size * size)
+            r, c = divmod(index, size)
+            if index not in removed and (parity is None or (r + c) & 1 == parity):
+                return r, c
+        # Plateau presque entièrement tiré : on tire parmi les cases restantes
+        remaining = list(self.parity_classes[parity]) if parity is not None else list(self)
+        if not remaining:
+            raise IndexError("Cannot choose from an empty sequence")
+        return rng.choice(remaining)
+
+    def add(self, coord: Coord):
+        index = self._index(coord)
+        if index is not None and index in self._removed:
+            self._removed.remove(index)
+            self._removed_by_parity[(coord[0] + coord[1]) & 1] -= 1
+
+    def discard(self, coord: Coord) -> bool:
+        index = self._index(coord)
+        if index is None or index in self._removed:
+            return False
+        self._removed.add(index)
+        self._removed_by_parity[(coord[0] + coord[1]) & 1] += 1
+        return True
+
+    def remove(self, coord: Coord):
+        if not self.discard(coord):
+            raise ValueError(f"{coord} n'est pas dans l'ensemble")
+
+    def parity(self, parity: int) -> _SparseParityClass:
+        return self.parity_classes[parity]
+
+    def larger_parity(self) -> Optional[_SparseParityClass]:
+        """La classe de parité qui a le plus de cases restantes (les paires en cas d'égalité)."""
+        even, odd = self.parity_classes
+        if not even and not odd:
+            return None
+        return even if len(even) >= len(odd) else odd
+
+    def choice(self, rng=random) -> Coord:
+        """Tire une coordonnée uniformément parmi toutes les cases restantes."""
+        return self._choice(rng)
+
+    def shuffle(self, rng=random):
+        """Sans effet : les tirages ne dépendent pas d'un ordre des cases."""
+
+    def __contains__(self, coord) -> bool:
+        index = self._index(coord)
+        return index is not None and index not in self._removed
+
+    def __len__(self) -> int:
+        return self.size * self.size - len(self._removed)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Coord]:
+        yield from self.parity_classes[0]
+        yield from self.parity_classes[1]
+
+
+def full_board_set(size: int, rng=random):
+    """
+    Toutes les cases d'un plateau size x size : un CoordinateSet mélangé jusqu'à
+    LARGE_BOARD_SIZE exclu, un SparseCoordinateSet au-delà.
+    """
+    if size >= LARGE_BOARD_SIZE:
+        return SparseCoordinateSet(size)
+    return CoordinateSet.full_board(size, rng)
@@ -0,0 +1,103 @@
+"""
+Moteur de densité de probabilité vectorisé avec NumPy.
+
+Recalcule d'un bloc la grille complète que PlacementCounts.grid() lit case par case :
+le nombre de placements possibles vient de sommes glissantes sur un masque des cases
+bloquées, au lieu d'énumérer chaque placement. C'est le moteur "numpy" de
+AIPlayer.probability_grid ; la chasse, elle, lit les compteurs incrémentaux.
+"""
+from collections import Counter
+from typing import Iterable
+
+import numpy as np
+
+
+def bits_to_array(bits: int, size: int) -> np.ndarray:
+    """
+    Convertit un bitboard (bit `r * size + c` pour la case (r, c)) en tableau booléen size x size.
+    """
+    n_cells = size * size
+    raw = np.frombuffer(bits.to_bytes((n_cells + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:n_cells].reshape(size, size).astype(bool)
+
+
+def _window_coverage(blocked: np.ndarray, length: int) -> np.ndarray:
+    """
+    Compte, pour chaque case, les placements horizontaux valides de longueur `length` qui la couvrent.
+    Un placement est valide si aucune de ses cases n'est bloquée.
+    """
+    rows, cols = blocked.shape
+    coverage = np.zeros((rows, cols), dtype=np.int64)
+    n_starts = cols - length + 1
+    if n_starts <= 0:
+        return coverage
+
+    # Somme glissante des cases bloquées : fenêtre [c, c + length)
+    prefix = np.zeros((rows, cols + 1), dtype=np.int64)
+    np.cumsum(blocked, axis=1, out=prefix[:, 1:])
+    valid_starts = (prefix[:, length:] - prefix[:, :n_starts]) == 0
+
+    # Une case c est couverte par les départs dans [c - length + 1, c]
+    start_prefix = np.zeros((rows, n_starts + 1), dtype=np.int64)
+    np.cumsum(valid_starts, axis=1, out=start_prefix[:, 1:])
+    col = np.arange(cols)
+    upper = np.minimum(col, n_starts - 1) + 1
+    lower = np.maximum(col - length + 1, 0)
+    coverage[:] = start_prefix[:, upper] - start_prefix[:, lower]
+    return coverage
+
+
+def _neighbour_count(mask: np.ndarray) -> np.ndarray:
+    """Nombre de voisins orthogonaux (haut, bas, gauche, droite) à True pour chaque case."""
+    count = np.zeros(mask.shape, dtype=np.int64)
+    count[1:, :] += mask[:-1, :]
+    count[:-1, :] += mask[1:, :]
+    count[:, 1:] += mask[:, :-1]
+    count[:, :-1] += mask[:, 1:]
+    return count
+
+
+def placement_counts(shot: np.ndarray, ship_lengths: Iterable[int]) -> np.ndarray:
+    """
+    Nombre de placements (horizontaux et verticaux) de chaque navire restant couvrant chaque case,
+    sans aucune case déjà tirée.
+    """
+    counts = np.zeros(shot.shape, dtype=np.int64)
+    for length, multiplicity in Counter(ship_lengths).items():
+        horizontal = _window_coverage(shot, length)
+        vertical = _window_coverage(shot.T, length).T
+        counts += multiplicity * (horizontal + vertical)
+    return counts
+
+
+def compute_probability_grid(size: int, hit_bits: int, miss_bits: int, ship_lengths: Iterable[int]) -> np.ndarray:
+    """
+    Calcule la grille de probabilités de la phase de chasse.
+
+    Args:
+        size (int): La taille du plateau de cible.
+        hit_bits (int): Bitboard des tirs touchés ('X').
+        miss_bits (int): Bitboard des tirs manqués ('O').
+        ship_lengths (Iterable[int]): Longueurs des navires encore à flot.
+
+    Returns:
+        np.ndarray: Grille size x size d'entiers, identique à PlacementCounts.grid().
+    """
+    ship_lengths = list(ship_lengths)
+    if not ship_lengths:
+        return np.zeros((size, size), dtype=np.int64)
+
+    hits = bits_to_array(hit_bits, size)
+    shot = hits | bits_to_array(miss_bits, size)
+    prob = placement_counts(shot, ship_lengths)
+
+    # Bonus de +2 par hit adjacent pour les cases non tirées
+    prob += 2 * _neighbour_count(hits) * ~shot
+
+    # Pénalité de -1 pour les cases positives dont aucun voisin n'est positif.
+    # Dans la version séquentielle, un voisin déjà traité n'a pu être pénalisé que s'il
+    # était lui-même isolé, ce qui est impossible à côté d'une case positive : le calcul
+    # sur la grille d'origine donne donc exactement le même résultat.
+    positive = prob > 0
+    prob -= positive & (_neighbour_count(positive) == 0)
+    return prob
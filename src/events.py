@@ -0,0 +1,129 @@
+"""
+Bus d'événements typés du moteur de jeu.
+
+Le moteur (plateaux, joueurs, IA) ne fait plus de print() : il publie des événements
+sur un EventBus, et les interfaces (console, Pygame) s'y abonnent. Chaque point
+d'émission teste d'abord `bus.sinks`, si bien qu'un bus sans abonné ne coûte qu'un
+test de liste vide : aucun objet événement n'est construit.
+"""
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+
+class ShotFired(NamedTuple):
+    """Un joueur a tiré sur le plateau adverse."""
+    shooter: str
+    target: str
+    coord: Tuple[int, int]
+    result: str
+
+
+class ShipHit(NamedTuple):
+    """Un navire a été touché (sans être coulé)."""
+    owner: str
+    ship_name: str
+    coord: Tuple[int, int]
+
+
+class ShipSunk(NamedTuple):
+    """Un navire a été coulé par le tir en `coord`."""
+    owner: str
+    ship_name: str
+    length: int
+    coord: Tuple[int, int]
+
+
+class FleetPlaced(NamedTuple):
+    """Un joueur a fini de placer sa flotte (complete=False si un navire n'a pas pu l'être)."""
+    player: str
+    complete: bool
+
+
+class AIModeChanged(NamedTuple):
+    """L'IA change de mode de décision (ciblage, fin de jeu, chasse...)."""
+    player: str
+    mode: str
+    previous_mode: Optional[str]
+    coord: Tuple[int, int]
+
+
+class AIStrategyAdapted(NamedTuple):
+    """L'IA a ajusté ses paramètres adaptatifs."""
+    player: str
+    reason: str
+    aggression_level: float
+    parity_preference: float
+
+
+class GameOver(NamedTuple):
+    """La partie est terminée."""
+    winner: str
+    loser: str
+
+
+Sink = Callable[[NamedTuple], None]
+
+
+class EventBus:
+    """
+    Distribue les événements du moteur aux abonnés (sinks).
+
+    Attributes:
+        sinks (list): Les fonctions appelées avec chaque événement publié.
+    """
+    __slots__ = ("sinks",)
+
+    def __init__(self):
+        self.sinks: List[Sink] = []
+
+    def subscribe(self, sink: Sink) -> Sink:
+        """Abonne une fonction `sink(event)` au bus et la retourne."""
+        self.sinks.append(sink)
+        return sink
+
+    def unsubscribe(self, sink: Sink):
+        """Désabonne une fonction précédemment abonnée."""
+        self.sinks.remove(sink)
+
+    def emit(self, event):
+        """
+        Publie un événement. Les appelants testent `bus.sinks` avant de construire
+        l'événement pour que l'émission soit gratuite sans abonné.
+        """
+        for sink in self.sinks:
+            sink(event)
+
+
+def _format_coord(coord: Tuple[int, int]) -> str:
+    return f"{chr(65 + coord[1])}{coord[0] + 1}"
+
+
+class ConsoleSink:
+    """
+    Abonné qui affiche les événements dans le terminal (interface console).
+
+    Attributes:
+        verbose (bool): Affiche aussi les détails internes de l'IA (changements de mode, adaptation).
+    """
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
+
+    def __call__(self, event):
+        if isinstance(event, ShotFired):
+            print(f"{event.shooter} tire en {_format_coord(event.coord)}.")
+        elif isinstance(event, ShipHit):
+            print(f"Bateau {event.ship_name} touché à {_format_coord(event.coord)}!")
+        elif isinstance(event, ShipSunk):
+            print(f"Bateau {event.ship_name} touché à {_format_coord(event.coord)}!")
+            print(f"Le {event.ship_name} de {event.owner} est coulé !")
+        elif isinstance(event, FleetPlaced):
+            if not event.complete:
+                print(f"ATTENTION: Impossible de placer tous les navires de {event.player} !")
+            print(f"Tous les navires de {event.player} sont placés. Préparez-vous !")
+        elif isinstance(event, GameOver):
+            print(f"\nFELICITATIONS ! {event.winner} a coulé tous les navires de {event.loser} !")
+            print(f"{event.winner} GAGNE LA PARTIE !")
+        elif self.verbose and isinstance(event, AIModeChanged):
+            print(f"{event.player} passe en mode {event.mode} ({_format_coord(event.coord)}).")
+        elif self.verbose and isinstance(event, AIStrategyAdapted):
+            print(f"{event.player}: {event.reason} (agression {event.aggression_level:.2f}, "
+                  f"parité {event.parity_preference:.2f})")
@@ -0,0 +1,379 @@
+"""
+Tirage au sort d'une disposition complète de flotte.
+
+Au lieu d'essayer des (ligne, colonne, orientation) au hasard jusqu'à tomber sur une
+position libre, chaque navire est tiré directement parmi ses placements possibles
+(tables partagées de `placements`, ou placements calculés sur les très grands plateaux).
+Une recherche en profondeur avec retour arrière débloque les flottes un peu serrées. Si
+elle échoue vite, une recherche exhaustive prend le relais pour les flottes denses : le
+navire le plus contraint d'abord (ou la case la plus contrainte, quand toutes les cases
+libres doivent être couvertes), avec vérification en avant des placements restants. Un
+budget de nœuds borne le temps passé, et FleetPlacementError signale l'échec.
+"""
+import random
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .placements import placements_for
+
+# Les navires de cette longueur ou plus sont tenus à l'écart des bords (option avoid_edges)
+BIG_SHIP_LENGTH = 4
+# Poids d'un placement de gros navire qui commence hors de la bande des deux lignes/colonnes du bord
+EDGE_AVOID_WEIGHT = 10.0
+# Nombre de tirages au hasard tentés pour un navire avant d'énumérer ses placements libres
+QUICK_DRAWS = 8
+# Nœuds accordés au retour arrière simple avant de passer à la recherche exhaustive
+QUICK_NODES = 200
+
+# Poids relatif d'un placement, entre 0 et 1 (None : tous les placements se valent)
+Weight = Optional[Callable[[int], float]]
+
+
+class FleetPlacementError(Exception):
+    """Aucune disposition de la flotte n'a été trouvée (il n'en existe pas, ou le budget est épuisé)."""
+
+
+def _edge_weight(table, avoid_edges: bool) -> Weight:
+    """
+    Avec avoid_edges, les gros navires qui commencent dans [2, size - 3] (en ligne et en
+    colonne) sont EDGE_AVOID_WEIGHT fois plus probables que les autres.
+    """
+    size = table.size
+    if not avoid_edges or table.length < BIG_SHIP_LENGTH or size < 5:
+        return None
+    low, high = 2, size - 3
+    starts = table.starts
+    near_edge = 1.0 / EDGE_AVOID_WEIGHT
+
+    def weight(pid: int) -> float:
+        r, c, _ = starts[pid]
+        return 1.0 if low <= r <= high and low <= c <= high else near_edge
+    return weight
+
+
+def _draw(table, weight: Weight, rng) -> int:
+    """Tire un identifiant de placement selon les poids (par rejet, uniformément si weight est None)."""
+    while True:
+        pid = rng.randrange(len(table))
+        if weight is None or rng.random() < weight(pid):
+            return pid
+
+
+def _fits(cells: Sequence[int], occupied: Set[int]) -> bool:
+    for index in cells:
+        if index in occupied:
+            return False
+    return True
+
+
+def _candidates(table, weight: Weight, occupied: Set[int], rng) -> Iterator[int]:
+    """
+    Placements libres d'un navire, dans un ordre aléatoire respectant les poids.
+    Quelques tirages directs suffisent presque toujours ; la liste complète des placements
+    libres n'est construite que si l'on revient en arrière jusqu'ici.
+    """
+    tried = set()
+    for _ in range(QUICK_DRAWS):
+        pid = _draw(table, weight, rng)
+        if pid not in tried:
+            tried.add(pid)
+            if _fits(table.cells[pid], occupied):
+                yield pid
+
+    cells = table.cells
+    free = [pid for pid in range(len(table)) if pid not in tried and _fits(cells[pid], occupied)]
+    _shuffle(free, weight, rng)
+    yield from free
+
+
+def _shuffle(items: list, weight: Optional[Callable], rng):
+    """Mélange `items` sur place ; avec des poids, les éléments lourds passent plus souvent en premier."""
+    if weight is None:
+        rng.shuffle(items)
+    else:
+        # Permutation pondérée (clé u^(1/w))
+        items.sort(key=lambda item: -(rng.random() ** (1.0 / weight(item))))
+
+
+def _sample_uniform(tables: list, weights: List[Weight], rng, max_rejections: int) -> Optional[List[int]]:
+    """
+    Tirage exact par rejet : chaque navire est tiré indépendamment et la disposition n'est
+    gardée que s'ils ne se chevauchent pas. Chaque disposition valide a donc une probabilité
+    proportionnelle au produit des poids de ses placements (uniforme sans pondération).
+    """
+    for _ in range(max_rejections):
+        occupied: Set[int] = set()
+        layout = []
+        for table, weight in zip(tables, weights):
+            pid = _draw(table, weight, rng)
+            cells = table.cells[pid]
+            if not _fits(cells, occupied):
+                break
+            occupied.update(cells)
+            layout.append(pid)
+        else:
+            return layout
+    return None
+
+
+def _sample_backtracking(tables: list, weights: List[Weight], rng, max_nodes: int) -> Optional[List[int]]:
+    """
+    Recherche en profondeur avec retour arrière, plus gros navires d'abord.
+    Returns None si le budget de nœuds est épuisé ou si aucune disposition n'existe.
+    """
+    order = sorted(range(len(tables)), key=lambda i: -tables[i].length)
+    occupied: Set[int] = set()
+    layout: List[int] = [0] * len(tables)
+    budget = [max_nodes]
+
+    def place(depth: int) -> bool:
+        if depth == len(order):
+            return True
+        ship = order[depth]
+        table = tables[ship]
+        for pid in _candidates(table, weights[ship], occupied, rng):
+            budget[0] -= 1
+            if budget[0] < 0:
+                return False
+            cells = table.cells[pid]
+            occupied.update(cells)
+            layout[ship] = pid
+            if place(depth + 1):
+                return True
+            occupied.difference_update(cells)
+        return False
+
+    return layout if place(0) else None
+
+
+class _ExhaustiveSearch:
+    """
+    Recherche exhaustive d'une disposition, pour les flottes denses.
+
+    Les navires de même longueur sont interchangeables : on place « un navire de longueur L »,
+    et les placements trouvés ne sont attribués aux navires qu'à la fin. Chaque case
+    libre compte les placements libres (des longueurs encore à placer) qui la couvrent ;
+    une case qui n'en a plus aucun ne sera jamais occupée. Une branche est abandonnée dès
+    qu'une longueur n'a plus assez de placements libres, ou que les cases encore
+    couvrables ne suffisent plus aux navires restants (vérification en avant).
+
+    À chaque nœud, on branche sur le choix le plus contraint : soit la longueur qui a le
+    moins de placements libres (l'un d'eux sera pris), soit la case couvrable qui a le
+    moins de placements (l'un d'eux la couvrira, ou elle restera vide s'il reste de la marge).
+    """
+    def __init__(self, tables: list, weights: List[Weight], rng, max_nodes: int):
+        self.rng = rng
+        self.nodes = max_nodes
+        self.exhausted = False
+        self.ships: Dict[int, List[int]] = {}
+        self.tables: Dict[int, object] = {}
+        self.weights: Dict[int, Weight] = {}
+        for ship, (table, weight) in enumerate(zip(tables, weights)):
+            self.ships.setdefault(table.length, []).append(ship)
+            self.tables[table.length] = table
+            self.weights[table.length] = weight
+        self.lengths = sorted(self.tables, reverse=True)
+        self.remaining = {length: len(ships) for length, ships in self.ships.items()}
+        self.placed: Dict[int, List[int]] = {length: [] for length in self.lengths}
+
+        n_cells = tables[0].size ** 2
+        self.occupied = bytearray(n_cells) # Case prise par un navire, ou laissée vide pour de bon
+        # Pour chaque placement, le nombre de ses cases occupées (0 : placement libre)
+        self.blocked = {length: [0] * len(table) for length, table in self.tables.items()}
+        self.free_count = {length: len(table) for length, table in self.tables.items()}
+        self.cover = [0] * n_cells
+        for table in self.tables.values():
+            for cells in table.cells:
+                for index in cells:
+                    self.cover[index] += 1
+        self.uncoverable = self.cover.count(0)
+        self.free_cells = n_cells
+        self.needed = sum(length * len(ships) for length, ships in self.ships.items())
+
+    def run(self) -> Optional[List[int]]:
+        if not self._search():
+            return None
+        layout = [0] * sum(len(ships) for ships in self.ships.values())
+        for length, ships in self.ships.items():
+            pids = self.placed[length]
+            self.rng.shuffle(pids)
+            for ship, pid in zip(ships, pids):
+                layout[ship] = pid
+        return layout
+
+    def _uncount(self, length: int, pid: int):
+        """Le placement ne compte plus pour la couverture de ses cases."""
+        cover, occupied = self.cover, self.occupied
+        for index in self.tables[length].cells[pid]:
+            cover[index] -= 1
+            if not cover[index] and not occupied[index]:
+                self.uncoverable += 1
+
+    def _count(self, length: int, pid: int):
+        cover, occupied = self.cover, self.occupied
+        for index in self.tables[length].cells[pid]:
+            if not cover[index] and not occupied[index]:
+                self.uncoverable -= 1
+            cover[index] += 1
+
+    def _occupy(self, cells: Sequence[int]):
+        """Occupe des cases couvrables et bloque les placements qui les traversent."""
+        for index in cells:
+            self.occupied[index] = 1
+        self.free_cells -= len(cells)
+        for index in cells:
+            for other in self.lengths:
+                blocked = self.blocked[other]
+                for other_pid in self.tables[other].placements_covering(index):
+                    blocked[other_pid] += 1
+                    if blocked[other_pid] == 1:
+                        self.free_count[other] -= 1
+                        if self.remaining[other]:
+                            self._uncount(other, other_pid)
+
+    def _release(self, cells: Sequence[int]):
+        """Défait exactement _occupy (les cases restent occupées jusqu'à la fin, comme à l'aller)."""
+        for index in cells:
+            for other in self.lengths:
+                blocked = self.blocked[other]
+                for other_pid in self.tables[other].placements_covering(index):
+                    if blocked[other_pid] == 1:
+                        self.free_count[other] += 1
+                        if self.remaining[other]:
+                            self._count(other, other_pid)
+                    blocked[other_pid] -= 1
+        for index in cells:
+            self.occupied[index] = 0
+        self.free_cells += len(cells)
+
+    def _set_remaining(self, length: int, delta: int):
+        """
+        Change le nombre de navires de cette longueur encore à placer. Quand il tombe à zéro,
+        les placements libres de cette longueur ne couvrent plus rien.
+        """
+        blocked = self.blocked[length]
+        if delta > 0 and not self.remaining[length]:
+            for pid in range(len(blocked)):
+                if not blocked[pid]:
+                    self._count(length, pid)
+        self.remaining[length] += delta
+        self.needed += delta * length
+        if delta < 0 and not self.remaining[length]:
+            for pid in range(len(blocked)):
+                if not blocked[pid]:
+                    self._uncount(length, pid)
+
+    def _branches(self) -> Optional[List[Tuple[Optional[int], int]]]:
+        """
+        Les choix à essayer à ce nœud : (longueur, placement), ou (None, case) pour laisser
+        la case vide. None si la branche est sans issue.
+        """
+        remaining = [length for length in self.lengths if self.remaining[length]]
+        if any(self.free_count[length] < self.remaining[length] for length in remaining):
+            return None
+        slack = self.free_cells - self.uncoverable - self.needed
+        if slack < 0:
+            return None
+        cover, occupied = self.cover, self.occupied
+        cell = min((index for index in range(len(cover)) if cover[index] and not occupied[index]),
+                   key=cover.__getitem__)
+        length = min(remaining, key=lambda length: (self.free_count[length], -length))
+        if cover[cell] + (slack > 0) < self.free_count[length]:
+            branches = [(length, pid) for length in remaining
+                        for pid in self.tables[length].placements_covering(cell) if not self.blocked[length][pid]]
+        else:
+            cell = None
+            blocked = self.blocked[length]
+            branches = [(length, pid) for pid in range(len(blocked)) if not blocked[pid]]
+
+        weights = self.weights
+        if any(weights[length] is not None for length in remaining):
+            _shuffle(branches, lambda branch: 1.0 if weights[branch[0]] is None else weights[branch[0]](branch[1]),
+                     self.rng)
+        else:
+            self.rng.shuffle(branches)
+        if cell is not None and slack > 0:
+            branches.append((None, cell)) # En dernier recours, la case reste vide
+        return branches
+
+    def _search(self) -> bool:
+        if not self.needed:
+            return True
+        branches = self._branches()
+        if branches is None:
+            return False
+        for length, choice in branches:
+            self.nodes -= 1
+            if self.nodes < 0:
+                self.exhausted = True
+                return False
+            if length is None:
+                cells = (choice,)
+                self._occupy(cells)
+            else:
+                cells = self.tables[length].cells[choice]
+                self._occupy(cells)
+                self._set_remaining(length, -1)
+                self.placed[length].append(choice)
+            if self._search():
+                return True
+            if length is not None:
+                self.placed[length].pop()
+                self._set_remaining(length, +1)
+            self._release(cells)
+            if self.exhausted:
+                return False
+        return False
+
+
+def sample_fleet(size: int, ship_lengths: Sequence[int], rng=random, avoid_edges: bool = False,
+                 uniform: bool = False, max_rejections: int = 1000,
+                 max_nodes: int = 200_000) -> Optional[List[Tuple[int, int, str]]]:
+    """
+    Tire au sort une disposition de flotte sans chevauchement.
+
+    Args:
+        size (int): La taille du plateau.
+        ship_lengths (Sequence[int]): Les longueurs des navires à placer.
+        rng: Le générateur aléatoire (module random par défaut).
+        avoid_edges (bool): Favorise les positions éloignées des bords pour les gros navires.
+        uniform (bool): Tire exactement selon la loi uniforme (pondérée si avoid_edges) sur les
+                        dispositions complètes, par rejet. Si le rejet échoue `max_rejections`
+                        fois (flotte très dense), retourne None plutôt qu'une disposition biaisée :
+                        à l'appelant de se rabattre, s'il le veut, sur uniform=False.
+        max_rejections (int): Nombre maximum de dispositions rejetées en mode uniforme.
+        max_nodes (int): Nombre maximum de placements essayés par la recherche exhaustive
+                         (après QUICK_NODES placements du retour arrière simple).
+
+    Returns:
+        List[Tuple[int, int, str]] ou None: Pour chaque navire (dans l'ordre de ship_lengths),
+        (ligne, colonne, orientation) de sa première case ; None seulement en mode uniforme,
+        si le rejet a échoué.
+
+    Raises:
+        FleetPlacementError: Un navire est plus long que le plateau, ou la recherche n'a
+                             trouvé aucune disposition (il n'en existe pas, ou elle a épuisé
+                             `max_nodes`).
+    """
+    tables = [placements_for(size, length) for length in ship_lengths]
+    if not tables:
+        return []
+    for table in tables:
+        if not len(table):
+            raise FleetPlacementError(f"Un navire de longueur {table.length} ne tient pas sur un plateau {size}x{size}.")
+    weights = [_edge_weight(table, avoid_edges) for table in tables]
+
+    if uniform:
+        layout = _sample_uniform(tables, weights, rng, max_rejections)
+        if layout is None:
+            return None
+    else:
+        layout = _sample_backtracking(tables, weights, rng, min(QUICK_NODES, max_nodes))
+        if layout is None:
+            search = _ExhaustiveSearch(tables, weights, rng, max_nodes)
+            layout = search.run()
+            if layout is None:
+                reason = "budget de recherche épuisé" if search.exhausted else "aucune disposition n'existe"
+                raise FleetPlacementError(
+                    f"Impossible de placer les navires {sorted(ship_lengths, reverse=True)} "
+                    f"sur un plateau {size}x{size} : {reason}.")
+    return [table.starts[pid] for table, pid in zip(tables, layout)]
@@ -1,25 +1,96 @@
 from .human_player import HumanPlayer
 from .ai_player import AIPlayer
-from typing import List, Tuple
+from .events import ConsoleSink, EventBus, GameOver, ShotFired
+from .game_record import RESULT_CODES, GameRecordWriter
+from .rng import game_rngs
+from typing import List, Optional, Tuple
+
+def resolve_shot(player_shooting, target_player, shot_coord: Tuple[int, int]) -> str:
+    """
+    Résout un tir d'un joueur sur un autre, sans aucune entrée/sortie console.
+    Partagé par la partie interactive et les simulations sans interface.
+
+    Args:
+        player_shooting (Player): Le joueur qui tire.
+        target_player (Player): Le joueur visé.
+        shot_coord (tuple): Les coordonnées (row, col) du tir.
+
+    Returns:
+        str: Le résultat du tir ('miss', 'hit', 'sunk', 'already_hit' ou 'invalid').
+    """
+    result = target_player.own_board.receive_shot(shot_coord)
+
+    player_shooting.target_board.mark_shot(shot_coord, result)
+    if player_shooting.events.sinks:
+        player_shooting.events.emit(ShotFired(player_shooting.name, target_player.name, shot_coord, result))
+
+    # Informer le joueur adverse du tir qu'il a reçu
+    if isinstance(target_player, AIPlayer):
+        target_player.analyze_opponent_shot(shot_coord, result)
+
+    # Informer l'IA de son résultat de tir si c'est elle qui tire
+    if isinstance(player_shooting, AIPlayer):
+        # Comme dans le vrai jeu, l'adversaire annonce quel navire a été coulé
+        sunk_length = target_player.own_board.last_sunk_ship.length if result == 'sunk' else None
+        player_shooting.process_shot_result(shot_coord, result, sunk_length=sunk_length)
+
+    return result
 
 class Game:
     """
     Orchestre le déroulement du jeu de Bataille Navale.
     Gère les joueurs, les tours, les tirs et les conditions de victoire.
     """
-    def __init__(self, board_size: int = 10):
+    def __init__(self, board_size: int = 10, events: Optional[EventBus] = None,
+                 recorder: Optional[GameRecordWriter] = None, seed=None):
         """
         Initialise une nouvelle partie de Bataille Navale.
 
         Args:
             board_size (int): La taille des plateaux de jeu (par défaut 10x10).
+            events (EventBus, optional): Le bus d'événements de la partie. Par défaut, un bus
+                                         auquel l'affichage console est abonné.
+            recorder (GameRecordWriter, optional): Fichier d'enregistrement où écrire la partie
+                                                   (joueur 0 : l'humain, joueur 1 : l'IA).
+            seed (optional): Graine de la partie ; chaque joueur en dérive son propre flux
+                             aléatoire. Par défaut, les joueurs utilisent le module random.
         """
         self.board_size = board_size
-        self.player_human = HumanPlayer("Joueur", board_size)
-        self.player_ai = AIPlayer("IA", board_size)
+        self.recorder = recorder
+        if events is None:
+            events = EventBus()
+            events.subscribe(ConsoleSink())
+        self.events = events
+        rng_human, rng_ai = game_rngs(seed, 0) if seed is not None else (None, None)
+        self.player_human = HumanPlayer("Joueur", board_size, events=events, rng=rng_human)
+        self.player_ai = AIPlayer("IA", board_size, events=events, rng=rng_ai)
         self.current_player = self.player_human # Le joueur humain commence
         self.opponent_player = self.player_ai
 
+    @classmethod
+    def from_players(cls, player_human, player_ai, events: Optional[EventBus] = None,
+                     recorder: Optional[GameRecordWriter] = None, current: int = 0) -> "Game":
+        """
+        Crée une partie autour de joueurs existants (reprise d'un instantané, par exemple).
+
+        Args:
+            player_human (Player): Le joueur 0.
+            player_ai (Player): Le joueur 1.
+            events (EventBus, optional): Le bus d'événements de la partie (un bus sans abonné par défaut).
+            recorder (GameRecordWriter, optional): Fichier d'enregistrement où écrire la partie.
+            current (int): Le joueur dont c'est le tour (0 ou 1).
+        """
+        game = cls.__new__(cls)
+        game.board_size = player_human.own_board.size
+        game.recorder = recorder
+        game.events = events if events is not None else EventBus()
+        game.player_human, game.player_ai = player_human, player_ai
+        if current == 0:
+            game.current_player, game.opponent_player = player_human, player_ai
+        else:
+            game.current_player, game.opponent_player = player_ai, player_human
+        return game
+
     def _switch_players(self):
         """
         Change le joueur courant pour le joueur suivant.
@@ -32,27 +103,15 @@ class Game:
         Traite un tir effectué par un joueur sur un autre.
         Met à jour les plateaux et gère le résultat du tir.
         """
-        # ... (le code existant pour le traitement du tir et mise à jour de target_board) ...
-        result = target_player.own_board.receive_shot(shot_coord)
-
-        r, c = shot_coord
-        if result == 'hit' or result == 'sunk':
-            player_shooting.target_board.grid[r][c] = 'X'
-        elif result == 'miss':
-            player_shooting.target_board.grid[r][c] = 'O'
-
-        # Informer le joueur adverse du tir qu'il a reçu
-        # Il faut que target_player soit une instance de AIPlayer pour cette logique
-        if isinstance(target_player, AIPlayer):
-            # La méthode `AIPlayer.analyze_opponent_shot` n'existe pas encore, nous allons la créer.
-            target_player.process_shot_result(shot_coord, result)
-
-        # NOUVEAU : Informer l'IA de son résultat de tir si c'est elle qui tire
-        if isinstance(player_shooting, AIPlayer):
-            player_shooting.process_shot_result(shot_coord, result)
-            
+        result = resolve_shot(player_shooting, target_player, shot_coord)
+        if self.recorder is not None and result in RESULT_CODES:
+            self.recorder.add_shot(self._player_index(player_shooting), shot_coord, result)
         return result
 
+    def _player_index(self, player) -> int:
+        """Numéro du joueur dans l'enregistrement : 0 pour l'humain, 1 pour l'IA."""
+        return 0 if player is self.player_human else 1
+
     def start_game(self):
         """
         Démarre et gère le déroulement de la partie.
@@ -67,6 +126,11 @@ class Game:
         if isinstance(self.player_ai, AIPlayer):
             self.player_ai.update_untried_coordinates_after_placement()
 
+        if self.recorder is not None:
+            self.recorder.begin_game(self.board_size, first=self._player_index(self.current_player))
+            self.recorder.add_fleet(0, self.player_human.own_board)
+            self.recorder.add_fleet(1, self.player_ai.own_board)
+
 
         print("\\nTous les navires sont placés. La partie commence !")
         input("Appuyez sur Entrée pour continuer...")
@@ -110,7 +174,7 @@ class Game:
                     print(f"Une erreur est survenue lors de la saisie du tir : {e}. Réessayez.")
                     result = "invalid" # Force la re-saisie
 
-            # Le message de "touché", "coulé", "manqué" est déjà géré par receive_shot/hit_part
+            # Le message de "touché", "coulé", "manqué" est publié sur le bus d'événements
             # Ici, on peut ajouter un récapitulatif si on veut
             print(f"Résultat du tir de {self.current_player.name} : {result.upper()} !")
 
@@ -125,12 +189,20 @@ class Game:
 
             # Vérifier si l'adversaire a perdu après le tir
             if self.opponent_player.has_lost():
-                print(f"\nFELICITATIONS ! {self.current_player.name} a coulé tous les navires de {self.opponent_player.name} !")
-                print(f"{self.current_player.name} GAGNE LA PARTIE !")
+                if self.events.sinks:
+                    self.events.emit(GameOver(self.current_player.name, self.opponent_player.name))
                 break # Sortir de la boucle de jeu
 
             self._switch_players() # Passe au joueur suivant
 
+        if self.recorder is not None:
+            winner = None
+            if self.player_human.has_lost():
+                winner = 1
+            elif self.player_ai.has_lost():
+                winner = 0
+            self.recorder.end_game(winner)
+
         print("\n--- FIN DE LA PARTIE ---")
         # Afficher les plateaux finaux
         self.player_human.display_boards()
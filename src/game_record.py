@@ -0,0 +1,325 @@
+"""
+Enregistrement binaire compact des parties.
+
+Un fichier d'enregistrement est une suite de parties, suivie d'un index :
+
+    en-tête de fichier   MAGIC (4 octets), version (u16), réservé (u16)
+    partie 0             en-tête de partie, navires, tirs (entrées de taille fixe)
+    partie 1             ...
+    index                décalage (u64) de chaque partie
+    pied de page         décalage de l'index (u64), nombre de parties (u64), INDEX_MAGIC
+
+Toutes les entrées ont une taille fixe, si bien que le tir T de la partie K se trouve à
+    index[K] + GAME_HEADER.size + nb_navires * SHIP_ENTRY.size + T * SHOT_ENTRY.size
+Le lecteur projette le fichier en mémoire (mmap) et ne lit que ce qu'on lui demande.
+
+Le fichier est en ajout seul : rouvrir un fichier existant en écriture retire son index,
+ajoute les nouvelles parties à la suite puis réécrit l'index à la fermeture.
+
+L'index n'est qu'un raccourci : chaque partie se délimite elle-même (son en-tête donne
+le nombre de navires et de tirs). Si le processus s'arrête avant la fermeture, le
+fichier n'a pas de pied de page ; le lecteur comme l'écrivain reconstruisent alors
+l'index en parcourant les parties, et ignorent une dernière partie incomplète.
+"""
+import mmap
+import os
+import struct
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+MAGIC = b"BNRC"
+INDEX_MAGIC = b"BNIX"
+VERSION = 1
+
+FILE_HEADER = struct.Struct("<4sHH")
+# Taille du plateau, nombre de navires, nombre de tirs, joueur qui commence, gagnant
+GAME_HEADER = struct.Struct("<HHIBB")
+# Joueur, longueur, ligne, colonne, orientation ('H' ou 'V')
+SHIP_ENTRY = struct.Struct("<BBHHc")
+# Joueur qui tire, ligne, colonne, résultat
+SHOT_ENTRY = struct.Struct("<BHHB")
+INDEX_ENTRY = struct.Struct("<Q")
+FOOTER = struct.Struct("<QQ4s")
+
+NO_WINNER = 255
+RESULT_CODES = {"miss": 0, "hit": 1, "sunk": 2}
+RESULT_NAMES = {code: name for name, code in RESULT_CODES.items()}
+
+
+class RecordedShip(NamedTuple):
+    """Un navire tel qu'il a été placé au début de la partie."""
+    player: int
+    length: int
+    start: Tuple[int, int]
+    orientation: str
+
+
+class RecordedShot(NamedTuple):
+    """Un tir de la partie."""
+    player: int
+    coord: Tuple[int, int]
+    result: str
+
+
+class GameBuffer:
+    """
+    Encode une partie en cours, entrée par entrée, avant son écriture dans le fichier.
+
+    Attributes:
+        board_size (int): La taille des plateaux.
+        first (int): L'index du joueur qui commence.
+    """
+    def __init__(self, board_size: int, first: int = 0):
+        self.board_size = board_size
+        self.first = first
+        self._ships = bytearray()
+        self._shots = bytearray()
+        self._ship_count = 0
+        self._shot_count = 0
+
+    def add_ship(self, player: int, length: int, start: Tuple[int, int], orientation: str):
+        self._ships += SHIP_ENTRY.pack(player, length, start[0], start[1], orientation.encode("ascii"))
+        self._ship_count += 1
+
+    def add_fleet(self, player: int, board):
+        """Ajoute tous les navires placés sur le plateau `board` du joueur."""
+        for ship in board.ships:
+            coords = ship.coordinates
+            orientation = 'V' if len(coords) > 1 and coords[1][1] == coords[0][1] else 'H'
+            self.add_ship(player, ship.length, coords[0], orientation)
+
+    def add_shot(self, player: int, coord: Tuple[int, int], result: str):
+        self._shots += SHOT_ENTRY.pack(player, coord[0], coord[1], RESULT_CODES[result])
+        self._shot_count += 1
+
+    def finish(self, winner: Optional[int]) -> bytes:
+        """Retourne la partie encodée (le gagnant vaut None si la partie n'est pas allée au bout)."""
+        header = GAME_HEADER.pack(self.board_size, self._ship_count, self._shot_count, self.first,
+                                  NO_WINNER if winner is None else winner)
+        return header + bytes(self._ships) + bytes(self._shots)
+
+
+class GameRecordWriter:
+    """
+    Écrit des parties dans un fichier d'enregistrement, en ajout seul.
+
+    Usage :
+        with GameRecordWriter("parties.bnr") as writer:
+            writer.begin_game(board_size=10, first=0)
+            writer.add_fleet(0, joueur_a.own_board)
+            writer.add_shot(0, (3, 4), "hit")
+            writer.end_game(winner=0)
+    """
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Le fichier d'enregistrement (créé s'il n'existe pas, complété sinon).
+        """
+        self.path = path
+        self._offsets: List[int] = []
+        self._current: Optional[GameBuffer] = None
+        if os.path.exists(path) and os.path.getsize(path) >= FILE_HEADER.size:
+            self._file = open(path, "r+b")
+            self._offsets, games_end, _ = _read_index(self._file)
+            # Les nouvelles parties écrasent l'ancien index (ou une partie incomplète),
+            # l'index est réécrit à la fermeture
+            self._file.seek(games_end)
+            self._file.truncate()
+        else:
+            self._file = open(path, "wb")
+            self._file.write(FILE_HEADER.pack(MAGIC, VERSION, 0))
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def begin_game(self, board_size: int, first: int = 0):
+        """Commence une nouvelle partie (la précédente doit être terminée)."""
+        if self._current is not None:
+            raise RuntimeError("La partie précédente n'a pas été terminée (end_game).")
+        self._current = GameBuffer(board_size, first)
+
+    def add_ship(self, player: int, length: int, start: Tuple[int, int], orientation: str):
+        self._current.add_ship(player, length, start, orientation)
+
+    def add_fleet(self, player: int, board):
+        self._current.add_fleet(player, board)
+
+    def add_shot(self, player: int, coord: Tuple[int, int], result: str):
+        self._current.add_shot(player, coord, result)
+
+    def end_game(self, winner: Optional[int]):
+        """Termine la partie en cours et l'écrit dans le fichier."""
+        self.write_encoded(self._current.finish(winner))
+        self._current = None
+
+    def write_encoded(self, game: bytes):
+        """Écrit une partie déjà encodée (par un GameBuffer, par exemple dans un autre processus)."""
+        self._offsets.append(self._file.tell())
+        self._file.write(game)
+
+    def close(self):
+        """Écrit l'index et le pied de page, puis ferme le fichier."""
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        self._file.write(b"".join(INDEX_ENTRY.pack(offset) for offset in self._offsets))
+        self._file.write(FOOTER.pack(index_offset, len(self._offsets), INDEX_MAGIC))
+        self._file.close()
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _read_index(f) -> Tuple[List[int], int, bool]:
+    """
+    Lit l'index des parties d'un fichier d'enregistrement ouvert en binaire.
+
+    Returns:
+        tuple: (décalages des parties, fin de la dernière partie, True si l'index a dû
+               être reconstruit faute de pied de page).
+
+    Raises:
+        ValueError: Si le fichier n'est pas un enregistrement de parties.
+    """
+    f.seek(0)
+    header = f.read(FILE_HEADER.size)
+    if len(header) < FILE_HEADER.size:
+        raise ValueError("Ce fichier n'est pas un enregistrement de parties.")
+    magic, version, _ = FILE_HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Ce fichier n'est pas un enregistrement de parties.")
+    if version != VERSION:
+        raise ValueError(f"Version d'enregistrement non prise en charge : {version}")
+    size = f.seek(0, os.SEEK_END)
+    if size >= FILE_HEADER.size + FOOTER.size:
+        f.seek(-FOOTER.size, os.SEEK_END)
+        index_offset, count, index_magic = FOOTER.unpack(f.read(FOOTER.size))
+        if index_magic == INDEX_MAGIC and index_offset + count * INDEX_ENTRY.size + FOOTER.size == size:
+            f.seek(index_offset)
+            data = f.read(count * INDEX_ENTRY.size)
+            return [offset for (offset,) in INDEX_ENTRY.iter_unpack(data)], index_offset, False
+    # Pas de pied de page : le fichier n'a pas été fermé, on parcourt les parties sur la
+    # projection en mémoire (seules les entrées vérifiées sont copiées, jamais tout le fichier)
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offsets, games_end = _scan_games(data)
+    return offsets, games_end, True
+
+
+def _scan_games(data) -> Tuple[List[int], int]:
+    """Retrouve les parties complètes d'un fichier sans index, et la fin de la dernière."""
+    offsets: List[int] = []
+    offset = FILE_HEADER.size
+    while True:
+        end = _game_end(data, offset)
+        if end is None:
+            return offsets, offset
+        offsets.append(offset)
+        offset = end
+
+
+def _game_end(data, offset: int) -> Optional[int]:
+    """
+    Fin de la partie qui commence à `offset`, ou None si elle est incomplète ou incohérente
+    (partie interrompue, ou index à moitié écrit au moment de l'arrêt).
+    """
+    if offset + GAME_HEADER.size > len(data):
+        return None
+    board_size, ship_count, shot_count, first, winner = GAME_HEADER.unpack_from(data, offset)
+    ships_offset = offset + GAME_HEADER.size
+    shots_offset = ships_offset + ship_count * SHIP_ENTRY.size
+    end = shots_offset + shot_count * SHOT_ENTRY.size
+    if board_size == 0 or first > 1 or winner not in (0, 1, NO_WINNER) or end > len(data):
+        return None
+    for player, length, r, c, orientation in SHIP_ENTRY.iter_unpack(data[ships_offset:shots_offset]):
+        if player > 1 or length == 0 or orientation not in (b"H", b"V") or r >= board_size or c >= board_size:
+            return None
+    for player, r, c, result in SHOT_ENTRY.iter_unpack(data[shots_offset:end]):
+        if player > 1 or result not in RESULT_NAMES or r >= board_size or c >= board_size:
+            return None
+    return end
+
+
+class RecordedGame:
+    """
+    Vue d'une partie dans un fichier projeté en mémoire : rien n'est décodé à l'avance.
+
+    Attributes:
+        board_size (int): La taille des plateaux.
+        first (int): L'index du joueur qui a commencé.
+        winner (int or None): L'index du gagnant, None si la partie n'est pas allée au bout.
+        ship_count (int): Le nombre de navires enregistrés (des deux joueurs).
+        shot_count (int): Le nombre de tirs.
+    """
+    def __init__(self, data, offset: int):
+        self._data = data
+        (self.board_size, self.ship_count, self.shot_count,
+         self.first, winner) = GAME_HEADER.unpack_from(data, offset)
+        self.winner = None if winner == NO_WINNER else winner
+        self._ships_offset = offset + GAME_HEADER.size
+        self._shots_offset = self._ships_offset + self.ship_count * SHIP_ENTRY.size
+
+    def ship(self, i: int) -> RecordedShip:
+        if not 0 <= i < self.ship_count:
+            raise IndexError("ship index out of range")
+        player, length, r, c, orientation = SHIP_ENTRY.unpack_from(self._data, self._ships_offset + i * SHIP_ENTRY.size)
+        return RecordedShip(player, length, (r, c), orientation.decode("ascii"))
+
+    @property
+    def ships(self) -> List[RecordedShip]:
+        return [self.ship(i) for i in range(self.ship_count)]
+
+    def shot(self, turn: int) -> RecordedShot:
+        """Le tir numéro `turn` (à partir de 0), lu directement à sa position."""
+        if not 0 <= turn < self.shot_count:
+            raise IndexError("shot index out of range")
+        player, r, c, result = SHOT_ENTRY.unpack_from(self._data, self._shots_offset + turn * SHOT_ENTRY.size)
+        return RecordedShot(player, (r, c), RESULT_NAMES[result])
+
+    def shots(self, start: int = 0) -> Iterator[RecordedShot]:
+        """Les tirs à partir du numéro `start`."""
+        end = self._shots_offset + self.shot_count * SHOT_ENTRY.size
+        for player, r, c, result in SHOT_ENTRY.iter_unpack(
+                self._data[self._shots_offset + start * SHOT_ENTRY.size:end]):
+            yield RecordedShot(player, (r, c), RESULT_NAMES[result])
+
+
+class GameRecordReader:
+    """
+    Lit un fichier d'enregistrement projeté en mémoire, avec accès direct à la partie K.
+
+    Usage :
+        with GameRecordReader("parties.bnr") as reader:
+            tir = reader[1234].shot(17)
+
+    Attributes:
+        offsets (list): Décalage de chaque partie dans le fichier.
+        recovered (bool): True si le fichier n'avait pas été fermé et que l'index a été
+                          reconstruit en parcourant les parties.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self.offsets, _, self.recovered = _read_index(self._file)
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, k: int) -> RecordedGame:
+        return RecordedGame(self._data, self.offsets[k])
+
+    def __iter__(self) -> Iterator[RecordedGame]:
+        for offset in self.offsets:
+            yield RecordedGame(self._data, offset)
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> "GameRecordReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
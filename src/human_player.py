@@ -1,15 +1,16 @@
 from .player import Player
 from .ship import Ship
+from .events import EventBus
 from .utils import get_coordinates
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 class HumanPlayer(Player):
     """
     Implémentation d'un joueur humain.
     Gère la saisie utilisateur pour le placement des navires et les tirs.
     """
-    def __init__(self, name: str, board_size: int = 10):
-        super().__init__(name, board_size)
+    def __init__(self, name: str, board_size: int = 10, events: Optional[EventBus] = None, rng=None):
+        super().__init__(name, board_size, events, rng)
 
     def place_ships(self):
         """
@@ -63,8 +64,7 @@ class HumanPlayer(Player):
                 print("Coordonnées de tir invalides. Réessayez.")
             else:
                 # Vérifier si la cible a déjà été tirée
-                r, c = shot_coord
-                if self.target_board.grid[r][c] == 'X' or self.target_board.grid[r][c] == 'O':
+                if self.target_board.is_shot(shot_coord):
                     print("Vous avez déjà tiré à cet endroit. Choisissez une autre coordonnée.")
                 else:
                     return shot_coord
\ No newline at end of file
@@ -0,0 +1,387 @@
+"""
+Compteurs de placements maintenus de tir en tir pour la grille de probabilités de l'IA.
+
+Au lieu de réénumérer tous les placements de tous les navires à chaque coup, on garde
+pour chaque case le nombre de placements encore possibles qui la couvrent. Un tir ne
+retire que les placements qui passent par la case visée, et un navire coulé retire
+simplement sa longueur du décompte.
+
+Les cases non tirées sont aussi rangées par densité brute (placements + bonus) : la chasse
+ne lit que les niveaux les plus hauts au lieu de parcourir tout le plateau.
+
+Sur les très grands plateaux, SparsePlacementCounts garde la même interface sans aucune
+liste par case : la densité d'une case jamais approchée par un tir se calcule à partir de
+sa ligne et de sa colonne, et seules les cases proches des tirs sont mémorisées.
+make_placement_counts choisit la version adaptée à la taille du plateau.
+"""
+import random
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .placements import LARGE_BOARD_SIZE, PlacementTable, get_placement_table, line_coverage, placements_for
+from .transposition import zobrist_key
+
+# Sur un plateau creux, nombre de cases ex aequo au-delà duquel la chasse arrête de chercher
+SPARSE_TIE_LIMIT = 256
+
+
+class PlacementCounts:
+    """
+    Densité de placements mise à jour incrémentalement.
+
+    Attributes:
+        size (int): La taille du plateau de cible.
+        multiplicity (Counter): Nombre de navires encore à flot pour chaque longueur.
+        counts (list of int): Pour chaque case (index r * size + c), la somme sur les navires
+                              restants du nombre de placements valides qui la couvrent.
+        bonus (list of int): Bonus de +2 par hit adjacent, pour les cases non tirées.
+        zobrist (int): Hachage de Zobrist de l'état (cases tirées et leur résultat, navires
+                       à flot), mis à jour à chaque tir : deux états de même hachage ont la
+                       même densité (voir transposition.py).
+    """
+    # Niveau d'une case tirée, qui ne figure plus dans aucun niveau
+    _SHOT_LEVEL = -1
+    # Nombre de cases ex aequo à partir duquel la chasse peut s'arrêter (None : toutes)
+    tie_limit: Optional[int] = None
+
+    def __init__(self, size: int, ship_lengths: Iterable[int]):
+        self.size = size
+        self.multiplicity: Counter = Counter(ship_lengths)
+        n_cells = size * size
+        self.counts: List[int] = [0] * n_cells
+        self.bonus: List[int] = [0] * n_cells
+        self._shot = bytearray(n_cells)
+        # Tables de placements partagées (en lecture seule) ; seul l'état de validité est propre à l'instance
+        self._tables: Dict[int, PlacementTable] = {}
+        self._valid: Dict[int, bytearray] = {}
+        self._coverage: Dict[int, List[int]] = {}
+        self.zobrist = 0
+
+        for length, multiplicity in self.multiplicity.items():
+            for rank in range(1, multiplicity + 1):
+                self.zobrist ^= zobrist_key("ship", length, rank)
+            table = get_placement_table(size, length)
+            self._tables[length] = table
+            self._valid[length] = bytearray(b"\x01") * len(table)
+            coverage = list(table.coverage)
+            self._coverage[length] = coverage
+            counts = self.counts
+            for index, n in enumerate(coverage):
+                counts[index] += multiplicity * n
+
+        # Densité brute -> cases non tirées de cette densité, et le niveau où chaque case est rangée
+        self._level: List[int] = list(self.counts)
+        self._buckets: Dict[int, Set[int]] = {}
+        for index, level in enumerate(self._level):
+            self._buckets.setdefault(level, set()).add(index)
+
+    @property
+    def remaining_lengths(self) -> List[int]:
+        """Les longueurs des navires encore à flot (avec répétitions)."""
+        return sorted(self.multiplicity.elements(), reverse=True)
+
+    def is_shot(self, index: int) -> bool:
+        """Indique si la case a déjà été retirée par un tir."""
+        return bool(self._shot[index])
+
+    def record_shot(self, index: int, hit: bool):
+        """
+        Enregistre un tir sur la case `index` : retire les placements qui la traversent et,
+        si c'est un hit, donne le bonus d'adjacence aux voisins non tirés.
+        Coût : O(navires x longueur²), indépendant de la taille du plateau.
+        """
+        if self._shot[index]:
+            return
+        self._shot[index] = 1
+        self.zobrist ^= zobrist_key("cell", index, hit)
+        counts = self.counts
+        touched = set()
+        for length, table in self._tables.items():
+            valid = self._valid[length]
+            coverage = self._coverage[length]
+            placements = table.cells
+            multiplicity = self.multiplicity[length]
+            for pid in table.covering[index]:
+                if valid[pid]:
+                    valid[pid] = 0
+                    touched.update(placements[pid])
+                    for cell in placements[pid]:
+                        coverage[cell] -= 1
+                        counts[cell] -= multiplicity
+        self.bonus[index] = 0
+        self._unfile(index)
+        self._level[index] = self._SHOT_LEVEL
+
+        if hit:
+            for neighbour in self.neighbours(index):
+                if not self._shot[neighbour]:
+                    self.bonus[neighbour] += 2
+                    touched.add(neighbour)
+        for cell in touched:
+            self._refile(cell)
+
+    def covering_count(self, index: int) -> int:
+        """Nombre de placements (de toutes les longueurs de la flotte, valides ou non) que record_shot examine pour la case."""
+        return sum(len(table.covering[index]) for table in self._tables.values())
+
+    def retire_length(self, length: int) -> bool:
+        """
+        Retire un navire coulé de longueur `length` du décompte.
+        Ne parcourt que les cases encore couvertes par un placement de cette longueur.
+
+        Returns:
+            bool: True si un navire de cette longueur était encore à flot.
+        """
+        if self.multiplicity[length] <= 0:
+            return False
+        self.zobrist ^= zobrist_key("ship", length, self.multiplicity[length])
+        self.multiplicity[length] -= 1
+        counts = self.counts
+        for index, n in enumerate(self._coverage[length]):
+            if n:
+                counts[index] -= n
+                self._refile(index)
+        if not self.multiplicity[length]:
+            del self.multiplicity[length]
+        return True
+
+    def _unfile(self, index: int):
+        level = self._level[index]
+        bucket = self._buckets[level]
+        bucket.discard(index)
+        if not bucket:
+            del self._buckets[level]
+
+    def _refile(self, index: int):
+        """Range à nouveau une case non tirée sous sa densité brute, si elle a changé."""
+        level = self.counts[index] + self.bonus[index]
+        if self._shot[index] or level == self._level[index]:
+            return
+        self._unfile(index)
+        self._level[index] = level
+        self._buckets.setdefault(level, set()).add(index)
+
+    def candidates(self) -> Iterator[Tuple[int, Iterable[int]]]:
+        """
+        Les cases non tirées de densité brute positive, par niveau de densité brute
+        décroissante : (densité brute, cases). La densité finale d'une case (value) vaut sa
+        densité brute ou un de moins : dès qu'un niveau est inférieur à la meilleure valeur
+        trouvée, les suivants ne peuvent plus l'atteindre. Les ensembles ne doivent pas
+        être modifiés pendant le parcours.
+        """
+        if not self.multiplicity:
+            return
+        buckets = self._buckets
+        for level in sorted(buckets, reverse=True):
+            if level <= 0:
+                return
+            yield level, buckets[level]
+
+    def neighbours(self, index: int) -> List[int]:
+        """Index des cases adjacentes (haut, bas, gauche, droite)."""
+        size = self.size
+        r, c = divmod(index, size)
+        result = []
+        if r > 0:
+            result.append(index - size)
+        if r < size - 1:
+            result.append(index + size)
+        if c > 0:
+            result.append(index - 1)
+        if c < size - 1:
+            result.append(index + 1)
+        return result
+
+    def raw_value(self, index: int) -> int:
+        """Densité de la case avant la pénalité d'isolement."""
+        if not self.multiplicity:
+            return 0
+        return self.counts[index] + self.bonus[index]
+
+    def value(self, index: int) -> int:
+        """
+        Densité finale de la case : placements + bonus d'adjacence, moins 1 si aucune
+        case voisine n'a de densité positive (pénalité d'isolement).
+        """
+        value = self.raw_value(index)
+        if value > 0 and not any(self.raw_value(n) > 0 for n in self.neighbours(index)):
+            value -= 1
+        return value
+
+    def grid(self) -> List[List[int]]:
+        """Construit la grille de probabilités complète (liste de lignes de densités finales)."""
+        size = self.size
+        return [[self.value(r * size + c) for c in range(size)] for r in range(size)]
+
+
+class SparsePlacementCounts(PlacementCounts):
+    """
+    Densité de placements pour les très grands plateaux, en mémoire proportionnelle au
+    nombre de tirs et de navires plutôt qu'à la surface.
+
+    Sans tir, une case (r, c) est couverte par line_coverage(c) placements horizontaux et
+    line_coverage(r) verticaux de chaque longueur : sa densité est la somme d'un poids de
+    ligne et d'un poids de colonne. Un tir invalide les placements qui le traversent ; on
+    ne note que ces placements et, pour chaque case qu'ils couvrent, combien en sont perdus.
+    Seules ces cases « touchées » sont rangées par densité brute ; les autres forment des
+    blocs (lignes de même poids x colonnes de même poids) parcourus à la demande.
+
+    Attributes:
+        size (int): La taille du plateau de cible.
+        multiplicity (Counter): Nombre de navires encore à flot pour chaque longueur.
+        bonus (dict): Bonus de +2 par hit adjacent, pour les cases non tirées qui en ont un.
+        zobrist (int): Hachage de Zobrist de l'état (comme PlacementCounts).
+    """
+    tie_limit = SPARSE_TIE_LIMIT
+
+    def __init__(self, size: int, ship_lengths: Iterable[int]):
+        # Pas d'appel à PlacementCounts.__init__ : ses listes ont la taille de la surface
+        self.size = size
+        self.multiplicity: Counter = Counter(ship_lengths)
+        self.bonus: Dict[int, int] = {}
+        self._shot: Set[int] = set()
+        self._ranges = {length: placements_for(size, length) for length in self.multiplicity}
+        # Placements invalidés, et nombre de placements perdus par case, pour chaque longueur
+        self._invalid: Dict[int, Set[int]] = {length: set() for length in self.multiplicity}
+        self._lost: Dict[int, Dict[int, int]] = {length: {} for length in self.multiplicity}
+        # Cases touchées non tirées -> densité brute, et densité brute -> cases touchées
+        self._level: Dict[int, int] = {}
+        self._buckets: Dict[int, Set[int]] = {}
+        self.zobrist = 0
+        for length, multiplicity in self.multiplicity.items():
+            for rank in range(1, multiplicity + 1):
+                self.zobrist ^= zobrist_key("ship", length, rank)
+        self._update_line_weights()
+
+    def _update_line_weights(self):
+        """Recalcule le poids de chaque ligne (et colonne) pour les navires à flot, et les regroupe par poids."""
+        size = self.size
+        weights = [0] * size
+        for length, multiplicity in self.multiplicity.items():
+            for x in range(size):
+                weights[x] += multiplicity * line_coverage(size, length, x)
+        groups: Dict[int, List[int]] = {}
+        for x, weight in enumerate(weights):
+            groups.setdefault(weight, []).append(x)
+        self._line_weights = weights
+        self._line_groups = sorted(groups.items(), reverse=True)
+
+    def is_shot(self, index: int) -> bool:
+        return index in self._shot
+
+    def count(self, index: int) -> int:
+        """Nombre pondéré de placements valides des navires à flot qui couvrent la case."""
+        r, c = divmod(index, self.size)
+        total = self._line_weights[r] + self._line_weights[c]
+        for length, multiplicity in self.multiplicity.items():
+            total -= multiplicity * self._lost[length].get(index, 0)
+        return total
+
+    def record_shot(self, index: int, hit: bool):
+        """Voir PlacementCounts.record_shot ; seules les cases des placements retirés sont notées."""
+        if index in self._shot:
+            return
+        self._shot.add(index)
+        self.zobrist ^= zobrist_key("cell", index, hit)
+        touched = set()
+        for length in self.multiplicity:
+            placements = self._ranges[length]
+            invalid = self._invalid[length]
+            lost = self._lost[length]
+            for pid in placements.placements_covering(index):
+                if pid not in invalid:
+                    invalid.add(pid)
+                    cells = placements.cells[pid]
+                    touched.update(cells)
+                    for cell in cells:
+                        lost[cell] = lost.get(cell, 0) + 1
+        self.bonus.pop(index, None)
+        if index in self._level:
+            self._unfile(index)
+            del self._level[index]
+
+        if hit:
+            for neighbour in self.neighbours(index):
+                if neighbour not in self._shot:
+                    self.bonus[neighbour] = self.bonus.get(neighbour, 0) + 2
+                    touched.add(neighbour)
+        for cell in touched:
+            self._refile(cell)
+
+    def covering_count(self, index: int) -> int:
+        size = self.size
+        r, c = divmod(index, size)
+        return sum(line_coverage(size, length, r) + line_coverage(size, length, c) for length in self._ranges)
+
+    def retire_length(self, length: int) -> bool:
+        """Voir PlacementCounts.retire_length ; ne reclasse que les cases touchées."""
+        if self.multiplicity[length] <= 0:
+            return False
+        self.zobrist ^= zobrist_key("ship", length, self.multiplicity[length])
+        self.multiplicity[length] -= 1
+        if not self.multiplicity[length]:
+            del self.multiplicity[length]
+        self._update_line_weights()
+        for index in list(self._level):
+            self._refile(index)
+        return True
+
+    def _refile(self, index: int):
+        if index in self._shot:
+            return
+        level = self.count(index) + self.bonus.get(index, 0)
+        previous = self._level.get(index)
+        if level == previous:
+            return
+        if previous is not None:
+            self._unfile(index)
+        self._level[index] = level
+        self._buckets.setdefault(level, set()).add(index)
+
+    def raw_value(self, index: int) -> int:
+        if not self.multiplicity:
+            return 0
+        return self.count(index) + self.bonus.get(index, 0)
+
+    def candidates(self) -> Iterator[Tuple[int, Iterable[int]]]:
+        """
+        Voir PlacementCounts.candidates. Un niveau peut être rendu en plusieurs morceaux :
+        les cases touchées, puis chaque bloc de cases jamais approchées de cette densité,
+        lignes et colonnes mélangées pour que les premières cases ex aequo ne soient pas
+        toujours dans le même coin. Le mélange est tiré du hachage de la position : le même
+        état donne le même ordre, sans consommer le générateur de l'IA.
+        """
+        if not self.multiplicity:
+            return
+        rng = random.Random(self.zobrist)
+        blocks: Dict[int, List[Tuple[List[int], List[int]]]] = {}
+        for row_weight, rows in self._line_groups:
+            for col_weight, cols in self._line_groups:
+                blocks.setdefault(row_weight + col_weight, []).append((rows, cols))
+        for level in sorted(set(self._buckets) | set(blocks), reverse=True):
+            if level <= 0:
+                return
+            if level in self._buckets:
+                yield level, self._buckets[level]
+            for rows, cols in blocks.get(level, ()):
+                yield level, self._block_cells(rows, cols, rng)
+
+    def _block_cells(self, rows: List[int], cols: List[int], rng: random.Random) -> Iterator[int]:
+        """Les cases jamais approchées d'un bloc lignes x colonnes, dans un ordre mélangé."""
+        rows = rng.sample(rows, len(rows))
+        cols = rng.sample(cols, len(cols))
+        size, level, shot = self.size, self._level, self._shot
+        for r in rows:
+            for c in cols:
+                index = r * size + c
+                if index not in level and index not in shot:
+                    yield index
+
+
+def make_placement_counts(size: int, ship_lengths: Iterable[int]) -> PlacementCounts:
+    """
+    Crée les compteurs de placements adaptés à la taille du plateau : listes par case
+    jusqu'à LARGE_BOARD_SIZE exclu, SparsePlacementCounts au-delà.
+    """
+    counts_cls = SparsePlacementCounts if size >= LARGE_BOARD_SIZE else PlacementCounts
+    return counts_cls(size, ship_lengths)
@@ -0,0 +1,234 @@
+"""
+Tables de placements précalculées, partagées par tous les plateaux et toutes les IA.
+
+Pour un couple (taille du plateau, longueur du navire), tous les placements possibles sont
+énumérés une seule fois, sous forme de masques de bits et de tuples d'index de cases, puis
+gardés dans un cache borné commun au processus. Créer des milliers d'AIPlayer dans une
+simulation ne refait donc pas cette énumération.
+"""
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+Coord = Tuple[int, int]
+
+
+class PlacementTable:
+    """
+    Tous les placements d'un navire de longueur `length` sur un plateau size x size.
+    Les placements horizontaux viennent d'abord (ligne par ligne), puis les verticaux
+    (colonne par colonne). Une table est immuable : elle est partagée via le cache.
+
+    Attributes:
+        size (int): La taille du plateau.
+        length (int): La longueur du navire.
+        starts (tuple): Pour chaque placement, (row, col, orientation) de sa première case.
+        cells (tuple): Pour chaque placement, le tuple des index de cases (r * size + c).
+        coords (tuple): Pour chaque placement, le tuple des coordonnées (row, col).
+        masks (tuple): Pour chaque placement, son masque de bits.
+        covering (tuple): Pour chaque case, le tuple des placements qui la couvrent.
+        covering_masks (tuple): Pour chaque case, les masques des placements qui la couvrent.
+        coverage (tuple): Pour chaque case, le nombre de placements qui la couvrent.
+    """
+    __slots__ = ("size", "length", "starts", "cells", "covering", "coverage", "_by_start",
+                 "_coords", "_masks", "_covering_masks")
+
+    def __init__(self, size: int, length: int):
+        self.size = size
+        self.length = length
+        starts = []
+        if 0 < length <= size:
+            starts.extend((r, c, 'H') for r in range(size) for c in range(size - length + 1))
+            starts.extend((r, c, 'V') for c in range(size) for r in range(size - length + 1))
+
+        cells = []
+        for r, c, orientation in starts:
+            step = 1 if orientation == 'H' else size
+            first = r * size + c
+            cells.append(tuple(range(first, first + step * length, step)))
+
+        covering = [[] for _ in range(size * size)]
+        for pid, placement_cells in enumerate(cells):
+            for index in placement_cells:
+                covering[index].append(pid)
+
+        self.starts: Tuple[Tuple[int, int, str], ...] = tuple(starts)
+        self.cells: Tuple[Tuple[int, ...], ...] = tuple(cells)
+        self.covering: Tuple[Tuple[int, ...], ...] = tuple(tuple(pids) for pids in covering)
+        self.coverage: Tuple[int, ...] = tuple(len(pids) for pids in covering)
+        self._by_start: Dict[Tuple[int, int, str], int] = {start: pid for pid, start in enumerate(starts)}
+        # Construits au premier accès : inutiles à certains utilisateurs, et coûteux sur les grands plateaux
+        self._coords = None
+        self._masks = None
+        self._covering_masks = None
+
+    @property
+    def coords(self) -> Tuple[Tuple[Coord, ...], ...]:
+        if self._coords is None:
+            size = self.size
+            self._coords = tuple(
+                tuple(divmod(index, size) for index in placement_cells) for placement_cells in self.cells
+            )
+        return self._coords
+
+    @property
+    def masks(self) -> Tuple[int, ...]:
+        if self._masks is None:
+            masks = []
+            for placement_cells in self.cells:
+                mask = 0
+                for index in placement_cells:
+                    mask |= 1 << index
+                masks.append(mask)
+            self._masks = tuple(masks)
+        return self._masks
+
+    @property
+    def covering_masks(self) -> Tuple[Tuple[int, ...], ...]:
+        if self._covering_masks is None:
+            masks = self.masks
+            self._covering_masks = tuple(tuple(masks[pid] for pid in pids) for pids in self.covering)
+        return self._covering_masks
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def mask(self, pid: int) -> int:
+        """Masque de bits d'un seul placement (sans construire ceux de toute la table)."""
+        if self._masks is not None:
+            return self._masks[pid]
+        r, c, orientation = self.starts[pid]
+        first = r * self.size + c
+        if orientation == 'H':
+            return ((1 << self.length) - 1) << first
+        mask = 0
+        for index in self.cells[pid]:
+            mask |= 1 << index
+        return mask
+
+    def find(self, start_coord: Coord, orientation: str) -> Optional[int]:
+        """Retourne l'identifiant du placement qui commence en start_coord, ou None s'il sort du plateau."""
+        return self._by_start.get((start_coord[0], start_coord[1], orientation))
+
+    def placements_covering(self, index: int) -> Tuple[int, ...]:
+        """Les identifiants des placements qui couvrent la case, par ordre croissant."""
+        return self.covering[index]
+
+
+@lru_cache(maxsize=256)
+def get_placement_table(size: int, length: int) -> PlacementTable:
+    """
+    Retourne la table de placements (partagée) pour une taille de plateau et une longueur de navire.
+    Le cache est borné : les tables les moins récemment utilisées sont libérées.
+    """
+    return PlacementTable(size, length)
+
+
+# Au-delà de cette taille, les placements sont calculés à la demande au lieu d'être tabulés
+LARGE_BOARD_SIZE = 200
+
+
+class _ComputedSequence:
+    """Séquence en lecture seule dont l'élément i est calculé par item(i) à chaque accès."""
+    __slots__ = ("_length", "_item")
+
+    def __init__(self, length: int, item):
+        self._length = length
+        self._item = item
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, pid: int):
+        if not 0 <= pid < self._length:
+            raise IndexError("placement index out of range")
+        return self._item(pid)
+
+
+class PlacementRange:
+    """
+    Même interface que PlacementTable (starts, cells, coords, mask, find,
+    placements_covering), mais chaque placement est calculé à partir de son identifiant :
+    la mémoire ne dépend pas de la surface du plateau. Les listes par case (covering, coverage, masks) ne sont pas
+    disponibles : elles ont intrinsèquement la taille de la surface.
+    """
+    __slots__ = ("size", "length", "_per_orientation", "starts", "cells", "coords")
+
+    def __init__(self, size: int, length: int):
+        self.size = size
+        self.length = length
+        # Nombre de placements horizontaux (identique au nombre de verticaux)
+        self._per_orientation = size * (size - length + 1) if 0 < length <= size else 0
+        count = 2 * self._per_orientation
+        self.starts = _ComputedSequence(count, self._start)
+        self.cells = _ComputedSequence(count, self._cells)
+        self.coords = _ComputedSequence(count, lambda pid: tuple(divmod(index, size) for index in self._cells(pid)))
+
+    def __len__(self) -> int:
+        return 2 * self._per_orientation
+
+    def _start(self, pid: int) -> Tuple[int, int, str]:
+        span = self.size - self.length + 1
+        if pid < self._per_orientation:
+            r, c = divmod(pid, span)
+            return r, c, 'H'
+        c, r = divmod(pid - self._per_orientation, span)
+        return r, c, 'V'
+
+    def _cells(self, pid: int) -> range:
+        r, c, orientation = self._start(pid)
+        first = r * self.size + c
+        step = 1 if orientation == 'H' else self.size
+        return range(first, first + step * self.length, step)
+
+    def mask(self, pid: int) -> int:
+        r, c, orientation = self._start(pid)
+        first = r * self.size + c
+        if orientation == 'H':
+            return ((1 << self.length) - 1) << first
+        mask = 0
+        for index in self._cells(pid):
+            mask |= 1 << index
+        return mask
+
+    def find(self, start_coord: Coord, orientation: str) -> Optional[int]:
+        r, c = start_coord
+        size, span = self.size, self.size - self.length + 1
+        if not self._per_orientation:
+            return None
+        if orientation == 'H' and 0 <= r < size and 0 <= c < span:
+            return r * span + c
+        if orientation == 'V' and 0 <= c < size and 0 <= r < span:
+            return self._per_orientation + c * span + r
+        return None
+
+    def placements_covering(self, index: int) -> Tuple[int, ...]:
+        """Les identifiants des placements qui couvrent la case, par ordre croissant (comme PlacementTable)."""
+        if not self._per_orientation:
+            return ()
+        r, c = divmod(index, self.size)
+        span = self.size - self.length + 1
+        horizontal = range(r * span + max(0, c - self.length + 1), r * span + min(c, span - 1) + 1)
+        first_vertical = self._per_orientation + c * span
+        vertical = range(first_vertical + max(0, r - self.length + 1), first_vertical + min(r, span - 1) + 1)
+        return tuple(horizontal) + tuple(vertical)
+
+
+def line_coverage(size: int, length: int, x: int) -> int:
+    """
+    Nombre de placements d'un navire de longueur `length`, dans une ligne (ou une colonne)
+    de `size` cases, qui couvrent la position x : une case (r, c) est couverte par
+    line_coverage(c) placements horizontaux et line_coverage(r) verticaux.
+    """
+    if not 0 < length <= size:
+        return 0
+    return min(x, size - length) - max(0, x - length + 1) + 1
+
+
+def placements_for(size: int, length: int):
+    """
+    Les placements d'un navire sur un plateau size x size : la table partagée sur les
+    plateaux usuels, une PlacementRange calculée à la demande sur les très grands.
+    """
+    if size >= LARGE_BOARD_SIZE:
+        return PlacementRange(size, length)
+    return get_placement_table(size, length)
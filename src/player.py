@@ -1,16 +1,29 @@
+import random
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from .board import Board
+from .events import EventBus
 from .ship import Ship
+from .sparse_board import make_board
+
+class NoMovesLeft(Exception):
+    """Le joueur n'a plus aucune case où tirer : l'adversaire l'emporte par forfait."""
+
 
 class Player(ABC):
     """
     Classe abstraite pour les joueurs (humain ou IA) dans le jeu de Bataille Navale.
     """
-    def __init__(self, name: str, board_size: int = 10):
+    def __init__(self, name: str, board_size: int = 10, events: Optional[EventBus] = None, rng=None):
         self.name = name
-        self.own_board = Board(board_size)
-        self.target_board = Board(board_size) # Pour suivre les tirs sur l'adversaire
+        # Générateur aléatoire du joueur (le module random par défaut) ; les simulations lui
+        # donnent un flux propre à la partie pour qu'elle soit rejouable seule (voir rng.py)
+        self.rng = rng if rng is not None else random
+        # Bus d'événements partagé avec les plateaux ; sans abonné, rien n'est émis
+        self.events = events if events is not None else EventBus()
+        # Bitboards sur les plateaux usuels, stockage creux sur les très grands (voir sparse_board)
+        self.own_board: Board = make_board(board_size, name=name, events=self.events)
+        self.target_board: Board = make_board(board_size, events=self.events) # Pour suivre les tirs sur l'adversaire
         
         # Définition des navires par défaut
         self.ships_to_place: List[Ship] = [
@@ -33,9 +46,11 @@ class Player(ABC):
 
     def has_lost(self) -> bool:
         """
-        Vérifie si le joueur a perdu tous ses navires.
+        Vérifie si le joueur a perdu tous ses navires (en O(1), grâce aux compteurs du plateau).
+        Un navire resté hors du plateau ne peut pas être coulé : le joueur n'a alors pas perdu.
         """
-        return all(ship.is_sunk() for ship in self.ships_to_place)
+        board = self.own_board
+        return board.remaining_ship_cells == 0 and len(board.ships) == len(self.ships_to_place)
 
     def display_boards(self):
         """
@@ -49,9 +64,6 @@ class Player(ABC):
 
     def get_remaining_ship_hp(self) -> int:
         """
-        Calcule le nombre total de parties de navires restantes pour le joueur.
+        Retourne le nombre total de parties de navires encore intactes pour le joueur (en O(1)).
         """
-        total_hp = 0
-        for ship in self.ships_to_place:
-            total_hp += ship.length - len(ship.hits) # length - nombre de hits sur ce navire
-        return total_hp
\ No newline at end of file
+        return self.own_board.remaining_ship_cells
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+Compteurs et chronomètres par phase de décision de l'IA.
+
+Sans profileur externe, on ne sait pas où AIPlayer passe son temps. Un AIProfile attaché
+à une IA (AIPlayer(profile=AIProfile()) ou ai.profile = ...) note, pour chaque phase
+(ciblage actif, fin de jeu, grille de probabilités, parité, aléatoire,
+process_shot_result...) : le nombre d'appels, le temps cumulé, un histogramme des
+latences, et le nombre de cases et de placements évalués.
+
+Sans profil (profile = None, le cas par défaut), l'IA ne fait qu'un test `is not None`
+par phase : rien n'est chronométré ni compté. Un profil se sérialise (pickle ou as_dict)
+et se fusionne avec merge(), par exemple pour réunir ceux des processus d'une simulation.
+"""
+import json
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+class PhaseStats:
+    """
+    Mesures d'une phase.
+
+    Attributes:
+        calls (int): Nombre de passages dans la phase.
+        total_time (float): Temps cumulé, en secondes.
+        max_time (float): Latence maximale, en secondes.
+        cells (int): Nombre de cases évaluées.
+        placements (int): Nombre de placements de navires évalués.
+        histogram (Counter): Bucket k -> nombre d'appels de latence inférieure à 2**k µs
+                             (et d'au moins 2**(k-1) µs).
+    """
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.cells = 0
+        self.placements = 0
+        self.histogram: Counter = Counter()
+
+    def record(self, elapsed: float, cells: int = 0, placements: int = 0):
+        self.calls += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+        self.cells += cells
+        self.placements += placements
+        self.histogram[int(elapsed * 1e6).bit_length()] += 1
+
+    def merge(self, other: "PhaseStats") -> "PhaseStats":
+        self.calls += other.calls
+        self.total_time += other.total_time
+        self.max_time = max(self.max_time, other.max_time)
+        self.cells += other.cells
+        self.placements += other.placements
+        self.histogram.update(other.histogram)
+        return self
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Borne supérieure (en secondes) de la latence sous laquelle tombe `fraction` des appels."""
+        if not self.calls:
+            return 0.0
+        threshold = fraction * self.calls
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= threshold:
+                return (1 << bucket) / 1e6
+        return self.max_time
+
+    def as_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_time * 1e3,
+            "mean_us": self.mean_time * 1e6,
+            "p50_us": self.percentile(0.5) * 1e6,
+            "p99_us": self.percentile(0.99) * 1e6,
+            "max_us": self.max_time * 1e6,
+            "cells": self.cells,
+            "placements": self.placements,
+            "histogram_us": {f"<{1 << bucket}": count for bucket, count in sorted(self.histogram.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PhaseStats":
+        stats = cls()
+        stats.calls = data["calls"]
+        stats.total_time = data["total_ms"] / 1e3
+        stats.max_time = data["max_us"] / 1e6
+        stats.cells = data["cells"]
+        stats.placements = data["placements"]
+        stats.histogram = Counter({int(label[1:]).bit_length() - 1: count
+                                   for label, count in data["histogram_us"].items()})
+        return stats
+
+
+class AIProfile:
+    """
+    Les mesures de toutes les phases d'une ou plusieurs IA.
+
+    Attributes:
+        phases (dict): Nom de phase -> PhaseStats.
+    """
+    def __init__(self):
+        self.phases: Dict[str, PhaseStats] = {}
+
+    def record(self, phase: str, elapsed: float, cells: int = 0, placements: int = 0):
+        """Note un passage de `elapsed` secondes dans la phase."""
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = PhaseStats()
+        stats.record(elapsed, cells, placements)
+
+    def merge(self, other: Optional["AIProfile"]) -> "AIProfile":
+        """Ajoute les mesures d'un autre profil (par exemple celui d'un autre processus)."""
+        if other is not None:
+            for phase, stats in other.phases.items():
+                self.phases.setdefault(phase, PhaseStats()).merge(stats)
+        return self
+
+    def as_dict(self) -> Dict:
+        """Résumé sérialisable en JSON."""
+        return {phase: stats.as_dict() for phase, stats in self.phases.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "AIProfile":
+        profile = cls()
+        profile.phases = {phase: PhaseStats.from_dict(stats) for phase, stats in data.items()}
+        return profile
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.as_dict(), ensure_ascii=False, indent=indent)
+
+    def format_table(self) -> str:
+        """Tableau lisible des phases, de la plus coûteuse à la moins coûteuse."""
+        header = f"{'Phase':<24} {'Appels':>8} {'Total ms':>10} {'Moy. µs':>9} {'p50 µs':>8} {'p99 µs':>8} {'Max µs':>9} {'Cases':>10} {'Placements':>11}"
+        lines: List[str] = [header, "-" * len(header)]
+        for phase, stats in sorted(self.phases.items(), key=lambda item: -item[1].total_time):
+            lines.append(
+                f"{phase:<24} {stats.calls:>8} {stats.total_time * 1e3:>10.1f} {stats.mean_time * 1e6:>9.1f} "
+                f"{stats.percentile(0.5) * 1e6:>8.0f} {stats.percentile(0.99) * 1e6:>8.0f} "
+                f"{stats.max_time * 1e6:>9.0f} {stats.cells:>10} {stats.placements:>11}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,571 @@
+"""
+Interface graphique Pygame : placement des navires à la souris, puis partie contre l'IA.
+
+L'import ne fait qu'importer pygame et définir l'interface : la fenêtre, la police et
+l'IA ne sont créées que par main() (python -m src pygame, ou python main_pygame.py).
+"""
+import os
+import queue
+import threading
+import traceback
+
+import pygame
+
+from .ai_player import AIPlayer
+from .events import AIModeChanged, EventBus
+from .player import NoMovesLeft
+from .resources import asset_path
+from .ship import Ship
+from .sparse_board import make_board
+
+# Constantes
+GRID_SIZE = 10
+CELL_SIZE = 40
+MARGIN = 30
+GRID_GAP = 80
+WINDOW_WIDTH = 2 * (GRID_SIZE * CELL_SIZE) + GRID_GAP + 2 * MARGIN
+WINDOW_HEIGHT = GRID_SIZE * CELL_SIZE + 2 * MARGIN + 60
+
+# Cadence d'affichage maximale (images par seconde) quand des événements arrivent en continu
+# (déplacements de la souris) ; au repos, la boucle dort jusqu'au prochain événement.
+MAX_FPS = int(os.environ.get("BATAILLE_NAVALE_FPS", "30"))
+SHOT_MESSAGE_DURATION = 1500 # Durée d'affichage des messages de tir (ms)
+
+# Couleurs
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+BLUE = (100, 149, 237)
+GRAY = (200, 200, 200)
+GREEN = (50, 205, 50)
+RED = (220, 20, 60)
+NAVY = (0, 70, 140)
+YELLOW = (255, 215, 0)
+
+# Navires à placer (nom, taille, couleur)
+SHIPS = [
+    ("Porte-avions", 5, NAVY),
+    ("Cuirassé", 4, BLUE),
+    ("Destroyer", 3, GREEN),
+    ("Sous-marin", 3, YELLOW),
+    ("Patrouilleur", 2, RED),
+]
+
+# Police personnalisée (chemin résolu par rapport au projet, pas au répertoire courant)
+FONT_PATH = asset_path("fonts", "Police.ttf")
+FONT_SIZE = 28
+
+# Polices, fenêtre et moteur de rendu : créés par init_display()
+font = None
+font_small = None
+screen = None
+renderer = None
+
+def init_display():
+    """Initialise Pygame, charge les polices et ouvre la fenêtre."""
+    global font, font_small, screen, renderer
+    pygame.init()
+    font = pygame.font.Font(FONT_PATH, FONT_SIZE)
+    font_small = pygame.font.Font(FONT_PATH, 18)
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Bataille Navale - Pygame")
+    renderer = Renderer(screen)
+
+# Cache des textes rendus : font.render est coûteux, et les mêmes textes reviennent à chaque image
+class TextCache:
+    """Garde les surfaces des textes déjà rendus, par (police, texte, couleur)."""
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._surfaces = {}
+
+    def render(self, text_font, text, color):
+        key = (id(text_font), text, color)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            if len(self._surfaces) >= self.max_entries:
+                self._surfaces.clear() # Les textes dynamiques (messages de tir) ne s'accumulent pas
+            surface = text_font.render(text, True, color)
+            self._surfaces[key] = surface
+        return surface
+
+text_cache = TextCache()
+
+# Fonctions d'affichage
+def draw_gradient_background(surface, color_top, color_bottom):
+    """Dessine un dégradé vertical du haut vers le bas."""
+    for y in range(WINDOW_HEIGHT):
+        ratio = y / WINDOW_HEIGHT
+        r = int(color_top[0] * (1 - ratio) + color_bottom[0] * ratio)
+        g = int(color_top[1] * (1 - ratio) + color_bottom[1] * ratio)
+        b = int(color_top[2] * (1 - ratio) + color_bottom[2] * ratio)
+        pygame.draw.line(surface, (r, g, b), (0, y), (WINDOW_WIDTH, y))
+
+def draw_grid(surface, top_left, label):
+    x0, y0 = top_left
+    # Grille
+    for i in range(GRID_SIZE + 1):
+        # Lignes horizontales
+        pygame.draw.line(surface, BLACK, (x0, y0 + i * CELL_SIZE), (x0 + GRID_SIZE * CELL_SIZE, y0 + i * CELL_SIZE), 2)
+        # Lignes verticales
+        pygame.draw.line(surface, BLACK, (x0 + i * CELL_SIZE, y0), (x0 + i * CELL_SIZE, y0 + GRID_SIZE * CELL_SIZE), 2)
+    # Labels
+    for i in range(GRID_SIZE):
+        # Lettres colonnes
+        letter = chr(65 + i)
+        text = text_cache.render(font_small, letter, BLACK)
+        surface.blit(text, (x0 + i * CELL_SIZE + CELL_SIZE // 2 - text.get_width() // 2, y0 - 22))
+        # Chiffres lignes
+        num = str(i + 1)
+        text = text_cache.render(font_small, num, BLACK)
+        surface.blit(text, (x0 - 22, y0 + i * CELL_SIZE + CELL_SIZE // 2 - text.get_height() // 2))
+    # Titre grille
+    label_text = text_cache.render(font, label, BLUE)
+    surface.blit(label_text, (x0 + GRID_SIZE * CELL_SIZE // 2 - label_text.get_width() // 2, y0 - 50))
+
+def draw_ships(surface, ships, top_left):
+    for ship in ships:
+        r, c, length, orientation, color = ship
+        for i in range(length):
+            rr = r + i if orientation == 'V' else r
+            cc = c + i if orientation == 'H' else c
+            rect = pygame.Rect(
+                top_left[0] + cc * CELL_SIZE + 2,
+                top_left[1] + rr * CELL_SIZE + 2,
+                CELL_SIZE - 4, CELL_SIZE - 4)
+            pygame.draw.rect(surface, color, rect)
+            pygame.draw.rect(surface, BLACK, rect, 2)
+
+def is_valid_placement(ships, r, c, length, orientation):
+    # Vérifie si le navire ne sort pas de la grille et ne chevauche pas un autre navire
+    if orientation == 'H':
+        if c + length > GRID_SIZE:
+            return False
+        coords = [(r, c + i) for i in range(length)]
+    else:
+        if r + length > GRID_SIZE:
+            return False
+        coords = [(r + i, c) for i in range(length)]
+    for ship in ships:
+        sr, sc, slen, sorient, _ = ship
+        for i in range(slen):
+            sr2 = sr + i if sorient == 'V' else sr
+            sc2 = sc + i if sorient == 'H' else sc
+            if (sr2, sc2) in coords:
+                return False
+    return True
+
+def draw_shots(surface, shots, top_left):
+    for (r, c, result) in shots:
+        cx = top_left[0] + c * CELL_SIZE + CELL_SIZE // 2
+        cy = top_left[1] + r * CELL_SIZE + CELL_SIZE // 2
+        if result == 'miss':
+            pygame.draw.circle(surface, BLUE, (cx, cy), CELL_SIZE // 4, 3)
+        elif result == 'hit':
+            pygame.draw.line(surface, RED, (cx - 10, cy - 10), (cx + 10, cy + 10), 3)
+            pygame.draw.line(surface, RED, (cx + 10, cy - 10), (cx - 10, cy + 10), 3)
+
+# Coordonnées des deux grilles
+player_grid_pos = (MARGIN, MARGIN + 60)
+ai_grid_pos = (MARGIN + GRID_SIZE * CELL_SIZE + GRID_GAP, MARGIN + 60)
+
+def cell_rect(top_left, r, c):
+    """Rectangle écran de la case (r, c) d'une grille."""
+    return pygame.Rect(top_left[0] + c * CELL_SIZE, top_left[1] + r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+def ship_rect(top_left, r, c, length, orientation):
+    """Rectangle écran couvert par un navire."""
+    rect = cell_rect(top_left, r, c)
+    if orientation == 'H':
+        rect.width = length * CELL_SIZE
+    else:
+        rect.height = length * CELL_SIZE
+    return rect
+
+class Renderer:
+    """
+    Compose l'écran à partir de couches mises en cache, et ne rafraîchit que ce qui change.
+
+    - la couche statique (fond, grilles, étiquettes, titres) est dessinée une seule fois ;
+    - la couche plateau part de la couche statique et reçoit les navires et les tirs au fur
+      et à mesure : seule la case modifiée est redessinée ;
+    - les éléments superposés (aperçu du placement, messages) sont redessinés à chaque
+      changement, et seuls leurs rectangles (anciens et nouveaux) sont envoyés à l'écran.
+    Quand rien n'a changé depuis l'image précédente, present() ne dessine rien.
+    """
+    def __init__(self, surface):
+        self.screen = surface
+        self.static_layer = self._build_static_layer()
+        self.board_layer = self.static_layer.copy()
+        self.dirty = [self.screen.get_rect()] # Première image : tout l'écran
+        self._last_overlays = None
+        self._last_rects = []
+        self._preview_cache = {}
+
+    def invalidate(self):
+        """Force le rafraîchissement de tout l'écran (fenêtre réexposée, par exemple)."""
+        self.dirty = [self.screen.get_rect()]
+
+    def _build_static_layer(self):
+        layer = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+        # Le fond visible est blanc (l'ancien dégradé était effacé aussitôt par un fill blanc)
+        layer.fill(WHITE)
+        draw_grid(layer, player_grid_pos, "Votre flotte")
+        draw_grid(layer, ai_grid_pos, "Grille de l'IA")
+        title = text_cache.render(font, "Bataille Navale", BLACK)
+        layer.blit(title, (WINDOW_WIDTH // 2 - title.get_width() // 2, 10))
+        return layer
+
+    def add_ship(self, ship, top_left):
+        """Dessine un navire (r, c, longueur, orientation, couleur) sur la couche plateau."""
+        r, c, length, orientation, _ = ship
+        draw_ships(self.board_layer, [ship], top_left)
+        self.dirty.append(ship_rect(top_left, r, c, length, orientation))
+
+    def add_shot(self, shot, top_left):
+        """Dessine un tir (r, c, résultat) sur la couche plateau."""
+        draw_shots(self.board_layer, [shot], top_left)
+        self.dirty.append(cell_rect(top_left, shot[0], shot[1]))
+
+    def preview_surface(self, length, orientation, color):
+        """Surface (mise en cache) de l'aperçu d'un navire en cours de placement."""
+        key = (length, orientation, color)
+        surface = self._preview_cache.get(key)
+        if surface is None:
+            horizontal = orientation == 'H'
+            size = (length * CELL_SIZE, CELL_SIZE) if horizontal else (CELL_SIZE, length * CELL_SIZE)
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            for i in range(length):
+                x, y = (i * CELL_SIZE, 0) if horizontal else (0, i * CELL_SIZE)
+                rect = pygame.Rect(x + 2, y + 2, CELL_SIZE - 4, CELL_SIZE - 4)
+                pygame.draw.rect(surface, color, rect)
+                pygame.draw.rect(surface, BLACK, rect, 2)
+            self._preview_cache[key] = surface
+        return surface
+
+    def present(self, overlays):
+        """
+        Affiche la couche plateau et les éléments superposés, en ne rafraîchissant que les
+        zones modifiées.
+
+        Args:
+            overlays (list): Les éléments superposés (clé, surface, position) ; la clé décrit
+                             le contenu, pour savoir s'il a changé depuis l'image précédente.
+        """
+        signature = [(key, pos) for key, _, pos in overlays]
+        if not self.dirty and signature == self._last_overlays:
+            return False # Rien n'a changé : aucune image à produire
+
+        # Effacer les zones modifiées et les anciens éléments superposés
+        restore = self.dirty + self._last_rects
+        for rect in restore:
+            self.screen.blit(self.board_layer, rect, rect)
+        rects = [self.screen.blit(surface, pos) for _, surface, pos in overlays]
+
+        pygame.display.update(restore + rects)
+        self.dirty = []
+        self._last_rects = rects
+        self._last_overlays = signature
+        return True
+
+def collect_overlays():
+    """Les éléments à superposer au plateau dans l'état courant de la partie."""
+    overlays = []
+    if not placing_done and current_ship_idx < len(SHIPS):
+        ship_name, ship_len, ship_color = SHIPS[current_ship_idx]
+        # Position de la souris sur la grille du joueur
+        mx, my = pygame.mouse.get_pos()
+        grid_x, grid_y = player_grid_pos
+        r = (my - grid_y) // CELL_SIZE
+        c = (mx - grid_x) // CELL_SIZE
+        # Afficher le navire en surbrillance si la souris est sur la grille
+        if 0 <= r < GRID_SIZE and 0 <= c < GRID_SIZE:
+            valid = is_valid_placement(placed_ships, r, c, ship_len, current_orientation)
+            color = ship_color if valid else (180, 180, 180)
+            preview = renderer.preview_surface(ship_len, current_orientation, color)
+            overlays.append((("aperçu", ship_len, current_orientation, color), preview,
+                             (grid_x + c * CELL_SIZE, grid_y + r * CELL_SIZE)))
+        # Afficher le nom et l'orientation
+        info = f"Placer : {ship_name} (taille {ship_len}) - Orientation : {'Horizontale' if current_orientation == 'H' else 'Verticale'}"
+        overlays.append((("texte", info), text_cache.render(font_small, info, BLACK), (MARGIN, WINDOW_HEIGHT - 40)))
+
+    # Message de fin de placement
+    if placing_done:
+        done_text = text_cache.render(font, "Tous les navires sont placés !", GREEN)
+        overlays.append((("texte", "placés"), done_text,
+                         (WINDOW_WIDTH // 2 - done_text.get_width() // 2, WINDOW_HEIGHT - 50)))
+        # Afficher le message de tir si besoin
+        if shot_message:
+            msg = text_cache.render(font_small, shot_message, BLACK)
+            overlays.append((("texte", shot_message), msg, (ai_grid_pos[0], ai_grid_pos[1] + GRID_SIZE * CELL_SIZE + 10)))
+        if ai_turn_pending:
+            thinking = text_cache.render(font_small, "L'IA réfléchit...", BLACK)
+            overlays.append((("texte", "réflexion"), thinking, (player_grid_pos[0], player_grid_pos[1] + GRID_SIZE * CELL_SIZE + 10)))
+        if ai_error:
+            error_text = text_cache.render(font_small, ai_error, RED)
+            overlays.append((("texte", ai_error), error_text,
+                             (WINDOW_WIDTH // 2 - error_text.get_width() // 2, WINDOW_HEIGHT - 25)))
+        # Afficher le message de victoire
+        if game_over and winner is not None:
+            if winner == 'joueur':
+                end_text = text_cache.render(font, "Félicitations, vous avez gagné !", GREEN)
+            else:
+                end_text = text_cache.render(font, "L'IA a gagné...", RED)
+            overlays.append((("fin", winner), end_text,
+                             (WINDOW_WIDTH // 2 - end_text.get_width() // 2, WINDOW_HEIGHT // 2 - end_text.get_height() // 2)))
+    return overlays
+
+# Variables de placement
+placed_ships = []  # (row, col, length, orientation, color)
+player_ship_objects = []  # Liste des objets Ship du joueur
+current_ship_idx = 0
+current_orientation = 'H'  # 'H' ou 'V'
+placing_done = False
+
+# Variables de tir
+player_shots = []  # (row, col, 'hit' ou 'miss')
+ai_shots = []      # (row, col, 'hit' ou 'miss')
+shot_message = ""
+shot_message_timer = 0
+
+game_over = False
+winner = None  # 'joueur' ou 'ia'
+
+# Abonnement aux événements du moteur : on retient le mode de décision de l'IA pour l'afficher
+ai_mode = ""
+
+def on_game_event(event):
+    global ai_mode
+    if isinstance(event, AIModeChanged):
+        ai_mode = event.mode
+
+# IA, plateau de flotte du joueur et thread de l'IA : créés par new_game()
+game_events = None
+ai_player = None
+player_board = None
+ai_worker = None
+
+def new_game():
+    """Crée l'IA (avec sa flotte), le plateau du joueur et le thread de calcul de l'IA."""
+    global game_events, ai_player, player_board, ai_worker
+    game_events = EventBus()
+    game_events.subscribe(on_game_event)
+
+    # Initialisation de l'IA avancée
+    ai_player = AIPlayer(name="IA", board_size=GRID_SIZE, events=game_events)
+    ai_player.place_ships()  # Placement automatique des navires IA
+    # Plateau de flotte du joueur : ses compteurs de parties intactes décident de la victoire de l'IA
+    player_board = make_board(GRID_SIZE, name="Joueur", events=game_events)
+    ai_worker = AIWorker(ai_player)
+
+# Événement publié dans la file de pygame quand le coup de l'IA est prêt
+AI_MOVE_READY = pygame.event.custom_type()
+
+class AIWorker:
+    """
+    Calcule le prochain tir de l'IA sur un thread, pendant que le joueur réfléchit.
+
+    Le thread principal ne touche jamais à l'état de décision de l'IA pendant un calcul :
+    il demande un coup (request), puis le reçoit sous forme d'un événement AI_MOVE_READY
+    dans la boucle d'événements. Si le calcul échoue, l'événement arrive quand même, sans
+    coup (move vaut None) et avec l'exception dans son champ error. Le tir du joueur ne modifie que le plateau de flotte de
+    l'IA, que le calcul ne lit pas : un coup calculé avant ce tir reste valable, et il est
+    joué dès que le joueur a tiré.
+    """
+    def __init__(self, player):
+        self.player = player
+        self._requests = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="ia-bataille-navale", daemon=True)
+        self._thread.start()
+
+    def request(self, opponent_remaining_hp):
+        """
+        Lance le calcul du prochain coup sur l'état actuel de l'IA.
+
+        Args:
+            opponent_remaining_hp (int): Les parties de navires intactes du joueur, pour la
+                                         stratégie de fin de partie de l'IA.
+        """
+        self._requests.put(opponent_remaining_hp)
+
+    def stop(self):
+        self._requests.put(None)
+
+    def _run(self):
+        while True:
+            opponent_remaining_hp = self._requests.get()
+            if opponent_remaining_hp is None:
+                return
+            try:
+                move = self.player.get_shot_coordinates(opponent_remaining_hp=opponent_remaining_hp)
+            except Exception as error:
+                # Sans événement, l'interface attendrait ce coup indéfiniment
+                traceback.print_exc()
+                pygame.event.post(pygame.event.Event(AI_MOVE_READY, move=None, error=error))
+            else:
+                pygame.event.post(pygame.event.Event(AI_MOVE_READY, move=move, error=None))
+
+ai_ready_move = None   # Coup de l'IA déjà calculé, en attente du tir du joueur
+ai_turn_pending = False  # Le joueur a tiré, le coup de l'IA n'est pas encore arrivé
+ai_error = ""  # Message affiché quand le calcul d'un coup de l'IA a échoué
+
+def on_ai_error(error):
+    """
+    Arrête la partie après l'échec du calcul d'un coup de l'IA. Seul NoMovesLeft est un
+    forfait de l'IA ; toute autre erreur arrête la partie sans vainqueur.
+    """
+    global ai_error, ai_ready_move, ai_turn_pending, game_over, winner
+    ai_ready_move = None
+    ai_turn_pending = False
+    game_over = True
+    if isinstance(error, NoMovesLeft):
+        winner = 'joueur'
+        ai_error = "L'IA n'a plus de coups possibles : elle abandonne."
+    else:
+        ai_error = f"Erreur de l'IA, partie interrompue : {error}"
+
+def play_ai_move(ia_shot):
+    """Joue le tir de l'IA (calculé par le thread de l'IA) et lui en donne le résultat."""
+    global shot_message, shot_message_timer, game_over, winner
+    ia_r, ia_c = ia_shot
+    # Déterminer le résultat du tir de l'IA sur la flotte du joueur
+    result = player_board.receive_shot(ia_shot)
+    if result in ('hit', 'sunk'):
+        ai_shots.append((ia_r, ia_c, 'hit'))
+        renderer.add_shot(ai_shots[-1], player_grid_pos)
+        verb = "coulé" if result == 'sunk' else "touché"
+        shot_message = f"L'IA ({ai_mode}) a {verb} votre navire en {chr(65 + ia_c)}{ia_r + 1} !"
+    else:
+        ai_shots.append((ia_r, ia_c, 'miss'))
+        renderer.add_shot(ai_shots[-1], player_grid_pos)
+        shot_message = f"L'IA ({ai_mode}) a tiré en {chr(65 + ia_c)}{ia_r + 1} et a manqué."
+    shot_message_timer = pygame.time.get_ticks()
+    # L'IA apprend du résultat (comme dans le vrai jeu, le joueur annonce le navire coulé)
+    sunk_length = player_board.last_sunk_ship.length if result == 'sunk' else None
+    ai_player.process_shot_result(ia_shot, result, sunk_length=sunk_length)
+    # Vérifier si l'IA a gagné : plus aucune partie de navire intacte
+    if player_board.all_ships_sunk():
+        game_over = True
+        winner = 'ia'
+    else:
+        # Préparer le coup suivant pendant que le joueur réfléchit
+        ai_worker.request(player_board.remaining_ship_cells)
+
+def next_timer_delay():
+    """Millisecondes avant la prochaine échéance (effacement du message), ou None s'il n'y en a pas."""
+    if shot_message:
+        return max(1, shot_message_timer + SHOT_MESSAGE_DURATION - pygame.time.get_ticks())
+    return None
+
+def wait_for_events():
+    """
+    Bloque jusqu'au prochain événement ou à la prochaine échéance, sans consommer de CPU,
+    puis retourne tous les événements en attente.
+    """
+    delay = next_timer_delay()
+    event = pygame.event.wait() if delay is None else pygame.event.wait(delay)
+    events = [] if event.type == pygame.NOEVENT else [event]
+    events.extend(pygame.event.get())
+    return events
+
+def main():
+    """Ouvre la fenêtre et joue une partie contre l'IA, jusqu'à la fermeture de la fenêtre."""
+    global placing_done, current_ship_idx, current_orientation, shot_message, shot_message_timer
+    global game_over, winner, ai_ready_move, ai_turn_pending
+    init_display()
+    new_game()
+
+    # Seuls ces événements réveillent la boucle
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION,
+                              pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE, AI_MOVE_READY])
+
+    # Boucle principale : on ne redessine qu'après un événement ou une échéance
+    clock = pygame.time.Clock()
+    running = True
+    while running:
+        # Passer à la suite une fois tous les navires placés
+        if not placing_done and current_ship_idx >= len(SHIPS):
+            placing_done = True
+            # L'IA prépare son premier coup pendant que le joueur choisit le sien
+            ai_worker.request(player_board.remaining_ship_cells)
+            # L'aperçu du placement ne suit plus la souris : ses mouvements n'ont plus à réveiller la boucle
+            pygame.event.set_blocked(pygame.MOUSEMOTION)
+        # Effacer le message après 1,5s
+        if shot_message and pygame.time.get_ticks() - shot_message_timer >= SHOT_MESSAGE_DURATION:
+            shot_message = ""
+
+        # Seules les zones modifiées depuis l'image précédente sont redessinées
+        renderer.present(collect_overlays())
+
+        # Limiter la cadence quand les événements s'enchaînent, puis dormir jusqu'au suivant
+        clock.tick(MAX_FPS)
+        for event in wait_for_events():
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                renderer.invalidate()
+            if event.type == AI_MOVE_READY:
+                if game_over:
+                    continue
+                if event.error is not None:
+                    on_ai_error(event.error)
+                elif ai_turn_pending:
+                    ai_turn_pending = False
+                    play_ai_move(event.move)
+                else:
+                    ai_ready_move = event.move # Le joueur n'a pas encore tiré
+                continue
+            if not placing_done and current_ship_idx < len(SHIPS):
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        current_orientation = 'V' if current_orientation == 'H' else 'H'
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    mx, my = pygame.mouse.get_pos()
+                    grid_x, grid_y = player_grid_pos
+                    r = (my - grid_y) // CELL_SIZE
+                    c = (mx - grid_x) // CELL_SIZE
+                    if 0 <= r < GRID_SIZE and 0 <= c < GRID_SIZE:
+                        if is_valid_placement(placed_ships, r, c, SHIPS[current_ship_idx][1], current_orientation):
+                            # Créer l'objet Ship et le poser sur le plateau (qui lui assigne ses coordonnées)
+                            ship_name, ship_length, ship_color = SHIPS[current_ship_idx]
+                            ship_obj = Ship(ship_name, ship_length)
+                            player_board.place_ship(ship_obj, (r, c), current_orientation)
+                        
+                            # Ajouter aux listes
+                            placed_ships.append((r, c, ship_length, current_orientation, ship_color))
+                            renderer.add_ship(placed_ships[-1], player_grid_pos)
+                            player_ship_objects.append(ship_obj)
+                        
+                            current_ship_idx += 1
+                            current_orientation = 'H'  # Reset orientation par défaut
+            elif placing_done and not game_over and not ai_turn_pending:
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    mx, my = pygame.mouse.get_pos()
+                    grid_x, grid_y = ai_grid_pos
+                    r = (my - grid_y) // CELL_SIZE
+                    c = (mx - grid_x) // CELL_SIZE
+                    if 0 <= r < GRID_SIZE and 0 <= c < GRID_SIZE:
+                        result = ai_player.own_board.receive_shot((r, c))
+                        if result != 'already_hit':
+                            if result in ('hit', 'sunk'):
+                                player_shots.append((r, c, 'hit'))
+                                renderer.add_shot(player_shots[-1], ai_grid_pos)
+                                shot_message = f"Coulé en {chr(65 + c)}{r + 1} !" if result == 'sunk' else f"Touché en {chr(65 + c)}{r + 1} !"
+                            else:
+                                player_shots.append((r, c, 'miss'))
+                                renderer.add_shot(player_shots[-1], ai_grid_pos)
+                                shot_message = f"Manqué en {chr(65 + c)}{r + 1}."
+                            shot_message_timer = pygame.time.get_ticks()
+                            # Vérifier si le joueur a gagné (compteurs de la flotte de l'IA, en O(1))
+                            if ai_player.has_lost():
+                                game_over = True
+                                winner = 'joueur'
+                            elif ai_ready_move is not None:
+                                # Riposte IA intelligente, déjà calculée pendant que le joueur réfléchissait
+                                ia_shot, ai_ready_move = ai_ready_move, None
+                                play_ai_move(ia_shot)
+                            else:
+                                # Le coup de l'IA arrivera par un événement AI_MOVE_READY
+                                ai_turn_pending = True
+
+    ai_worker.stop()
+    pygame.quit()
@@ -0,0 +1,18 @@
+"""
+Emplacement des ressources du jeu (polices, images).
+
+Le dossier assets/ est résolu une seule fois, par rapport au projet et non au répertoire
+courant : l'interface se lance de n'importe où. La variable d'environnement
+BATAILLE_NAVALE_ASSETS permet de le déplacer.
+"""
+import os
+
+ASSETS_DIR = os.environ.get(
+    "BATAILLE_NAVALE_ASSETS",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets"),
+)
+
+
+def asset_path(*parts: str) -> str:
+    """Chemin absolu d'une ressource, par exemple asset_path("fonts", "Police.ttf")."""
+    return os.path.join(ASSETS_DIR, *parts)
@@ -0,0 +1,36 @@
+"""
+Flux aléatoires indépendants et reproductibles.
+
+Chaque partie d'une simulation reçoit ses propres générateurs, dérivés d'une graine racine
+et du numéro de la partie (et d'un numéro de flux par joueur). Le hasard d'une partie ne
+dépend donc ni des parties jouées avant elle dans le même processus, ni du découpage en
+lots : n'importe quelle partie d'un grand lancer se rejoue seule, à l'identique.
+"""
+import hashlib
+import random
+from typing import List
+
+
+def derive_seed(root, *path) -> int:
+    """
+    Dérive une graine de 64 bits d'une graine racine et d'un chemin (numéro de partie,
+    numéro de joueur...). Stable d'un processus et d'une machine à l'autre.
+    """
+    digest = hashlib.blake2b(repr((root,) + path).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def make_rng(root, *path) -> random.Random:
+    """
+    Un générateur indépendant pour le chemin donné ; si root est None, un générateur
+    initialisé par le système (non reproductible).
+    """
+    if root is None:
+        return random.Random()
+    return random.Random(derive_seed(root, *path))
+
+
+def game_rngs(root, game_index: int, players: int = 2) -> List[random.Random]:
+    """Un flux par joueur pour la partie numéro `game_index`."""
+    return [make_rng(root, game_index, player) for player in range(players)]
+
@@ -0,0 +1,344 @@
+"""
+Serveur de parties en réseau : un seul processus héberge des milliers de parties
+humain contre IA, au lieu d'un processus (et d'une console) par joueur.
+
+Le protocole est du JSON, un objet par ligne, sur une connexion TCP. Chaque connexion
+porte une partie (GameSession) :
+
+    client -> serveur
+        {"type": "new", "board_size": 10, "seed": 42, "fleet": [...]}   (tous facultatifs)
+        {"type": "shoot", "coord": [ligne, colonne]}
+        {"type": "state"}
+        {"type": "quit"}
+
+    serveur -> client
+        {"type": "started", "session": 1, "board_size": 10, "fleet": [...]}
+        {"type": "shot", "coord": [3, 4], "result": "hit"}         tir du joueur
+        {"type": "ai_shot", "coord": [0, 0], "result": "miss", "refinement": "complet"}
+                                                                    riposte de l'IA
+        {"type": "game_over", "winner": "Joueur"}
+        {"type": "state", ...}
+        {"type": "error", "message": "..."}
+
+La flotte du joueur ("fleet") est une liste de {"start": [ligne, colonne], "orientation": "H"},
+dans l'ordre des navires du joueur ; sans elle, le serveur la place au hasard. Les
+coordonnées commencent à 0.
+
+Le coup de l'IA (calcul de la grille de probabilités) tourne dans un exécuteur, pour ne
+pas bloquer la boucle d'événements. Chaque connexion est fermée après `idle_timeout`
+secondes sans message, et l'écriture attend que le client lise (drain) : un client lent
+ne fait pas grossir les tampons du serveur. Avec `move_budget_ms`, chaque riposte est
+rendue dans ce délai compté depuis le tir du joueur (attente de l'exécuteur comprise) ;
+"refinement" dit jusqu'où l'IA a pu affiner son coup (voir AIPlayer.get_shot_coordinates).
+
+Usage :
+    python -m src.server --port 8765
+"""
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .events import EventBus
+from .fleet_sampler import FleetPlacementError, sample_fleet
+from .game import Game, resolve_shot
+
+DEFAULT_PORT = 8765
+MAX_LINE_BYTES = 64 * 1024
+
+
+class ProtocolError(Exception):
+    """Message du client invalide : l'erreur lui est renvoyée, la connexion reste ouverte."""
+
+
+def parse_coord(value, size: int) -> Tuple[int, int]:
+    """
+    Valide une case envoyée par le client : une liste [ligne, colonne] de deux entiers
+    compris entre 0 et size - 1.
+
+    Raises:
+        ProtocolError: Si la valeur n'est pas une case du plateau.
+    """
+    if (not isinstance(value, list) or len(value) != 2
+            or not all(isinstance(v, int) and not isinstance(v, bool) for v in value)):
+        raise ProtocolError("Une case s'écrit [ligne, colonne] (deux entiers).")
+    r, c = value
+    if not (0 <= r < size and 0 <= c < size):
+        raise ProtocolError(f"La case [{r}, {c}] est hors du plateau (0 à {size - 1}).")
+    return r, c
+
+
+class GameSession:
+    """
+    Une partie humain contre IA pilotée par messages, sans aucune entrée/sortie console.
+
+    Attributes:
+        session_id (int): L'identifiant de la partie sur le serveur.
+        game (Game): La partie (joueurs et plateaux).
+        winner (str or None): Le nom du gagnant, une fois la partie terminée.
+    """
+    def __init__(self, session_id: int, board_size: int = 10, seed=None,
+                 fleet: Optional[List[Dict]] = None):
+        self.session_id = session_id
+        # Bus sans abonné : le moteur ne publie (ni n'affiche) rien
+        self.game = Game(board_size, events=EventBus(), seed=seed)
+        self.winner: Optional[str] = None
+        self._place_human_fleet(fleet)
+        ai = self.game.player_ai
+        ai.place_ships()
+        ai.update_untried_coordinates_after_placement()
+
+    def _place_human_fleet(self, fleet: Optional[List[Dict]]):
+        human = self.game.player_human
+        size = human.own_board.size
+        if fleet is None:
+            try:
+                layout = sample_fleet(size, [ship.length for ship in human.ships_to_place], human.rng, uniform=True)
+            except FleetPlacementError as error:
+                raise ProtocolError(str(error))
+            if layout is None:
+                raise ProtocolError("Impossible de placer la flotte sur ce plateau.")
+        else:
+            if not isinstance(fleet, list) or len(fleet) != len(human.ships_to_place):
+                raise ProtocolError(f"La flotte doit compter {len(human.ships_to_place)} navires.")
+            layout = []
+            for entry in fleet:
+                try:
+                    start, orientation = entry["start"], entry["orientation"]
+                except (KeyError, TypeError):
+                    raise ProtocolError("Navire attendu sous la forme {\"start\": [ligne, colonne], \"orientation\": \"H\"}.")
+                r, c = parse_coord(start, size)
+                if orientation not in ("H", "V"):
+                    raise ProtocolError("orientation doit valoir \"H\" ou \"V\".")
+                layout.append((r, c, orientation))
+        for ship, (r, c, orientation) in zip(human.ships_to_place, layout):
+            if not human.own_board.place_ship(ship, (r, c), orientation):
+                raise ProtocolError(f"Placement invalide pour le {ship.name}.")
+
+    @property
+    def is_over(self) -> bool:
+        return self.winner is not None
+
+    def describe(self) -> Dict:
+        """Le message de début de partie."""
+        human = self.game.player_human
+        return {
+            "type": "started",
+            "session": self.session_id,
+            "board_size": self.game.board_size,
+            "fleet": [{"name": ship.name, "length": ship.length, "coords": [list(coord) for coord in ship.coordinates]}
+                      for ship in human.ships_to_place],
+        }
+
+    def player_shot(self, coord: Tuple[int, int]) -> str:
+        """Résout le tir du joueur (rapide : exécuté directement dans la boucle d'événements)."""
+        game = self.game
+        result = resolve_shot(game.player_human, game.player_ai, coord)
+        if game.player_ai.has_lost():
+            self.winner = game.player_human.name
+        return result
+
+    def ai_turn(self, deadline: Optional[float] = None) -> Tuple[Tuple[int, int], str, str]:
+        """
+        Choisit et résout le tir de l'IA (coûteux : exécuté dans un exécuteur).
+
+        Args:
+            deadline (float, optional): Échéance du coup, sur l'horloge time.perf_counter().
+
+        Returns:
+            tuple: Le tir, son résultat et le niveau de raffinement atteint par l'IA.
+        """
+        game = self.game
+        ai, human = game.player_ai, game.player_human
+        coord = ai.get_shot_coordinates(opponent_remaining_hp=human.get_remaining_ship_hp(), deadline=deadline)
+        result = resolve_shot(ai, human, coord)
+        if human.has_lost():
+            self.winner = ai.name
+        return coord, result, ai.last_refinement
+
+    def state(self) -> Dict:
+        """L'état visible par le joueur : ses tirs, ceux de l'IA, et les parties de navires restantes."""
+        game = self.game
+        human, ai = game.player_human, game.player_ai
+        return {
+            "type": "state",
+            "session": self.session_id,
+            "shots": [list(coord) + [human.target_board.get_cell(coord)] for coord in human.target_board.get_all_shot_coords()],
+            "ai_shots": [list(coord) + [human.own_board.get_cell(coord)] for coord in human.own_board.get_all_shot_coords()],
+            "remaining": human.get_remaining_ship_hp(),
+            "ai_remaining": ai.get_remaining_ship_hp(),
+            "winner": self.winner,
+        }
+
+
+class GameServer:
+    """
+    Serveur asyncio hébergeant une partie par connexion.
+
+    Attributes:
+        sessions (dict): Les parties en cours, par identifiant.
+    """
+    def __init__(self, idle_timeout: float = 300.0, max_sessions: int = 10000,
+                 executor: Optional[Executor] = None, max_pending_moves: int = 64,
+                 max_board_size: int = 100, move_budget_ms: Optional[float] = None):
+        """
+        Args:
+            idle_timeout (float): Secondes sans message avant la fermeture d'une connexion.
+            max_sessions (int): Nombre maximal de connexions simultanées ; au-delà, le serveur
+                                répond une erreur et ferme la connexion.
+            executor (Executor, optional): Où calculer les coups de l'IA (par défaut, un pool de threads).
+            max_pending_moves (int): Nombre maximal de coups de l'IA confiés à l'exécuteur en même
+                                     temps ; les autres parties attendent leur tour sans bloquer
+                                     la boucle (la file de l'exécuteur ne grossit pas sans limite).
+            max_board_size (int): Taille de plateau maximale qu'un client peut demander.
+            move_budget_ms (float, optional): Délai maximal de la riposte de l'IA, en millisecondes,
+                                              compté depuis la réception du tir. None : pas de limite.
+        """
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.max_board_size = max_board_size
+        self.move_budget_ms = move_budget_ms
+        self.sessions: Dict[int, GameSession] = {}
+        self._executor = executor if executor is not None else ThreadPoolExecutor(thread_name_prefix="ia")
+        self._owns_executor = executor is None
+        self._max_pending_moves = max_pending_moves
+        self._move_slots: Optional[asyncio.Semaphore] = None
+        self._connections = 0
+        self._ids = itertools.count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Ouvre le port d'écoute (port 0 : un port libre, lisible dans server.sockets)."""
+        self._move_slots = asyncio.Semaphore(self._max_pending_moves)
+        self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE_BYTES)
+        return self._server
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    async def _send(self, writer: asyncio.StreamWriter, message: Dict):
+        writer.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        await writer.drain() # Contre-pression : on attend que le client lise
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if self._connections >= self.max_sessions:
+            await self._send(writer, {"type": "error", "message": "Serveur complet."})
+            writer.close()
+            return
+        self._connections += 1
+        session: Optional[GameSession] = None
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    await self._send(writer, {"type": "error", "message": "Délai d'inactivité dépassé."})
+                    break
+                except ValueError: # Ligne plus longue que MAX_LINE_BYTES
+                    await self._send(writer, {"type": "error", "message": "Message trop long."})
+                    break
+                if not line:
+                    break # Le client a fermé la connexion
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ProtocolError("Un message est un objet JSON.")
+                    if message.get("type") == "quit":
+                        break
+                    session = await self._dispatch(writer, session, message)
+                except (ProtocolError, json.JSONDecodeError) as e:
+                    await self._send(writer, {"type": "error", "message": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections -= 1
+            if session is not None:
+                self.sessions.pop(session.session_id, None)
+            writer.close()
+
+    async def _dispatch(self, writer: asyncio.StreamWriter, session: Optional[GameSession],
+                        message: Dict) -> Optional[GameSession]:
+        """Traite un message et retourne la partie de la connexion (nouvelle ou inchangée)."""
+        kind = message.get("type")
+        if kind == "new":
+            board_size = message.get("board_size", 10)
+            if not isinstance(board_size, int) or not 5 <= board_size <= self.max_board_size:
+                raise ProtocolError(f"board_size doit être un entier entre 5 et {self.max_board_size}.")
+            # Création de l'IA, de ses tables et des flottes : coûteuse sur un grand plateau,
+            # donc hors de la boucle d'événements, avec les coups de l'IA
+            build = functools.partial(GameSession, next(self._ids), board_size, message.get("seed"), message.get("fleet"))
+            loop = asyncio.get_running_loop()
+            async with self._move_slots:
+                new_session = await loop.run_in_executor(self._executor, build)
+            if session is not None:
+                self.sessions.pop(session.session_id, None)
+            session = new_session
+            self.sessions[session.session_id] = session
+            await self._send(writer, session.describe())
+            return session
+
+        if session is None:
+            raise ProtocolError("Aucune partie en cours : envoyez d'abord {\"type\": \"new\"}.")
+        if kind == "state":
+            await self._send(writer, session.state())
+        elif kind == "shoot":
+            await self._shoot(writer, session, message.get("coord"))
+        else:
+            raise ProtocolError(f"Type de message inconnu : {kind!r}")
+        return session
+
+    async def _shoot(self, writer: asyncio.StreamWriter, session: GameSession, coord):
+        if session.is_over:
+            raise ProtocolError("La partie est terminée.")
+        r, c = parse_coord(coord, session.game.board_size)
+
+        result = session.player_shot((r, c))
+        await self._send(writer, {"type": "shot", "coord": [r, c], "result": result})
+        if result in ("invalid", "already_hit"):
+            return # Le joueur doit rejouer
+        if not session.is_over:
+            deadline = None
+            if self.move_budget_ms is not None:
+                deadline = time.perf_counter() + self.move_budget_ms / 1000.0
+            loop = asyncio.get_running_loop()
+            async with self._move_slots:
+                ai_coord, ai_result, refinement = await loop.run_in_executor(self._executor, session.ai_turn, deadline)
+            await self._send(writer, {"type": "ai_shot", "coord": list(ai_coord), "result": ai_result,
+                                      "refinement": refinement})
+        if session.is_over:
+            await self._send(writer, {"type": "game_over", "winner": session.winner})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serveur de parties de Bataille Navale (JSON ligne par ligne).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="secondes d'inactivité avant déconnexion")
+    parser.add_argument("--max-sessions", type=int, default=10000)
+    parser.add_argument("--move-budget-ms", type=float, default=None, help="délai maximal d'une riposte de l'IA")
+    args = parser.parse_args(argv)
+
+    server = GameServer(idle_timeout=args.idle_timeout, max_sessions=args.max_sessions,
+                        move_budget_ms=args.move_budget_ms)
+    print(f"Serveur de Bataille Navale sur {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ class Ship:
         length (int): La longueur du navire en nombre de cases.
         hits (list of bool): L'état des parties du navire.
                               True si une partie est touchée, False sinon.
+        remaining (int): Le nombre de parties encore intactes, tenu à jour par hit_index.
         coordinates (list of tuple): Une liste de (row, col) où le navire est placé sur le plateau.
                                      Initialement vide, remplie lors du placement.
     """
@@ -23,6 +24,7 @@ class Ship:
         self.name = name
         self.length = length
         self.hits = [False] * length  # Toutes les parties du navire sont intactes au début
+        self.remaining = length       # Compteur des parties intactes : is_sunk en O(1)
         self.coordinates = []         # Les coordonnées seront définies lors du placement
 
     def is_sunk(self) -> bool:
@@ -33,7 +35,7 @@ class Ship:
         Returns:
             bool: True si le navire est coulé, False sinon.
         """
-        return all(self.hits) # 'all()' retourne True si tous les éléments de l'itérable sont True
+        return self.remaining == 0
 
     def hit_part(self, coordinate: tuple) -> bool:
         """
@@ -48,14 +50,27 @@ class Ship:
         try:
             # Trouve l'index de la coordonnée dans la liste des coordonnées du navire
             index = self.coordinates.index(coordinate)
-            if not self.hits[index]: # Vérifie si la partie n'a pas déjà été touchée
-                self.hits[index] = True
-                print(f"Bateau {self.name} touché à {chr(65 + coordinate[1])}{coordinate[0] + 1}!")
-                return True
-            return False # Déjà touché ou ne correspond pas
         except ValueError:
             # La coordonnée ne fait pas partie de ce navire
             return False
+        return self.hit_index(index)
+
+    def hit_index(self, index: int) -> bool:
+        """
+        Marque la partie numéro `index` du navire comme touchée.
+        Utilisé par le plateau, qui connaît déjà la partie touchée grâce à sa table case -> navire.
+
+        Args:
+            index (int): L'index de la partie touchée dans self.coordinates.
+
+        Returns:
+            bool: True si la partie n'était pas encore touchée, False sinon.
+        """
+        if not self.hits[index]: # Vérifie si la partie n'a pas déjà été touchée
+            self.hits[index] = True
+            self.remaining -= 1
+            return True
+        return False # Déjà touché
 
     def __repr__(self) -> str:
         """
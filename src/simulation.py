@@ -0,0 +1,318 @@
+"""
+Moteur de simulation sans interface : joue des milliers de parties IA contre IA
+(ou IA contre tireur aléatoire) réparties sur plusieurs processus.
+"""
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from .ai_player import AIPlayer
+from .coordinate_set import SparseCoordinateSet
+from .events import EventBus
+from .fleet_sampler import sample_fleet
+from .game import resolve_shot
+from .game_record import RESULT_CODES, GameBuffer, GameRecordWriter
+from .placements import LARGE_BOARD_SIZE
+from .player import NoMovesLeft, Player
+from .profiling import AIProfile
+from .rng import game_rngs
+
+# Un joueur se décrit par sa classe et ses arguments, pour pouvoir être recréé dans un autre processus
+PlayerSpec = Tuple[type, Dict]
+
+
+def place_random_fleet(player: Player) -> bool:
+    """
+    Place la flotte d'un joueur (de n'importe quelle classe) selon une disposition tirée
+    uniformément parmi les dispositions valides, avec le générateur du joueur. Si le tirage
+    par rejet échoue (flotte très dense pour le plateau), la disposition vient du retour
+    arrière et n'est plus exactement uniforme.
+
+    Returns:
+        bool: True si la disposition a été tirée exactement au hasard.
+
+    Raises:
+        FleetPlacementError: La flotte ne tient pas sur le plateau (aucun navire n'est placé).
+    """
+    size, lengths = player.own_board.size, [ship.length for ship in player.ships_to_place]
+    layout = sample_fleet(size, lengths, player.rng, uniform=True)
+    uniform = layout is not None
+    if layout is None:
+        layout = sample_fleet(size, lengths, player.rng)
+    for ship, (r, c, orientation) in zip(player.ships_to_place, layout):
+        player.own_board.place_ship(ship, (r, c), orientation)
+    return uniform
+
+
+class RandomPlayer(Player):
+    """
+    Joueur automatique sans stratégie : place ses navires et tire au hasard.
+    Remplace le joueur humain dans les simulations.
+    """
+    def __init__(self, name: str = "Aléatoire", board_size: int = 10, events: Optional[EventBus] = None,
+                 rng=None):
+        super().__init__(name, board_size, events, rng)
+        self.uniform_fleet = False # La flotte placée a-t-elle été tirée exactement au hasard ?
+        if board_size >= LARGE_BOARD_SIZE:
+            # Très grand plateau : les cases restantes sont tirées au sort, sans liste de toutes les cases
+            self._shots_order = SparseCoordinateSet(board_size)
+        else:
+            self._shots_order = [(r, c) for r in range(board_size) for c in range(board_size)]
+            self.rng.shuffle(self._shots_order)
+
+    def place_ships(self):
+        """
+        Place la flotte selon une disposition tirée uniformément parmi les dispositions valides
+        (voir place_random_fleet) ; uniform_fleet vaut False si le tirage a dû se rabattre
+        sur le retour arrière.
+        """
+        self.uniform_fleet = place_random_fleet(self)
+
+    def get_shot_coordinates(self, opponent_remaining_hp: Optional[int] = None) -> Tuple[int, int]:
+        """Tire sur une case encore jamais visée, au hasard."""
+        while self._shots_order:
+            if isinstance(self._shots_order, SparseCoordinateSet):
+                shot_coord = self._shots_order.choice(self.rng)
+                self._shots_order.discard(shot_coord)
+            else:
+                shot_coord = self._shots_order.pop()
+            if not self.target_board.is_shot(shot_coord):
+                return shot_coord
+        raise NoMovesLeft(f"{self.name} n'a plus de coups possibles !")
+
+
+class SimulationStats:
+    """
+    Résultats agrégés d'une série de parties entre deux joueurs (0 et 1).
+
+    Attributes:
+        games (int): Nombre de parties jouées.
+        wins (list of int): Victoires de chaque joueur.
+        forfeits (int): Parties terminées parce qu'un joueur n'avait plus de coup possible.
+        shots_to_win (list of Counter): Pour chaque joueur, nombre de tirs -> nombre de victoires.
+        profile (AIProfile or None): Les mesures par phase des IA, si le profilage est demandé.
+    """
+    def __init__(self):
+        self.games = 0
+        self.wins = [0, 0]
+        self.forfeits = 0
+        self.shots_to_win: List[Counter] = [Counter(), Counter()]
+        self.profile: Optional[AIProfile] = None
+
+    def record(self, winner: int, shots: int, forfeit: bool = False):
+        """Enregistre le résultat d'une partie."""
+        self.games += 1
+        self.wins[winner] += 1
+        if forfeit:
+            self.forfeits += 1
+        else:
+            self.shots_to_win[winner][shots] += 1
+
+    def merge(self, other: "SimulationStats") -> "SimulationStats":
+        """Ajoute les résultats d'une autre série (par exemple celle d'un autre processus)."""
+        self.games += other.games
+        self.forfeits += other.forfeits
+        for player in (0, 1):
+            self.wins[player] += other.wins[player]
+            self.shots_to_win[player].update(other.shots_to_win[player])
+        if other.profile is not None:
+            self.profile = (self.profile or AIProfile()).merge(other.profile)
+        return self
+
+    def win_rate(self, player: int) -> float:
+        """Taux de victoire du joueur (0 ou 1)."""
+        return self.wins[player] / self.games if self.games else 0.0
+
+    def mean_shots_to_win(self, player: int) -> float:
+        """Nombre moyen de tirs dans les parties gagnées par le joueur."""
+        distribution = self.shots_to_win[player]
+        total = sum(distribution.values())
+        if not total:
+            return 0.0
+        return sum(shots * count for shots, count in distribution.items()) / total
+
+    def as_dict(self) -> Dict:
+        """Résumé sérialisable en JSON."""
+        summary = {
+            "games": self.games,
+            "wins": list(self.wins),
+            "forfeits": self.forfeits,
+            "win_rate": [self.win_rate(0), self.win_rate(1)],
+            "mean_shots_to_win": [self.mean_shots_to_win(0), self.mean_shots_to_win(1)],
+            "shots_to_win": [
+                {str(shots): count for shots, count in sorted(distribution.items())}
+                for distribution in self.shots_to_win
+            ],
+        }
+        if self.profile is not None:
+            summary["profile"] = self.profile.as_dict()
+        return summary
+
+
+def build_player(spec: PlayerSpec, name: str, board_size: int, rng=None) -> Player:
+    """Instancie un joueur à partir de sa description (classe, arguments) et de son générateur aléatoire."""
+    player_cls, kwargs = spec
+    if rng is not None:
+        kwargs = dict(kwargs, rng=rng)
+    return player_cls(name=name, board_size=board_size, **kwargs)
+
+
+def play_game(players: List[Player], first: int = 0,
+              record: Optional[GameBuffer] = None) -> Tuple[int, int, bool]:
+    """
+    Joue une partie complète entre deux joueurs déjà créés, sans interaction.
+
+    Args:
+        players (list): Les deux joueurs.
+        first (int): L'index du joueur qui commence.
+        record (GameBuffer, optional): Reçoit les flottes et chaque tir de la partie.
+
+    Returns:
+        Tuple[int, int, bool]: (index du gagnant, nombre de tirs du gagnant, partie gagnée par forfait).
+    """
+    for index, player in enumerate(players):
+        player.place_ships()
+        if isinstance(player, AIPlayer):
+            player.update_untried_coordinates_after_placement()
+        if record is not None:
+            record.add_fleet(index, player.own_board)
+
+    shots = [0, 0]
+    max_shots = players[0].own_board.size * players[0].own_board.size
+    current = first
+    while True:
+        shooter, target = players[current], players[1 - current]
+        if shots[current] >= max_shots:
+            return 1 - current, shots[1 - current], True
+        try:
+            if isinstance(shooter, AIPlayer):
+                shot_coord = shooter.get_shot_coordinates(opponent_remaining_hp=target.get_remaining_ship_hp())
+            else:
+                shot_coord = shooter.get_shot_coordinates()
+        except NoMovesLeft:
+            # Plus aucun coup possible : l'adversaire l'emporte par forfait (toute autre
+            # erreur remonte, au lieu de passer pour une victoire ordinaire)
+            return 1 - current, shots[1 - current], True
+
+        result = resolve_shot(shooter, target, shot_coord)
+        if record is not None and result in RESULT_CODES:
+            record.add_shot(current, shot_coord, result)
+        shots[current] += 1
+        if target.has_lost():
+            return current, shots[current], False
+        current = 1 - current
+
+
+def play_indexed_game(game_index: int, seed, player_a: PlayerSpec, player_b: PlayerSpec, board_size: int = 10,
+                      record: Optional[GameBuffer] = None,
+                      profile: Optional[AIProfile] = None) -> Tuple[int, int, bool]:
+    """
+    Joue la partie numéro `game_index` d'une simulation de graine racine `seed`.
+
+    Chaque joueur reçoit son propre flux aléatoire dérivé de (seed, game_index), sans
+    toucher au générateur global : le résultat ne dépend que de ces deux nombres. Une partie
+    d'un grand lancer se rejoue donc seule, par exemple pour la profiler ou la déboguer :
+        play_indexed_game(123456, seed=7, player_a=(AIPlayer, {}), player_b=(RandomPlayer, {}))
+
+    Avec `profile`, les IA de la partie y notent leurs mesures par phase (voir profiling).
+
+    Returns:
+        Tuple[int, int, bool]: Comme play_game.
+    """
+    rng_a, rng_b = game_rngs(seed, game_index)
+    # Aucun abonné sur les bus d'événements : le moteur ne produit aucune sortie
+    players = [
+        build_player(player_a, "A", board_size, rng_a),
+        build_player(player_b, "B", board_size, rng_b),
+    ]
+    if profile is not None:
+        for player in players:
+            if isinstance(player, AIPlayer):
+                player.profile = profile
+    # Les joueurs commencent à tour de rôle
+    return play_game(players, first=game_index % 2, record=record)
+
+
+def _run_chunk(task) -> Tuple[SimulationStats, List[bytes]]:
+    """
+    Joue un bloc de parties dans un processus de travail.
+    Chaque partie a ses propres flux aléatoires (voir play_indexed_game) : les résultats
+    ne dépendent ni du découpage en blocs ni du nombre de processus.
+
+    Returns:
+        Tuple: (statistiques du bloc, parties encodées si l'enregistrement est demandé).
+    """
+    start_index, count, seed, player_a, player_b, board_size, record, profile = task
+    stats = SimulationStats()
+    if profile:
+        stats.profile = AIProfile()
+    games: List[bytes] = []
+    for game_index in range(start_index, start_index + count):
+        buffer = GameBuffer(board_size, game_index % 2) if record else None
+        winner, shots, forfeit = play_indexed_game(game_index, seed, player_a, player_b, board_size, buffer,
+                                                   stats.profile)
+        stats.record(winner, shots, forfeit)
+        if buffer is not None:
+            games.append(buffer.finish(winner))
+    return stats, games
+
+
+def simulate(num_games: int,
+             player_a: PlayerSpec = (AIPlayer, {}),
+             player_b: PlayerSpec = (RandomPlayer, {}),
+             board_size: int = 10,
+             workers: Optional[int] = None,
+             chunk_size: int = 100,
+             seed: Optional[int] = None,
+             record_path: Optional[str] = None,
+             profile: bool = False) -> SimulationStats:
+    """
+    Joue `num_games` parties entre deux types de joueurs, réparties sur un pool de processus.
+
+    Args:
+        num_games (int): Nombre total de parties.
+        player_a (PlayerSpec): Classe et arguments du joueur 0.
+        player_b (PlayerSpec): Classe et arguments du joueur 1.
+        board_size (int): La taille des plateaux.
+        workers (int, optional): Nombre de processus (par défaut, le nombre de CPU).
+                                 Avec 1, tout est joué dans le processus courant.
+        chunk_size (int): Nombre de parties envoyées à un processus en une fois.
+        seed (int, optional): Graine racine ; chaque partie en dérive ses propres flux aléatoires
+                              (voir play_indexed_game pour en rejouer une seule).
+        record_path (str, optional): Fichier d'enregistrement (voir game_record) où ajouter
+                                     toutes les parties, dans l'ordre de leur numéro.
+        profile (bool): Mesure chaque phase de décision des IA ; les profils des processus
+                        sont réunis dans stats.profile.
+
+    Returns:
+        SimulationStats: Les résultats agrégés.
+    """
+    tasks = []
+    for start in range(0, num_games, chunk_size):
+        count = min(chunk_size, num_games - start)
+        tasks.append((start, count, seed, player_a, player_b, board_size, record_path is not None, profile))
+
+    stats = SimulationStats()
+    writer = GameRecordWriter(record_path) if record_path is not None else None
+    try:
+        if workers == 1:
+            for chunk_stats, games in map(_run_chunk, tasks):
+                _collect(stats, writer, chunk_stats, games)
+        else:
+            # Importé ici : un lancer sur un seul processus démarre sans charger multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for chunk_stats, games in executor.map(_run_chunk, tasks):
+                    _collect(stats, writer, chunk_stats, games)
+    finally:
+        if writer is not None:
+            writer.close()
+    return stats
+
+
+def _collect(stats: SimulationStats, writer: Optional[GameRecordWriter],
+             chunk_stats: SimulationStats, games: List[bytes]):
+    """Ajoute les résultats d'un bloc aux statistiques et ses parties à l'enregistrement."""
+    stats.merge(chunk_stats)
+    if writer is not None:
+        for game in games:
+            writer.write_encoded(game)
@@ -0,0 +1,402 @@
+"""
+Instantanés binaires compacts de l'état complet d'une partie.
+
+Un instantané contient les deux joueurs : plateaux (couches de cases), flottes (position
+et parties touchées de chaque navire), état du générateur aléatoire et, pour l'IA, tout
+son état de ciblage (hits non résolus et cases des navires coulés du solveur de grappes) et ses
+paramètres adaptatifs. Il sert à sauvegarder et reprendre une partie, à la déplacer d'un
+processus à l'autre (serveur), et à dupliquer un état pour explorer des variantes :
+
+    data = dump_game(game)      # ~6 Ko sur un plateau 10 x 10, dont 2,5 Ko par générateur
+    copie = load_game(data)     # ou fork_game(game) ; ~1 ms, contre ~18 ms pour copy.deepcopy
+
+Une couche de plateau est écrite soit comme un masque de bits, soit comme une liste
+d'index (u32) quand elle a peu de cases : un très grand plateau presque vide reste petit.
+La densité de placements de l'IA n'est pas écrite : elle est recalculée en rejouant les
+tirs du plateau de cible, ce qui donne exactement les mêmes compteurs. Les échantillons
+de MonteCarloAIPlayer ne sont pas écrits non plus : ce sont un cache, régénéré au coup
+suivant.
+"""
+import random
+import struct
+from collections import Counter
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from .ai_player import AIPlayer
+from .board import Board
+from .coordinate_set import CoordinateSet, IndexedSet, SparseCoordinateSet
+from .events import EventBus
+from .game import Game
+from .human_player import HumanPlayer
+from .monte_carlo_ai import MonteCarloAIPlayer
+from .placement_counts import make_placement_counts
+from .player import Player
+from .ship import Ship
+from .simulation import RandomPlayer
+from .sparse_board import SparseBoard, make_board
+from .utils import iter_bits
+
+MAGIC = b"BNSN"
+VERSION = 4
+
+# MAGIC, version, joueur courant (0 : l'humain, 1 : l'IA), réservé
+GAME_HEADER = struct.Struct("<4sHBB")
+# Type de joueur, taille du plateau, état du générateur présent
+PLAYER_HEADER = struct.Struct("<BHB")
+# Taille, nombre de navires, index du dernier navire coulé (NONE si aucun)
+BOARD_HEADER = struct.Struct("<HBB")
+# Longueur, ligne, colonne, orientation
+SHIP_ENTRY = struct.Struct("<BHHc")
+# Niveau d'agressivité, préférence de parité, tirs, hits, navires coulés, manqués consécutifs,
+# seuil de fin de jeu, placement uniforme, résultat du dernier tir
+AI_HEADER = struct.Struct("<ddIIIIHBB")
+MONTE_CARLO_HEADER = struct.Struct("<Id")
+RNG_STATE = struct.Struct("<625IBd")
+U8 = struct.Struct("<B")
+U16 = struct.Struct("<H")
+U32 = struct.Struct("<I")
+
+NONE = 255
+LAYER_MASK = 0
+LAYER_INDEXES = 1
+
+PLAYER_KINDS = {HumanPlayer: 0, AIPlayer: 1, RandomPlayer: 2, MonteCarloAIPlayer: 3}
+PLAYER_CLASSES = {kind: cls for cls, kind in PLAYER_KINDS.items()}
+RESULTS = [None, "miss", "hit", "sunk", "already_hit", "invalid"]
+
+
+class _Writer:
+    """Tampon d'écriture des champs d'un instantané."""
+    def __init__(self):
+        self.data = bytearray()
+
+    def pack(self, fmt: struct.Struct, *values):
+        self.data += fmt.pack(*values)
+
+    def text(self, value: Optional[str]):
+        if value is None:
+            self.data += U16.pack(0xFFFF)
+            return
+        encoded = value.encode("utf-8")
+        self.data += U16.pack(len(encoded)) + encoded
+
+    def indexes(self, values: Sequence[int]):
+        self.data += U32.pack(len(values)) + struct.pack(f"<{len(values)}I", *values)
+
+    def coords(self, coords: Iterable[Tuple[int, int]], size: int):
+        self.indexes([r * size + c for r, c in coords])
+
+    def blob(self, value: bytes):
+        self.data += U32.pack(len(value)) + value
+
+
+class _Reader:
+    """Lecture séquentielle des champs d'un instantané."""
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct):
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def text(self) -> Optional[str]:
+        (length,) = self.unpack(U16)
+        if length == 0xFFFF:
+            return None
+        value = bytes(self.data[self.offset:self.offset + length]).decode("utf-8")
+        self.offset += length
+        return value
+
+    def indexes(self) -> List[int]:
+        (count,) = self.unpack(U32)
+        values = list(struct.unpack_from(f"<{count}I", self.data, self.offset))
+        self.offset += 4 * count
+        return values
+
+    def coords(self, size: int) -> List[Tuple[int, int]]:
+        return [divmod(index, size) for index in self.indexes()]
+
+    def blob(self) -> bytes:
+        (length,) = self.unpack(U32)
+        value = bytes(self.data[self.offset:self.offset + length])
+        self.offset += length
+        return value
+
+
+# --- Plateaux -------------------------------------------------------------------------
+
+_LAYERS = (("ship_bits", "ship_cells"), ("hit_bits", "hit_cells"), ("miss_bits", "miss_cells"))
+
+
+def _write_layer(out: _Writer, board: Board, bits_attr: str, cells_attr: str):
+    """Écrit une couche en liste d'index si elle est plus petite ainsi, en masque sinon."""
+    mask_bytes = (board.size * board.size + 7) // 8
+    if isinstance(board, SparseBoard):
+        indexes = sorted(getattr(board, cells_attr)) # Sans passer par le masque (coût en surface)
+    else:
+        mask = getattr(board, bits_attr)
+        indexes = list(iter_bits(mask)) if 4 * bin(mask).count("1") < mask_bytes else None
+    if indexes is not None and 4 * len(indexes) < mask_bytes:
+        out.pack(U8, LAYER_INDEXES)
+        out.indexes(indexes)
+    else:
+        out.pack(U8, LAYER_MASK)
+        out.blob(getattr(board, bits_attr).to_bytes(mask_bytes, "little"))
+
+
+def _read_layer(reader: _Reader, board: Board, bits_attr: str, cells_attr: str):
+    (kind,) = reader.unpack(U8)
+    if kind == LAYER_INDEXES:
+        indexes = reader.indexes()
+        if isinstance(board, SparseBoard):
+            setattr(board, cells_attr, set(indexes))
+        else:
+            mask = 0
+            for index in indexes:
+                mask |= 1 << index
+            setattr(board, bits_attr, mask)
+    else:
+        setattr(board, bits_attr, int.from_bytes(reader.blob(), "little"))
+
+
+def _ship_orientation(ship: Ship) -> str:
+    coords = ship.coordinates
+    return 'V' if len(coords) > 1 and coords[1][1] == coords[0][1] else 'H'
+
+
+def _write_board(out: _Writer, board: Board):
+    last_sunk = NONE
+    for i, ship in enumerate(board.ships):
+        if ship is board.last_sunk_ship:
+            last_sunk = i
+    out.pack(BOARD_HEADER, board.size, len(board.ships), last_sunk)
+    out.text(board.name)
+    for bits_attr, cells_attr in _LAYERS:
+        _write_layer(out, board, bits_attr, cells_attr)
+    for ship in board.ships:
+        r, c = ship.coordinates[0]
+        out.pack(SHIP_ENTRY, ship.length, r, c, _ship_orientation(ship).encode("ascii"))
+        out.text(ship.name)
+        out.indexes([part for part, hit in enumerate(ship.hits) if hit])
+
+
+def _read_board(reader: _Reader, events: EventBus) -> Board:
+    size, ship_count, last_sunk = reader.unpack(BOARD_HEADER)
+    board = make_board(size, name=reader.text(), events=events)
+    for bits_attr, cells_attr in _LAYERS:
+        _read_layer(reader, board, bits_attr, cells_attr)
+    for ship_id in range(ship_count):
+        length, r, c, orientation = reader.unpack(SHIP_ENTRY)
+        ship = Ship(reader.text(), length)
+        if orientation == b'H':
+            ship.coordinates = [(r, c + i) for i in range(length)]
+        else:
+            ship.coordinates = [(r + i, c) for i in range(length)]
+        for part in reader.indexes():
+            ship.hit_index(part)
+        for part, (sr, sc) in enumerate(ship.coordinates):
+            board.cell_to_ship[sr * size + sc] = (ship_id, part)
+        board.ships.append(ship)
+        board.remaining_ship_cells += ship.remaining
+    if last_sunk != NONE:
+        board.last_sunk_ship = board.ships[last_sunk]
+    return board
+
+
+# --- Joueurs --------------------------------------------------------------------------
+
+def _write_rng(out: _Writer, rng: random.Random):
+    version, internal, gauss_next = rng.getstate()
+    out.pack(RNG_STATE, *internal, gauss_next is not None, gauss_next or 0.0)
+
+
+def _read_rng(reader: _Reader) -> random.Random:
+    values = reader.unpack(RNG_STATE)
+    rng = random.Random()
+    rng.setstate((3, tuple(values[:625]), values[626] if values[625] else None))
+    return rng
+
+
+def _write_ai(out: _Writer, player: AIPlayer):
+    size = player.own_board.size
+    out.pack(AI_HEADER, player.aggression_level, player.parity_preference, player.shots_fired,
+             player.hits_achieved, player.ships_sunk, player.consecutive_misses, player.endgame_threshold,
+             player.uniform_placement, RESULTS.index(player.last_shot_result))
+    out.text(player.current_mode)
+    out.indexes(player.probability_counts.remaining_lengths)
+    untried = player.untried_coordinates
+    if isinstance(untried, SparseCoordinateSet):
+        # Très grand plateau : les cases déjà tirées plutôt que toutes les autres
+        out.coords(untried.removed, size)
+    else:
+        even, odd = untried.parity_classes
+        out.coords(even, size)
+        out.coords(odd, size)
+    solver = player.target_solver
+    for coords in (sorted(solver.unresolved), sorted(solver.resolved), player.last_sunk_cells,
+                   player.opponent_shots_made):
+        out.coords(coords, size)
+    tracking = player.opponent_shot_tracking_grid
+    out.coords(tracking, size)
+    out.text("".join(tracking.values()))
+    if isinstance(player, MonteCarloAIPlayer):
+        budget = player.time_budget
+        out.pack(MONTE_CARLO_HEADER, player.sample_count, -1.0 if budget is None else budget)
+        out.indexes(sorted(player.resolved_cells))
+
+
+def _read_ai(reader: _Reader, player: AIPlayer):
+    size = player.own_board.size
+    (player.aggression_level, player.parity_preference, player.shots_fired, player.hits_achieved,
+     player.ships_sunk, player.consecutive_misses, player.endgame_threshold, uniform_placement,
+     last_result) = reader.unpack(AI_HEADER)
+    player.uniform_placement = bool(uniform_placement)
+    player.last_shot_result = RESULTS[last_result]
+    player.current_mode = reader.text()
+    remaining_lengths = reader.indexes()
+
+    if isinstance(player.untried_coordinates, SparseCoordinateSet):
+        player.untried_coordinates = SparseCoordinateSet(size, reader.coords(size))
+    else:
+        untried = CoordinateSet()
+        untried.parity_classes = (IndexedSet(reader.coords(size)), IndexedSet(reader.coords(size)))
+        player.untried_coordinates = untried
+    solver = player.target_solver
+    solver.unresolved, solver.resolved = set(reader.coords(size)), set(reader.coords(size))
+    player.last_sunk_cells, player.opponent_shots_made = reader.coords(size), reader.coords(size)
+    tracked = reader.coords(size)
+    player.opponent_shot_tracking_grid = dict(zip(tracked, reader.text()))
+
+    # Densité de placements : on rejoue les tirs du plateau de cible puis les navires coulés
+    fleet_lengths = [ship.length for ship in player.ships_to_place]
+    if player.probability_counts.multiplicity != Counter(fleet_lengths):
+        player.probability_counts = make_placement_counts(size, fleet_lengths) # Flotte autre que la flotte standard
+    counts = player.probability_counts
+    target = player.target_board
+    for index in target.hit_indexes():
+        counts.record_shot(index, True)
+    for r, c in target.get_all_shot_coords():
+        if not target.is_hit((r, c)):
+            counts.record_shot(r * size + c, False)
+    sunk = list(counts.remaining_lengths)
+    for length in remaining_lengths:
+        sunk.remove(length)
+    for length in sunk:
+        counts.retire_length(length)
+
+    if isinstance(player, MonteCarloAIPlayer):
+        player.sample_count, budget = reader.unpack(MONTE_CARLO_HEADER)
+        player.time_budget = None if budget < 0 else budget
+        player.resolved_cells = set(reader.indexes())
+
+
+def dump_player(player: Player) -> bytes:
+    """
+    Encode l'état complet d'un joueur (HumanPlayer, AIPlayer, MonteCarloAIPlayer ou RandomPlayer).
+
+    Raises:
+        TypeError: Si le type de joueur n'est pas pris en charge.
+    """
+    kind = PLAYER_KINDS.get(type(player))
+    if kind is None:
+        raise TypeError(f"Instantané non pris en charge pour {type(player).__name__}")
+    out = _Writer()
+    size = player.own_board.size
+    has_rng = isinstance(player.rng, random.Random)
+    out.pack(PLAYER_HEADER, kind, size, has_rng)
+    out.text(player.name)
+    _write_board(out, player.own_board)
+    _write_board(out, player.target_board)
+    # Les navires de la flotte : index dans own_board.ships, ou nom et longueur s'il n'est pas placé
+    placed = {id(ship): i for i, ship in enumerate(player.own_board.ships)}
+    out.pack(U8, len(player.ships_to_place))
+    for ship in player.ships_to_place:
+        index = placed.get(id(ship), NONE)
+        out.pack(U8, index)
+        if index == NONE:
+            out.pack(U8, ship.length)
+            out.text(ship.name)
+    if isinstance(player, AIPlayer):
+        _write_ai(out, player)
+    elif isinstance(player, RandomPlayer):
+        shots = player._shots_order
+        out.coords(shots.removed if isinstance(shots, SparseCoordinateSet) else shots, size)
+    if has_rng:
+        _write_rng(out, player.rng) # En dernier : l'état au moment de l'instantané
+    return bytes(out.data)
+
+
+def load_player(data: bytes, events: Optional[EventBus] = None) -> Player:
+    """Recrée un joueur à partir de dump_player ; il publie sur `events` (un bus vide par défaut)."""
+    return _read_player(_Reader(data), events if events is not None else EventBus())
+
+
+def _read_player(reader: _Reader, events: EventBus) -> Player:
+    kind, size, has_rng = reader.unpack(PLAYER_HEADER)
+    name = reader.text()
+    # Générateur jetable pendant la construction : le générateur global n'est pas consommé
+    player = PLAYER_CLASSES[kind](name=name, board_size=size, events=events, rng=random.Random(0))
+    player.own_board = _read_board(reader, events)
+    player.target_board = _read_board(reader, events)
+    (ship_count,) = reader.unpack(U8)
+    fleet = []
+    for _ in range(ship_count):
+        (index,) = reader.unpack(U8)
+        if index == NONE:
+            (length,) = reader.unpack(U8)
+            fleet.append(Ship(reader.text(), length))
+        else:
+            fleet.append(player.own_board.ships[index])
+    player.ships_to_place = fleet
+    if isinstance(player, AIPlayer):
+        _read_ai(reader, player)
+    elif isinstance(player, RandomPlayer):
+        if isinstance(player._shots_order, SparseCoordinateSet):
+            player._shots_order = SparseCoordinateSet(size, reader.coords(size))
+        else:
+            player._shots_order = reader.coords(size)
+    player.rng = _read_rng(reader) if has_rng else random
+    return player
+
+
+# --- Parties --------------------------------------------------------------------------
+
+def dump_game(game: Game) -> bytes:
+    """Encode une partie complète : les deux joueurs et le joueur dont c'est le tour."""
+    out = _Writer()
+    out.pack(GAME_HEADER, MAGIC, VERSION, 0 if game.current_player is game.player_human else 1, 0)
+    out.blob(dump_player(game.player_human))
+    out.blob(dump_player(game.player_ai))
+    return bytes(out.data)
+
+
+def load_game(data: bytes, events: Optional[EventBus] = None, recorder=None) -> Game:
+    """
+    Recrée une partie à partir de dump_game.
+
+    Args:
+        data (bytes): L'instantané.
+        events (EventBus, optional): Le bus de la partie recréée (par défaut, un bus sans abonné).
+        recorder (GameRecordWriter, optional): L'enregistrement où poursuivre la partie.
+
+    Raises:
+        ValueError: Si les données ne sont pas un instantané de partie de cette version.
+    """
+    reader = _Reader(data)
+    magic, version, current, _ = reader.unpack(GAME_HEADER)
+    if magic != MAGIC:
+        raise ValueError("Ces données ne sont pas un instantané de partie.")
+    if version != VERSION:
+        raise ValueError(f"Version d'instantané non prise en charge : {version}")
+    events = events if events is not None else EventBus()
+    human = load_player(reader.blob(), events)
+    ai = load_player(reader.blob(), events)
+
+    return Game.from_players(human, ai, events=events, recorder=recorder, current=current)
+
+
+def fork_game(game: Game, events: Optional[EventBus] = None) -> Game:
+    """Une copie indépendante de la partie (pour explorer une variante sans toucher l'original)."""
+    return load_game(dump_game(game), events)
@@ -0,0 +1,254 @@
+"""
+Plateau creux pour les très grandes grilles.
+
+Un Board classique garde ses couches sous forme de bitboards : chaque tir recrée un entier
+de size * size bits, et les tables de placements partagées ont une taille proportionnelle
+à la surface. Sur une grille 1000 x 1000, c'est la surface qui coûte, alors que presque
+toutes les cases sont de l'eau jamais visée.
+
+SparseBoard offre la même API mais ne stocke que les cases de navire et les cases tirées,
+dans des ensembles d'index : la mémoire et le coût d'un tir ne dépendent que du nombre de
+navires et de tirs, pas de la surface.
+"""
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+from .board import Board
+from .events import EventBus, ShipHit, ShipSunk
+from .placements import LARGE_BOARD_SIZE, placements_for
+from .utils import iter_bits
+
+# Taille de plateau à partir de laquelle make_board choisit le stockage creux
+SPARSE_BOARD_MIN_SIZE = LARGE_BOARD_SIZE
+
+
+def _indexes_to_mask(indexes: Iterable[int]) -> int:
+    mask = 0
+    for index in indexes:
+        mask |= 1 << index
+    return mask
+
+
+class SparseBoard(Board):
+    """
+    Plateau de jeu dont l'état est stocké dans des ensembles d'index (r * size + c).
+
+    Les attributs ship_bits, hit_bits et miss_bits restent disponibles pour la compatibilité,
+    mais sont recalculés à chaque lecture (coût proportionnel à la surface) : le code sensible
+    aux performances passe par get_cell, is_shot, is_hit et hit_indexes.
+
+    Attributes:
+        ship_cells (set): Index des cases occupées par un navire (touché ou non).
+        hit_cells (set): Index des tirs ayant touché ('X').
+        miss_cells (set): Index des tirs dans l'eau ('O').
+    """
+
+    def __init__(self, size=10, name="Board", events: Optional[EventBus] = None):
+        self.ship_cells: Set[int] = set()
+        self.hit_cells: Set[int] = set()
+        self.miss_cells: Set[int] = set()
+        super().__init__(size, name, events)
+
+    # Couches sous forme de masques, pour le code écrit pour les bitboards
+    @property
+    def ship_bits(self) -> int:
+        return _indexes_to_mask(self.ship_cells)
+
+    @ship_bits.setter
+    def ship_bits(self, mask: int):
+        self.ship_cells = set(iter_bits(mask))
+
+    @property
+    def hit_bits(self) -> int:
+        return _indexes_to_mask(self.hit_cells)
+
+    @hit_bits.setter
+    def hit_bits(self, mask: int):
+        self.hit_cells = set(iter_bits(mask))
+
+    @property
+    def miss_bits(self) -> int:
+        return _indexes_to_mask(self.miss_cells)
+
+    @miss_bits.setter
+    def miss_bits(self, mask: int):
+        self.miss_cells = set(iter_bits(mask))
+
+    def _index(self, coord: Tuple[int, int]) -> int:
+        r, c = coord
+        if not (0 <= r < self.size and 0 <= c < self.size):
+            raise IndexError("grid index out of range")
+        return r * self.size + c
+
+    def get_cell(self, coord: Tuple[int, int]) -> str:
+        """Retourne le symbole de la case (row, col)."""
+        index = self._index(coord)
+        if index in self.hit_cells:
+            return 'X'
+        if index in self.miss_cells:
+            return 'O'
+        if index in self.ship_cells:
+            return 'S'
+        return '~'
+
+    def set_cell(self, coord: Tuple[int, int], symbol: str):
+        """Écrit un symbole dans une case (voir Board.set_cell)."""
+        index = self._index(coord)
+        if symbol == 'X':
+            self.hit_cells.add(index)
+            self.miss_cells.discard(index)
+        elif symbol == 'O':
+            self.miss_cells.add(index)
+            self.hit_cells.discard(index)
+        elif symbol == 'S':
+            self.ship_cells.add(index)
+            self.hit_cells.discard(index)
+            self.miss_cells.discard(index)
+        elif symbol == '~':
+            self.ship_cells.discard(index)
+            self.hit_cells.discard(index)
+            self.miss_cells.discard(index)
+        else:
+            raise ValueError(f"Symbole de case inconnu : {symbol!r}")
+
+    def mark_shot(self, shot_coord: Tuple[int, int], result: str):
+        """Note sur ce plateau (de cible) le résultat d'un tir."""
+        index = shot_coord[0] * self.size + shot_coord[1]
+        if result == 'hit' or result == 'sunk':
+            self.hit_cells.add(index)
+        elif result == 'miss':
+            self.miss_cells.add(index)
+
+    def is_shot(self, coord: Tuple[int, int]) -> bool:
+        index = coord[0] * self.size + coord[1]
+        return index in self.hit_cells or index in self.miss_cells
+
+    def is_hit(self, coord: Tuple[int, int]) -> bool:
+        return coord[0] * self.size + coord[1] in self.hit_cells
+
+    def hit_indexes(self):
+        return sorted(self.hit_cells)
+
+    def miss_indexes(self):
+        return sorted(self.miss_cells)
+
+    def _placement_indexes(self, start_coord: Tuple[int, int], length: int, orientation: str) -> Optional[Sequence[int]]:
+        """Index des cases d'un navire posé à start_coord, ou None s'il sort du plateau."""
+        table = placements_for(self.size, length)
+        pid = table.find(start_coord, orientation)
+        return None if pid is None else table.cells[pid]
+
+    def placement_mask(self, start_coord: Tuple[int, int], length: int, orientation: str) -> int:
+        indexes = self._placement_indexes(start_coord, length, orientation)
+        return 0 if indexes is None else _indexes_to_mask(indexes)
+
+    def ship_placement_coords(self, start_coord: Tuple[int, int], length: int,
+                              orientation: str) -> Optional[List[Tuple[int, int]]]:
+        indexes = self._placement_indexes(start_coord, length, orientation)
+        if indexes is None:
+            return None # Hors limites
+        for index in indexes:
+            if index in self.ship_cells or index in self.hit_cells:
+                return None # Case déjà occupée
+        return [divmod(index, self.size) for index in indexes]
+
+    def is_valid_placement_preview(self, ship, start_coord: Tuple[int, int], orientation: str) -> bool:
+        indexes = self._placement_indexes(start_coord, ship.length, orientation)
+        if indexes is None:
+            return False
+        return not any(index in self.ship_cells for index in indexes)
+
+    def place_ship(self, ship, start_coord: Tuple[int, int], orientation: str) -> bool:
+        """Tente de placer un navire sur le plateau (voir Board.place_ship)."""
+        potential_coords = self.ship_placement_coords(start_coord, ship.length, orientation)
+        if potential_coords is None:
+            return False
+
+        ship_id = len(self.ships)
+        for part, (r, c) in enumerate(potential_coords):
+            index = r * self.size + c
+            self.ship_cells.add(index)
+            self.cell_to_ship[index] = (ship_id, part)
+
+        ship.coordinates = potential_coords
+        self.ships.append(ship)
+        self.remaining_ship_cells += ship.remaining
+        return True
+
+    def receive_shot(self, shot_coord: Tuple[int, int]) -> str:
+        """Gère un tir reçu à une coordonnée donnée (voir Board.receive_shot)."""
+        r, c = shot_coord
+        if not (0 <= r < self.size and 0 <= c < self.size):
+            return "invalid"
+
+        index = r * self.size + c
+        if index in self.hit_cells or index in self.miss_cells:
+            return "already_hit"
+
+        if index in self.ship_cells:
+            self.hit_cells.add(index)
+            owner = self.cell_to_ship.get(index)
+            if owner is None:
+                return "hit"
+            ship_id, part = owner
+            hit_ship = self.ships[ship_id]
+            if hit_ship.hit_index(part):
+                self.remaining_ship_cells -= 1
+
+            if hit_ship.is_sunk():
+                self.last_sunk_ship = hit_ship
+                if self.events.sinks:
+                    self.events.emit(ShipSunk(self.name, hit_ship.name, hit_ship.length, shot_coord))
+                return "sunk"
+            if self.events.sinks:
+                self.events.emit(ShipHit(self.name, hit_ship.name, shot_coord))
+            return "hit"
+
+        self.miss_cells.add(index)
+        return "miss"
+
+    def get_all_shot_coords(self) -> List[Tuple[int, int]]:
+        size = self.size
+        return [divmod(index, size) for index in sorted(self.hit_cells | self.miss_cells)]
+
+    def display(self, hide_ships: bool = True):
+        """
+        Affiche la zone du plateau qui contient des tirs (et des navires si hide_ships est
+        False) : seules les lignes de ce rectangle sont construites.
+        """
+        visible = self.hit_cells | self.miss_cells
+        if not hide_ships:
+            visible = visible | self.ship_cells
+        if not visible:
+            print(f"(plateau {self.size}x{self.size} vide)")
+            return
+
+        size = self.size
+        rows = [index // size for index in visible]
+        cols = [index % size for index in visible]
+        r_min, r_max, c_min, c_max = min(rows), max(rows), min(cols), max(cols)
+        if size <= 26:
+            labels = [chr(65 + c) for c in range(c_min, c_max + 1)]
+        else:
+            labels = [str(c + 1) for c in range(c_min, c_max + 1)]
+        width = max(len(label) for label in labels)
+        row_width = len(str(r_max + 1))
+
+        print(f"Lignes {r_min + 1}-{r_max + 1}, colonnes {labels[0]}-{labels[-1]} :")
+        print(" " * (row_width + 1) + " ".join(label.rjust(width) for label in labels))
+        for r in range(r_min, r_max + 1):
+            row_display = [str(r + 1).ljust(row_width)]
+            for c in range(c_min, c_max + 1):
+                cell = self.get_cell((r, c))
+                if hide_ships and cell == 'S':
+                    cell = '~'
+                row_display.append(cell.rjust(width))
+            print(" ".join(row_display))
+
+
+def make_board(size: int = 10, name: str = "Board", events: Optional[EventBus] = None) -> Board:
+    """
+    Crée un plateau avec le stockage adapté à sa taille : bitboards jusqu'à
+    SPARSE_BOARD_MIN_SIZE exclu, ensembles creux au-delà.
+    """
+    board_cls = SparseBoard if size >= SPARSE_BOARD_MIN_SIZE else Board
+    return board_cls(size, name=name, events=events)
@@ -0,0 +1,183 @@
+"""
+Solveur de ciblage par grappes de hits.
+
+Les hits non encore attribués à un navire coulé sont regroupés en grappes (composantes
+4-connexes). Pour une grappe, on énumère les placements des navires encore à flot qui
+passent par au moins un de ses hits, sans toucher de case manquée ni de navire coulé :
+ils restent tous dans une fenêtre locale (le rectangle de la grappe élargi de la longueur
+du plus grand navire), si bien que le coût d'un coup ne dépend que de la taille de la
+grappe, pas du plateau ni de l'historique. Chaque case non tirée reçoit la somme des
+poids des placements qui la couvrent ; un placement qui explique plus de hits pèse plus
+lourd (carré du nombre de hits couverts), ce qui prolonge naturellement les lignes sans
+exclure un navire voisin collé.
+
+Quand un navire est coulé, ses cases sont retirées des hits non résolus : les hits d'un
+navire voisin restent dans leur grappe et continuent d'être ciblés.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+Coord = Tuple[int, int]
+
+
+class ClusterTargetSolver:
+    """
+    Hits non résolus et cases des navires coulés, et choix du prochain tir de ciblage.
+
+    Attributes:
+        size (int): La taille du plateau de cible.
+        unresolved (set): Les hits pas encore attribués à un navire coulé.
+        resolved (set): Les cases des navires coulés.
+        placements_evaluated (int): Nombre total de placements examinés par cluster_scores.
+        cells_evaluated (int): Nombre total de cases de ces placements.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self.unresolved: Set[Coord] = set()
+        self.resolved: Set[Coord] = set()
+        self.placements_evaluated = 0
+        self.cells_evaluated = 0
+
+    def record_hit(self, coord: Coord):
+        if coord not in self.resolved:
+            self.unresolved.add(coord)
+
+    def record_sunk(self, coord: Coord, length: int) -> List[Coord]:
+        """
+        Attribue le navire coulé par le tir en `coord` à un placement de `length` hits non
+        résolus passant par ce tir, et retourne ses cases. Parmi plusieurs placements
+        possibles (navires collés), on préfère celui dont le tir est une extrémité (la ligne
+        que l'on prolongeait), puis le plus aligné avec les autres hits. Sans placement
+        possible, seule la case du tir est retirée.
+        """
+        self.record_hit(coord)
+        candidates = [cells for cells in self._placements_through(coord, length)
+                      if all(cell in self.unresolved for cell in cells)]
+        if candidates:
+            cells = max(candidates, key=lambda cells: (coord in (cells[0], cells[-1]),
+                                                       self._line_run(coord, cells)))
+        else:
+            cells = [coord]
+        for cell in cells:
+            self.unresolved.discard(cell)
+            self.resolved.add(cell)
+        return cells
+
+    def _placements_through(self, coord: Coord, length: int) -> Iterable[List[Coord]]:
+        r, c = coord
+        size = self.size
+        for start in range(max(0, c - length + 1), min(c, size - length) + 1):
+            yield [(r, start + i) for i in range(length)]
+        for start in range(max(0, r - length + 1), min(r, size - length) + 1):
+            yield [(start + i, c) for i in range(length)]
+
+    def _line_run(self, coord: Coord, cells: List[Coord]) -> int:
+        """Nombre de hits non résolus alignés avec le placement, au-delà de ses extrémités."""
+        horizontal = len(cells) > 1 and cells[0][0] == cells[1][0]
+        dr, dc = (0, 1) if horizontal else (1, 0)
+        run = 0
+        for (r, c), sign in ((cells[-1], 1), (cells[0], -1)):
+            r, c = r + sign * dr, c + sign * dc
+            while (r, c) in self.unresolved:
+                run += 1
+                r, c = r + sign * dr, c + sign * dc
+        return run
+
+    def clusters(self) -> List[List[Coord]]:
+        """Les grappes de hits non résolus, les plus grandes d'abord (cases triées)."""
+        seen: Set[Coord] = set()
+        clusters = []
+        for start in sorted(self.unresolved):
+            if start in seen:
+                continue
+            seen.add(start)
+            stack, cluster = [start], []
+            while stack:
+                r, c = stack.pop()
+                cluster.append((r, c))
+                for neighbour in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                    if neighbour in self.unresolved and neighbour not in seen:
+                        seen.add(neighbour)
+                        stack.append(neighbour)
+            clusters.append(sorted(cluster))
+        clusters.sort(key=lambda cluster: (-len(cluster), cluster[0]))
+        return clusters
+
+    def cluster_scores(self, cluster: List[Coord], target_board, remaining_lengths: Iterable[int],
+                       scores: Optional[Dict[Coord, int]] = None) -> Dict[Coord, int]:
+        """
+        Poids de chaque case non tirée de la fenêtre de la grappe : somme, sur les placements
+        valides des navires restants qui couvrent au moins un hit non résolu, de
+        multiplicité x (hits couverts)².
+
+        Args:
+            cluster (list): Les hits de la grappe.
+            target_board (Board): Le plateau de cible (cases tirées).
+            remaining_lengths (iterable): Les longueurs des navires encore à flot (avec répétitions).
+            scores (dict, optional): Des poids à compléter (pour cumuler plusieurs grappes).
+        """
+        scores = {} if scores is None else scores
+        size = self.size
+        unresolved = self.unresolved
+        rows = [r for r, _ in cluster]
+        cols = [c for _, c in cluster]
+        r0, r1, c0, c1 = min(rows), max(rows), min(cols), max(cols)
+
+        for length, multiplicity in Counter(remaining_lengths).items():
+            # Placements horizontaux sur les lignes de la grappe, verticaux sur ses colonnes
+            spans = [(r, start, 0, 1) for r in range(r0, r1 + 1)
+                     for start in range(max(0, c0 - length + 1), min(c1, size - length) + 1)]
+            if length > 1:
+                spans += [(start, c, 1, 0) for c in range(c0, c1 + 1)
+                          for start in range(max(0, r0 - length + 1), min(r1, size - length) + 1)]
+            self.placements_evaluated += len(spans)
+            self.cells_evaluated += len(spans) * length
+            for r, c, dr, dc in spans:
+                covered = 0
+                free = []
+                for i in range(length):
+                    cell = (r + i * dr, c + i * dc)
+                    if cell in unresolved:
+                        covered += 1
+                    elif target_board.is_shot(cell):
+                        break # Case manquée ou navire coulé
+                    else:
+                        free.append(cell)
+                else:
+                    if covered:
+                        weight = multiplicity * covered * covered
+                        for cell in free:
+                            scores[cell] = scores.get(cell, 0) + weight
+        return scores
+
+    def best_targets(self, target_board, remaining_lengths: List[int],
+                     all_clusters: bool = False) -> List[Coord]:
+        """
+        Les cases de poids maximal (triées), pour la plus grande grappe qui en a, ou pour
+        toutes les grappes réunies si `all_clusters` est vrai. Une grappe qu'aucun placement
+        n'explique (observations incohérentes) est abandonnée : ses hits sont considérés
+        comme résolus. Retourne une liste vide s'il n'y a plus de hit non résolu.
+        """
+        while self.unresolved:
+            clusters = self.clusters()
+            if all_clusters:
+                scores: Dict[Coord, int] = {}
+                for cluster in clusters:
+                    self.cluster_scores(cluster, target_board, remaining_lengths, scores)
+                if scores:
+                    return _argmax(scores)
+                dead = [cell for cluster in clusters for cell in cluster]
+            else:
+                scores = self.cluster_scores(clusters[0], target_board, remaining_lengths)
+                if scores:
+                    return _argmax(scores)
+                dead = clusters[0]
+            for cell in dead:
+                self.unresolved.discard(cell)
+                self.resolved.add(cell)
+        return []
+
+
+def _argmax(scores: Dict[Coord, int]) -> List[Coord]:
+    best = max(scores.values())
+    return sorted(cell for cell, score in scores.items() if score == best)
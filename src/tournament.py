@@ -0,0 +1,305 @@
+"""
+Tournoi toutes rondes entre stratégies d'IA, avec classement Bradley-Terry.
+
+Chaque paire de participants joue des lots de parties dans un pool de processus (le
+premier joueur alterne d'une partie à l'autre). Une paire s'arrête dès que l'intervalle de
+confiance de son taux de victoire exclut 50 %, ou au bout de `max_games` parties.
+Les classements sont exprimés sur l'échelle Elo (400 * log10 de la force Bradley-Terry),
+avec des intervalles de confiance obtenus par bootstrap paramétrique.
+
+Les lots sont comptés dans l'ordre de leur numéro et chaque partie a ses propres flux
+aléatoires : avec une graine racine, le résultat ne dépend pas du nombre de processus.
+"""
+import math
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .rng import derive_seed
+from .simulation import PlayerSpec, _run_chunk
+
+
+class Entrant(NamedTuple):
+    """Un participant : un nom et la description du joueur (classe, arguments)."""
+    name: str
+    spec: PlayerSpec
+
+
+class PairingResult:
+    """
+    Bilan d'une paire de participants.
+
+    Attributes:
+        a (int), b (int): Les index des deux participants.
+        wins_a (int), wins_b (int): Les victoires de chacun.
+        stopped_early (bool): La paire a été arrêtée avant max_games parce que le résultat était clair.
+    """
+    def __init__(self, a: int, b: int):
+        self.a = a
+        self.b = b
+        self.wins_a = 0
+        self.wins_b = 0
+        self.stopped_early = False
+
+    @property
+    def games(self) -> int:
+        return self.wins_a + self.wins_b
+
+    def score_a(self) -> float:
+        """Taux de victoire de a."""
+        return self.wins_a / self.games if self.games else 0.5
+
+    def is_decided(self, z: float) -> bool:
+        """L'intervalle normal à `z` écarts-types autour du taux de victoire de a exclut 0.5."""
+        if not self.games:
+            return False
+        p = self.score_a()
+        # Écart-type sous l'hypothèse d'égalité : ne dépend pas du taux observé
+        margin = z * 0.5 / math.sqrt(self.games)
+        return abs(p - 0.5) > margin
+
+
+def bradley_terry(names: Sequence[str], wins: Dict[Tuple[int, int], int],
+                  iterations: int = 1000, tolerance: float = 1e-9, prior: float = 0.5) -> List[float]:
+    """
+    Forces Bradley-Terry par l'algorithme MM (Hunter, 2004), sur l'échelle Elo et centrées sur 0.
+
+    Args:
+        names: Les participants (seul leur nombre est utilisé).
+        wins: wins[(i, j)] = nombre de victoires de i contre j.
+        prior (float): Victoires fictives ajoutées de chaque côté de chaque paire jouée, pour
+                       que les forces restent finies quand un participant gagne tout.
+
+    Returns:
+        List[float]: Le classement Elo de chaque participant (moyenne nulle).
+    """
+    n = len(names)
+    w = [[0.0] * n for _ in range(n)]
+    for (i, j), count in wins.items():
+        w[i][j] += count
+    for i in range(n):
+        for j in range(i + 1, n):
+            if w[i][j] + w[j][i] > 0:
+                w[i][j] += prior
+                w[j][i] += prior
+
+    strength = [1.0] * n
+    for _ in range(iterations):
+        updated = []
+        for i in range(n):
+            total_wins = sum(w[i])
+            denominator = sum((w[i][j] + w[j][i]) / (strength[i] + strength[j])
+                              for j in range(n) if j != i)
+            updated.append(total_wins / denominator if denominator > 0 else strength[i])
+        # Normalisation : la moyenne géométrique reste à 1
+        log_mean = sum(math.log(s) for s in updated if s > 0) / n
+        updated = [s / math.exp(log_mean) if s > 0 else s for s in updated]
+        change = max(abs(u - s) for u, s in zip(updated, strength))
+        strength = updated
+        if change < tolerance:
+            break
+    return [400.0 * math.log10(s) if s > 0 else float("-inf") for s in strength]
+
+
+class TournamentResult:
+    """
+    Résultats d'un tournoi.
+
+    Attributes:
+        entrants (list): Les participants.
+        pairings (list of PairingResult): Le bilan de chaque paire.
+        ratings (list of float): Le classement Elo de chaque participant.
+        intervals (list of tuple): L'intervalle de confiance (bas, haut) de chaque classement.
+    """
+    def __init__(self, entrants: List[Entrant], pairings: List[PairingResult],
+                 ratings: List[float], intervals: List[Tuple[float, float]]):
+        self.entrants = entrants
+        self.pairings = pairings
+        self.ratings = ratings
+        self.intervals = intervals
+
+    def standings(self) -> List[Tuple[str, float, float, float]]:
+        """(nom, classement, bas, haut) pour chaque participant, du meilleur au moins bon."""
+        rows = [(entrant.name, rating, low, high)
+                for entrant, rating, (low, high) in zip(self.entrants, self.ratings, self.intervals)]
+        return sorted(rows, key=lambda row: -row[1])
+
+    def as_dict(self) -> Dict:
+        """Résumé sérialisable en JSON."""
+        return {
+            "standings": [
+                {"name": name, "rating": rating, "low": low, "high": high}
+                for name, rating, low, high in self.standings()
+            ],
+            "pairings": [
+                {
+                    "a": self.entrants[p.a].name,
+                    "b": self.entrants[p.b].name,
+                    "wins": [p.wins_a, p.wins_b],
+                    "stopped_early": p.stopped_early,
+                }
+                for p in self.pairings
+            ],
+        }
+
+    def format_table(self) -> str:
+        """Tableau texte des classements et des confrontations."""
+        lines = ["Classement (Elo, intervalle de confiance) :"]
+        for rank, (name, rating, low, high) in enumerate(self.standings(), 1):
+            lines.append(f"{rank:>2}. {name:<30} {rating:>7.0f}  [{low:>6.0f}, {high:>6.0f}]")
+        lines.append("Confrontations :")
+        for p in self.pairings:
+            early = " (arrêt anticipé)" if p.stopped_early else ""
+            lines.append(f"    {self.entrants[p.a].name} {p.wins_a} - {p.wins_b} "
+                         f"{self.entrants[p.b].name}{early}")
+        return "\n".join(lines)
+
+
+def _wins_matrix(pairings: List[PairingResult]) -> Dict[Tuple[int, int], int]:
+    wins = {}
+    for p in pairings:
+        wins[(p.a, p.b)] = p.wins_a
+        wins[(p.b, p.a)] = p.wins_b
+    return wins
+
+
+def _confidence_intervals(entrants: List[Entrant], pairings: List[PairingResult],
+                          confidence: float, resamples: int, rng: random.Random) -> List[Tuple[float, float]]:
+    """Intervalles par bootstrap paramétrique : chaque paire est rejouée selon son taux observé."""
+    names = [entrant.name for entrant in entrants]
+    samples: List[List[float]] = [[] for _ in entrants]
+    for _ in range(resamples):
+        wins = {}
+        for p in pairings:
+            # Taux lissé (comme le prior de bradley_terry) : un 40-0 n'est pas une certitude
+            rate = (p.wins_a + 0.5) / (p.games + 1.0)
+            wins_a = sum(1 for _ in range(p.games) if rng.random() < rate)
+            wins[(p.a, p.b)] = wins_a
+            wins[(p.b, p.a)] = p.games - wins_a
+        for i, rating in enumerate(bradley_terry(names, wins, iterations=200, tolerance=1e-6)):
+            samples[i].append(rating)
+
+    tail = (1.0 - confidence) / 2
+    intervals = []
+    for ratings in samples:
+        if not ratings:
+            intervals.append((0.0, 0.0))
+            continue
+        ratings.sort()
+        low = ratings[int(tail * (len(ratings) - 1))]
+        high = ratings[int(math.ceil((1.0 - tail) * (len(ratings) - 1)))]
+        intervals.append((low, high))
+    return intervals
+
+
+def run_tournament(entrants: Sequence[Entrant],
+                   board_size: int = 10,
+                   max_games: int = 400,
+                   min_games: int = 40,
+                   batch_size: int = 20,
+                   stop_z: float = 3.0,
+                   workers: Optional[int] = None,
+                   seed: Optional[int] = None,
+                   confidence: float = 0.95,
+                   resamples: int = 200) -> TournamentResult:
+    """
+    Fait jouer chaque paire de participants, puis calcule les classements.
+
+    Args:
+        entrants: Les participants (au moins deux).
+        board_size (int): La taille des plateaux.
+        max_games (int): Nombre maximum de parties par paire.
+        min_games (int): Nombre de parties avant de pouvoir arrêter une paire.
+        batch_size (int): Nombre de parties par lot envoyé à un processus.
+        stop_z (float): Une paire s'arrête quand son taux de victoire s'écarte de 0.5 de plus
+                        de stop_z écarts-types (3 : moins de 0.3 % de faux arrêts par examen).
+        workers (int, optional): Nombre de processus (par défaut, le nombre de CPU).
+        seed (int, optional): Graine racine ; chaque paire en dérive la graine de ses parties.
+        confidence (float): Niveau des intervalles de confiance des classements.
+        resamples (int): Nombre de tirages du bootstrap.
+
+    Returns:
+        TournamentResult: Les bilans des paires et les classements.
+    """
+    entrants = list(entrants)
+    if len(entrants) < 2:
+        raise ValueError("Un tournoi demande au moins deux participants.")
+    pairings = [PairingResult(a, b) for a in range(len(entrants)) for b in range(a + 1, len(entrants))]
+    batches_per_pairing = math.ceil(max_games / batch_size)
+    # Lots en cours par paire : au moins deux (un lot se prépare pendant qu'on compte l'autre),
+    # et davantage quand il y a moins de paires que de processus, pour les occuper tous
+    worker_count = workers or os.cpu_count() or 1
+    in_flight = max(2, math.ceil(worker_count / len(pairings)))
+
+    def task(pairing_index: int, batch_index: int):
+        pairing = pairings[pairing_index]
+        start = batch_index * batch_size
+        count = min(batch_size, max_games - start)
+        pairing_seed = None if seed is None else derive_seed(seed, pairing_index)
+        return (start, count, pairing_seed, entrants[pairing.a].spec, entrants[pairing.b].spec, board_size, False, False)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        submitted = [0] * len(pairings)
+        # Lots terminés mais pas encore comptés (on compte dans l'ordre des numéros de lot)
+        pending: List[Dict[int, object]] = [{} for _ in pairings]
+        counted = [0] * len(pairings)
+        finished = [False] * len(pairings)
+
+        def submit_more(pairing_index: int):
+            while (submitted[pairing_index] < batches_per_pairing
+                   and submitted[pairing_index] - counted[pairing_index] < in_flight):
+                batch_index = submitted[pairing_index]
+                future = executor.submit(_run_chunk, task(pairing_index, batch_index))
+                futures[future] = (pairing_index, batch_index)
+                submitted[pairing_index] += 1
+
+        for pairing_index in range(len(pairings)):
+            submit_more(pairing_index)
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                pairing_index, batch_index = futures.pop(future)
+                if finished[pairing_index]:
+                    continue
+                pending[pairing_index][batch_index] = future.result()[0]
+                pairing = pairings[pairing_index]
+                while counted[pairing_index] in pending[pairing_index]:
+                    stats = pending[pairing_index].pop(counted[pairing_index])
+                    pairing.wins_a += stats.wins[0]
+                    pairing.wins_b += stats.wins[1]
+                    counted[pairing_index] += 1
+                    if pairing.games >= min_games and pairing.is_decided(stop_z):
+                        pairing.stopped_early = counted[pairing_index] < batches_per_pairing
+                        finished[pairing_index] = True
+                        break
+                if counted[pairing_index] >= batches_per_pairing:
+                    finished[pairing_index] = True
+                if finished[pairing_index]:
+                    # Les lots encore en cours de cette paire seront ignorés
+                    for other, (index, _) in list(futures.items()):
+                        if index == pairing_index:
+                            other.cancel()
+                else:
+                    submit_more(pairing_index)
+
+    names = [entrant.name for entrant in entrants]
+    ratings = bradley_terry(names, _wins_matrix(pairings))
+    intervals = _confidence_intervals(entrants, pairings, confidence, resamples, random.Random(seed))
+    return TournamentResult(entrants, pairings, ratings, intervals)
+
+
+if __name__ == "__main__":
+    from .ai_player import AIPlayer
+    from .monte_carlo_ai import MonteCarloAIPlayer
+    from .simulation import RandomPlayer
+
+    lineup = [
+        Entrant("IA (par défaut)", (AIPlayer, {})),
+        Entrant("IA (fin de jeu à 5 PV)", (AIPlayer, {"endgame_threshold": 5})),
+        Entrant("IA Monte Carlo", (MonteCarloAIPlayer, {"sample_count": 100, "time_budget": 0.01})),
+        Entrant("Aléatoire", (RandomPlayer, {})),
+    ]
+    print(run_tournament(lineup, seed=0).format_table())
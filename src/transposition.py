@@ -0,0 +1,143 @@
+"""
+Table de transposition des positions de chasse de l'IA.
+
+Les positions se répètent beaucoup d'une partie à l'autre : chaque partie commence sur
+un plateau de cible vide, et une simulation repasse sans cesse par les mêmes débuts de
+partie. Une position est identifiée par un hachage de Zobrist de (cases tirées avec leur
+résultat, longueurs des navires encore à flot), tenu à jour incrémentalement à chaque
+tir par PlacementCounts : un XOR par tir ou par navire coulé.
+
+La table garde, pour chaque position, ce que la chasse de l'IA en a tiré : la densité
+maximale et les cases qui l'atteignent (en index plats). C'est tout ce que la chasse lit
+de la grille de densité ; la grille complète, de la taille du plateau, n'est pas gardée.
+La table est bornée à la fois en positions (`max_entries`) et en octets estimés
+(`max_bytes`) : les positions les moins récemment utilisées sont oubliées. Par défaut,
+toutes les IA d'un même processus partagent la table de shared_table().
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from .rng import derive_seed
+
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Coût estimé d'une position gardée, hors résultat : nœud de l'OrderedDict, clé et n-uplet du résultat
+ENTRY_OVERHEAD_BYTES = 200
+
+
+def zobrist_key(*path) -> int:
+    """
+    La clé de Zobrist (64 bits) d'un élément de position, par exemple ("cell", index, hit)
+    ou ("ship", longueur, rang). Identique dans tous les processus.
+    """
+    return derive_seed("zobrist", *path)
+
+
+class TranspositionTable:
+    """
+    Cache LRU borné : hachage de position -> résultat calculé.
+
+    Attributes:
+        max_entries (int): Nombre maximal de positions gardées (0 : rien n'est gardé).
+        max_bytes (int): Taille estimée maximale des positions gardées, en octets.
+        hits (int): Nombre de recherches qui ont trouvé la position.
+        misses (int): Nombre de recherches qui ne l'ont pas trouvée.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Clé -> (résultat, taille estimée en octets)
+        self._entries: "OrderedDict[Hashable, Tuple[object, int]]" = OrderedDict()
+        self._bytes = 0
+        # Partagée entre les threads d'un processus (serveur, interface Pygame)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """Retourne le résultat gardé pour `key`, ou None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: object, nbytes: int = 0):
+        """
+        Garde un résultat, en oubliant les positions les moins récemment utilisées tant que
+        la table dépasse l'une de ses limites.
+
+        Args:
+            key (Hashable): La position.
+            value (object): Le résultat calculé.
+            nbytes (int): Taille estimée du résultat en octets (ENTRY_OVERHEAD_BYTES s'y ajoute).
+        """
+        cost = ENTRY_OVERHEAD_BYTES + nbytes
+        if self.max_entries <= 0 or cost > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, cost)
+            self._bytes += cost
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._bytes -= self._entries.popitem(last=False)[1][1]
+
+    @property
+    def nbytes(self) -> int:
+        """Taille estimée des positions gardées, en octets."""
+        return self._bytes
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __deepcopy__(self, memo) -> "TranspositionTable":
+        return self # Une IA copiée continue de partager la table
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+_shared_table: Optional[TranspositionTable] = None
+
+
+def shared_table() -> TranspositionTable:
+    """La table partagée par toutes les IA du processus (créée au premier appel)."""
+    global _shared_table
+    if _shared_table is None:
+        _shared_table = TranspositionTable()
+    return _shared_table
@@ -1,4 +1,5 @@
 from typing import Tuple, List, Optional
+from .placements import placements_for
 
 def get_coordinates(input_value, board_size: int = 10, reverse: bool = False) -> Optional[Tuple[int, int]] or str:
     """
@@ -57,24 +58,24 @@ def is_valid_ship_placement(board, start_coord: Tuple[int, int], ship_length: in
     Retourne la liste des coordonnées du navire si valide, sinon None.
     Modifié pour prendre le plateau et vérifier les chevauchements.
     """
-    r_start, c_start = start_coord
-    ship_coords = []
+    # Placement précalculé (None si hors limites ou orientation inconnue)
+    table = placements_for(board.size, ship_length)
+    pid = table.find(start_coord, orientation)
+    if pid is None:
+        return None # Hors limites
 
-    for i in range(ship_length):
-        if orientation == 'H':
-            r, c = r_start, c_start + i
-        else: # 'V'
-            r, c = r_start + i, c_start
+    # Vérifier si une case est déjà occupée par un autre navire ('S' ou 'X' pour touché)
+    # Note: Un navire coulé ('X') doit aussi être considéré comme occupé pour un nouveau placement
+    if table.mask(pid) & (board.ship_bits | board.hit_bits):
+        return None # Case déjà occupée
 
-        # Vérifier si les coordonnées sont dans les limites du plateau
-        if not (0 <= r < board.size and 0 <= c < board.size):
-            return None # Hors limites
+    return list(table.coords[pid]) # Retourne la liste des coordonnées si tout est valide
 
-        # NOUVEAU : Vérifier si la case est déjà occupée par un autre navire ('S' ou 'X' pour touché)
-        # Note: Un navire coulé ('X') doit aussi être considéré comme occupé pour un nouveau placement
-        if board.grid[r][c] == 'S' or board.grid[r][c] == 'X':
-            return None # Case déjà occupée
-
-        ship_coords.append((r, c))
-
-    return ship_coords # Retourne la liste des coordonnées si tout est valide
\ No newline at end of file
+def iter_bits(mask: int):
+    """
+    Itère sur les index des bits à 1 d'un bitboard, du plus faible au plus fort.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
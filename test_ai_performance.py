@@ -4,15 +4,20 @@ Script de test pour évaluer les performances de l'IA améliorée.
 Compare l'IA avec différentes stratégies et calcule les statistiques.
 """
 
-import random
-import time
+import argparse
 from src.ai_player import AIPlayer
-from src.human_player import HumanPlayer
 from src.game import Game
+from src.profiling import AIProfile
+from src.rng import derive_seed, make_rng
+from src.simulation import RandomPlayer, place_random_fleet
+from src.tournament import Entrant, run_tournament
 
-def test_ai_performance(num_games=100):
+def run_ai_performance(num_games=100, seed=None, profile=None):
     """
     Teste les performances de l'IA sur un nombre donné de parties.
+    Avec une graine, chaque partie a ses propres flux aléatoires : la partie N se rejoue
+    à l'identique, seule, avec la même graine. Avec un AIProfile, l'IA y note le temps
+    passé dans chacune de ses phases de décision.
     """
     print(f"🧪 Test des performances de l'IA sur {num_games} parties...")
     
@@ -26,10 +31,13 @@ def test_ai_performance(num_games=100):
         print(f"\n🎮 Partie {game_num}/{num_games}")
         
         # Créer une nouvelle partie
-        game = Game(board_size=10)
+        game_seed = None if seed is None else derive_seed(seed, game_num)
+        game = Game(board_size=10, seed=game_seed)
+        game.player_ai.profile = profile
+        shooter_rng = make_rng(game_seed, "tireur") # Tirs du joueur simulé
         
-        # Placement automatique des navires
-        game.player_human.place_ships()
+        # Placement automatique des navires (HumanPlayer.place_ships attendrait une saisie)
+        place_random_fleet(game.player_human)
         game.player_ai.place_ships()
         game.player_ai.update_untried_coordinates_after_placement()
         
@@ -47,19 +55,15 @@ def test_ai_performance(num_games=100):
                 available_coords = []
                 for r in range(10):
                     for c in range(10):
-                        if opponent.own_board.grid[r][c] == '~':
+                        if opponent.own_board.get_cell((r, c)) == '~':
                             available_coords.append((r, c))
-                shot_coord = random.choice(available_coords)
+                shot_coord = shooter_rng.choice(available_coords)
             
             # Traiter le tir
             result = opponent.own_board.receive_shot(shot_coord)
             
             # Mettre à jour la grille de cible du joueur
-            r, c = shot_coord
-            if result in ['hit', 'sunk']:
-                current_player.target_board.grid[r][c] = 'X'
-            else:
-                current_player.target_board.grid[r][c] = 'O'
+            current_player.target_board.mark_shot(shot_coord, result)
             
             # Informer l'IA du résultat
             if isinstance(current_player, AIPlayer):
@@ -108,9 +112,11 @@ def test_ai_performance(num_games=100):
     
     return ai_wins / num_games
 
-def test_different_strategies():
+def run_different_strategies(max_games=200):
     """
     Teste différentes configurations de l'IA pour trouver la meilleure.
+    Chaque configuration affronte toutes les autres (et un tireur aléatoire de référence)
+    dans un tournoi toutes rondes, puis on compare leurs classements Elo.
     """
     print("🔬 Test de différentes stratégies...")
     
@@ -120,32 +126,44 @@ def test_different_strategies():
         ("Stratégie conservatrice", {"endgame_threshold": 5}),
     ]
     
-    results = {}
-    
-    for strategy_name, config in strategies:
-        print(f"\n🧪 Test de la {strategy_name}...")
-        
-        # Modifier la configuration de l'IA
-        original_threshold = AIPlayer.endgame_threshold if hasattr(AIPlayer, 'endgame_threshold') else 3
-        
-        # Test simple sur 10 parties
-        win_rate = test_ai_performance(10)
-        results[strategy_name] = win_rate
-        
-        print(f"Taux de victoire: {win_rate*100:.1f}%")
+    entrants = [Entrant(name, (AIPlayer, config)) for name, config in strategies]
+    entrants.append(Entrant("Tireur aléatoire", (RandomPlayer, {})))
+    tournament = run_tournament(entrants, max_games=max_games, seed=0)
+    print(tournament.format_table())
+
+    results = {name: rating for name, rating, _, _ in tournament.standings()}
     
     # Trouver la meilleure stratégie
-    best_strategy = max(results.items(), key=lambda x: x[1])
-    print(f"\n🏆 Meilleure stratégie: {best_strategy[0]} ({best_strategy[1]*100:.1f}%)")
+    best_strategy = max(((name, results[name]) for name, _ in strategies), key=lambda x: x[1])
+    print(f"\n🏆 Meilleure stratégie: {best_strategy[0]} (Elo {best_strategy[1]:.0f})")
     
     return results
 
+def test_ai_performance():
+    """L'IA bat largement un tireur aléatoire."""
+    assert run_ai_performance(20, seed=1) >= 0.9
+
+def test_different_strategies():
+    """Toutes les configurations de l'IA se classent devant le tireur aléatoire."""
+    results = run_different_strategies(max_games=40)
+    random_rating = results.pop("Tireur aléatoire")
+    assert all(rating > random_rating for rating in results.values())
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tests de performance de l'IA.")
+    parser.add_argument("--games", type=int, default=50, help="nombre de parties")
+    parser.add_argument("--seed", type=int, default=None, help="graine racine des parties")
+    parser.add_argument("--profile", action="store_true", help="affiche le temps passé dans chaque phase de l'IA")
+    parser.add_argument("--profile-json", metavar="FICHIER",
+                        help="écrit les mesures par phase en JSON dans FICHIER (- pour la sortie standard)")
+    args = parser.parse_args()
+    profile = AIProfile() if args.profile or args.profile_json else None
+
     print("🚀 DÉMARRAGE DES TESTS DE PERFORMANCE DE L'IA")
     print("=" * 50)
     
     # Test principal
-    win_rate = test_ai_performance(50)
+    win_rate = run_ai_performance(args.games, seed=args.seed, profile=profile)
     
     print(f"\n🎯 TAUX DE VICTOIRE GLOBAL: {win_rate*100:.1f}%")
     
@@ -158,5 +176,14 @@ if __name__ == "__main__":
     else:
         print("😞 L'IA a besoin d'amélioration!")
     
+    if args.profile:
+        print(f"\n⏱️ PROFIL DE L'IA:")
+        print(profile.format_table())
+    if args.profile_json == "-":
+        print(profile.to_json())
+    elif args.profile_json:
+        with open(args.profile_json, "w", encoding="utf-8") as f:
+            f.write(profile.to_json())
+    
     print("\n" + "=" * 50)
     print("✅ Tests terminés!") 
\ No newline at end of file
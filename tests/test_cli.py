@@ -0,0 +1,73 @@
+"""Point d'entrée python -m src : commandes, imports paresseux et emplacement des ressources."""
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from src import resources
+from src.__main__ import main
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code, env=None):
+    """Exécute `code` dans un nouvel interpréteur lancé depuis un autre répertoire que le projet."""
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR, **(env or {}))
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                               cwd=os.path.dirname(PROJECT_DIR), env=env, check=True)
+    return completed.stdout.strip()
+
+
+class CommandLineTest(unittest.TestCase):
+    def run_main(self, argv):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main(argv), 0)
+        return output.getvalue()
+
+    def test_simulate_json_is_reproducible(self):
+        argv = ["simulate", "--games", "4", "--a", "ai", "--b", "random", "--size", "8", "--seed", "3", "--json"]
+        summary = json.loads(self.run_main(argv))
+        self.assertEqual(summary["games"], 4)
+        self.assertEqual(sum(summary["wins"]) + summary["forfeits"], 4)
+        self.assertEqual(json.loads(self.run_main(argv)), summary)
+
+    def test_simulate_text_summary(self):
+        lines = self.run_main(["simulate", "--games", "2", "--a", "montecarlo", "--size", "6", "--seed", "1"]).splitlines()
+        self.assertEqual(lines[0], "Parties jouées : 2 (0 par forfait)")
+        self.assertTrue(lines[1].startswith("montecarlo : "))
+        self.assertTrue(lines[2].startswith("random : "))
+
+    def test_bad_arguments_exit_with_usage(self):
+        for argv in ([], ["inconnue"], ["simulate", "--inconnue"], ["simulate", "--a", "personne"]):
+            with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as raised:
+                main(argv)
+            self.assertEqual(raised.exception.code, 2, argv)
+
+    def test_simulate_does_not_import_frontends(self):
+        loaded = run_python(
+            "import sys\n"
+            "from src.__main__ import main\n"
+            "main(['simulate', '--games', '1', '--seed', '0', '--json'])\n"
+            "print(sorted({m.split('.')[0] for m in sys.modules} & {'pygame', 'numpy', 'multiprocessing'}))"
+        ).splitlines()[-1]
+        self.assertEqual(loaded, "[]")
+
+
+class ResourcesTest(unittest.TestCase):
+    def test_assets_are_found_from_any_directory(self):
+        self.assertTrue(os.path.isfile(resources.asset_path("fonts", "Police.ttf")))
+        path = run_python("from src.resources import asset_path; print(asset_path('fonts', 'Police.ttf'))")
+        self.assertEqual(path, os.path.join(PROJECT_DIR, "assets", "fonts", "Police.ttf"))
+
+    def test_environment_variable_moves_the_assets(self):
+        path = run_python("from src.resources import asset_path; print(asset_path('images'))",
+                          env={"BATAILLE_NAVALE_ASSETS": os.path.join(os.sep, "ailleurs")})
+        self.assertEqual(path, os.path.join(os.sep, "ailleurs", "images"))
+
+
+if __name__ == "__main__":
+    unittest.main()
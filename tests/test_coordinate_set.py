@@ -0,0 +1,56 @@
+"""Ensembles indexés des cases non tirées : appartenance, retrait et tirage en temps constant."""
+import collections
+import random
+import unittest
+
+from src.coordinate_set import CoordinateSet, IndexedSet
+
+
+class IndexedSetTest(unittest.TestCase):
+    def test_add_discard_and_remove(self):
+        coords = IndexedSet([(0, 0), (1, 2), (3, 4)])
+        coords.add((1, 2))  # déjà présente
+        self.assertEqual(len(coords), 3)
+        self.assertTrue(coords.discard((0, 0)))
+        self.assertFalse(coords.discard((0, 0)))
+        self.assertNotIn((0, 0), coords)
+        self.assertEqual(sorted(coords), [(1, 2), (3, 4)])
+        self.assertEqual({coords[0], coords[1]}, {(1, 2), (3, 4)})
+        coords.remove((3, 4))
+        with self.assertRaises(ValueError):
+            coords.remove((3, 4))
+        self.assertEqual(list(coords), [(1, 2)])
+
+    def test_choice_is_uniform(self):
+        coords = IndexedSet((r, 0) for r in range(4))
+        rng = random.Random(2)
+        counts = collections.Counter(coords.choice(rng) for _ in range(4000))
+        self.assertEqual(set(counts), set(coords))
+        for count in counts.values():
+            self.assertAlmostEqual(count / 4000, 0.25, delta=0.03)
+
+
+class CoordinateSetTest(unittest.TestCase):
+    def test_remove_until_empty(self):
+        rng = random.Random(5)
+        size = 5
+        coords = CoordinateSet.full_board(size, rng)
+        cells = [(r, c) for r in range(size) for c in range(size)]
+        rng.shuffle(cells)
+        for removed, cell in enumerate(cells):
+            self.assertEqual(set(coords), set(cells[removed:]))
+            self.assertEqual(len(coords), size * size - removed)
+            self.assertTrue(all((r + c) % 2 == 0 for r, c in coords.parity(0)))
+            self.assertTrue(all((r + c) % 2 == 1 for r, c in coords.parity(1)))
+            larger = coords.larger_parity()
+            self.assertGreaterEqual(len(larger), max(len(coords.parity(0)), len(coords.parity(1))))
+            self.assertIn(coords.choice(rng), coords)
+            coords.remove(cell)
+        self.assertFalse(coords)
+        self.assertIsNone(coords.larger_parity())
+        with self.assertRaises(ValueError):
+            coords.remove(cells[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+"""Coups à échéance : l'IA rend toujours un coup valide, et dit jusqu'où sa recherche est allée."""
+import random
+import time
+import unittest
+
+from src.ai_player import (MODE_PARITY, MODE_TARGET, REFINE_COMPLETE, REFINE_FALLBACK, AIPlayer,
+                           _move_deadline)
+
+
+class DeadlineTest(unittest.TestCase):
+    def test_expired_deadline_plays_the_fallback(self):
+        ai = AIPlayer("IA", 10, rng=random.Random(0))
+        untried = set(ai.untried_coordinates)
+        coord = ai.get_shot_coordinates(deadline=time.perf_counter() - 1.0)
+        self.assertIn(coord, untried)
+        self.assertNotIn(coord, ai.untried_coordinates)
+        self.assertEqual((ai.last_refinement, ai.current_mode), (REFINE_FALLBACK, MODE_PARITY))
+        self.assertEqual(sum(coord) % 2, 0)
+
+    def test_generous_budget_completes_the_search(self):
+        ai = AIPlayer("IA", 10, rng=random.Random(0))
+        ai.get_shot_coordinates(budget_ms=10_000)
+        self.assertEqual(ai.last_refinement, REFINE_COMPLETE)
+
+    def test_targeting_is_not_cut_short(self):
+        ai = AIPlayer("IA", 10, rng=random.Random(0))
+        ai.target_board.mark_shot((4, 4), 'hit')
+        ai.process_shot_result((4, 4), 'hit')
+        coord = ai.get_shot_coordinates(budget_ms=10_000)
+        self.assertIn(coord, [(3, 4), (5, 4), (4, 3), (4, 5)])
+        self.assertEqual((ai.last_refinement, ai.current_mode), (REFINE_COMPLETE, MODE_TARGET))
+
+    def test_nearest_deadline_wins(self):
+        self.assertIsNone(_move_deadline(None, None))
+        self.assertEqual(_move_deadline(None, 12.5), 12.5)
+        now = time.perf_counter()
+        self.assertLessEqual(_move_deadline(1000.0, now), now)
+        self.assertLess(_move_deadline(1.0, now + 3600.0), now + 3600.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
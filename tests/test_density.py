@@ -0,0 +1,58 @@
+"""Le moteur de densité NumPy donne la même grille que les compteurs incrémentaux."""
+import random
+import unittest
+
+from src.ai_player import AIPlayer
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def play_against(ai, opponent, shots):
+    """L'IA tire `shots` coups sur la flotte de `opponent` (en restant dans les cases non tirées)."""
+    board = opponent.own_board
+    for _ in range(shots):
+        if board.all_ships_sunk():
+            return
+        coord = ai.get_shot_coordinates(opponent_remaining_hp=board.remaining_ship_cells)
+        result = board.receive_shot(coord)
+        ai.process_shot_result(coord, result, sunk_length=board.last_sunk_ship.length if result == 'sunk' else None)
+
+
+@unittest.skipIf(numpy is None, "NumPy n'est pas installé")
+class DensityEngineTest(unittest.TestCase):
+    def assert_engines_agree(self, ai):
+        ai.probability_engine, ai._density_engine = "python", None
+        expected = ai.probability_grid()
+        ai.probability_engine, ai._density_engine = "numpy", None
+        self.assertEqual(ai.probability_grid(), expected)
+
+    def test_matches_placement_counts_during_games(self):
+        for seed in range(12):
+            rng = random.Random(seed)
+            size = rng.choice([6, 10, 13])
+            ai = AIPlayer("IA", size, rng=rng)
+            opponent = AIPlayer("Cible", size, rng=random.Random(seed + 100))
+            opponent.place_ships()
+            self.assert_engines_agree(ai)
+            for _ in range(6):
+                play_against(ai, opponent, rng.randrange(1, 15))
+                self.assert_engines_agree(ai)
+
+    def test_matches_sparse_counts(self):
+        ai = AIPlayer("IA", 200, rng=random.Random(4))
+        opponent = AIPlayer("Cible", 200, rng=random.Random(5))
+        opponent.place_ships()
+        play_against(ai, opponent, 20)
+        self.assert_engines_agree(ai)
+
+    def test_auto_engine_uses_numpy(self):
+        ai = AIPlayer("IA", 10)
+        self.assertIsNotNone(ai._get_density_engine())
+        self.assertIsNone(AIPlayer("IA", 10, probability_engine="python")._get_density_engine())
+
+
+if __name__ == "__main__":
+    unittest.main()
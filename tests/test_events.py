@@ -0,0 +1,70 @@
+"""Bus d'événements : le moteur publie les tirs, navires touchés et coulés, sans rien afficher lui-même."""
+import contextlib
+import io
+import random
+import unittest
+
+from src.ai_player import AIPlayer
+from src.events import ConsoleSink, EventBus, FleetPlaced, ShipHit, ShipSunk, ShotFired
+from src.game import resolve_shot
+from src.ship import Ship
+
+
+def players(events):
+    shooter = AIPlayer("IA", 6, events=events, rng=random.Random(0))
+    target = AIPlayer("Cible", 6, events=events, rng=random.Random(1))
+    target.own_board.place_ship(Ship("Torpilleur", 2), (0, 0), 'H')
+    return shooter, target
+
+
+class EventBusTest(unittest.TestCase):
+    def test_shots_publish_typed_events(self):
+        events = EventBus()
+        received = []
+        events.subscribe(received.append)
+        shooter, target = players(events)
+        for coord in ((5, 5), (0, 0), (0, 1)):
+            resolve_shot(shooter, target, coord)
+        self.assertEqual(received, [
+            ShotFired("IA", "Cible", (5, 5), "miss"),
+            ShipHit("Cible", "Torpilleur", (0, 0)),
+            ShotFired("IA", "Cible", (0, 0), "hit"),
+            ShipSunk("Cible", "Torpilleur", 2, (0, 1)),
+            ShotFired("IA", "Cible", (0, 1), "sunk"),
+        ])
+
+    def test_unsubscribed_sink_receives_nothing(self):
+        events = EventBus()
+        received = []
+        sink = events.subscribe(received.append)
+        shooter, target = players(events)
+        resolve_shot(shooter, target, (5, 5))
+        events.unsubscribe(sink)
+        resolve_shot(shooter, target, (0, 0))
+        self.assertEqual(received, [ShotFired("IA", "Cible", (5, 5), "miss")])
+        self.assertEqual(events.sinks, [])
+
+    def test_engine_is_silent_without_console_sink(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            shooter, target = players(EventBus())
+            shooter.place_ships()
+            resolve_shot(shooter, target, (0, 0))
+            resolve_shot(shooter, target, (0, 1))
+        self.assertEqual(output.getvalue(), "")
+
+    def test_console_sink_formats_events(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            sink = ConsoleSink()
+            sink(ShotFired("IA", "Cible", (2, 3), "miss"))
+            sink(FleetPlaced("IA", False))
+        self.assertEqual(output.getvalue().splitlines(), [
+            "IA tire en D3.",
+            "ATTENTION: Impossible de placer tous les navires de IA !",
+            "Tous les navires de IA sont placés. Préparez-vous !",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Tirage des flottes : flottes denses, flottes impossibles et placement par les joueurs."""
+import random
+import unittest
+
+from src.ai_player import AIPlayer
+from src.board import Board
+from src.fleet_sampler import FleetPlacementError, sample_fleet
+from src.ship import Ship
+
+
+def assert_valid_layout(test, size, lengths, layout):
+    board = Board(size)
+    test.assertEqual(len(layout), len(lengths))
+    for length, (r, c, orientation) in zip(lengths, layout):
+        test.assertTrue(board.place_ship(Ship("navire", length), (r, c), orientation), (length, r, c, orientation))
+
+
+class SampleFleetTest(unittest.TestCase):
+    def test_dense_feasible_fleets_are_found(self):
+        for size, lengths in ((10, [5] * 20), (10, [4] * 24), (8, [3] * 21), (10, [2] * 50), (7, [4, 4, 3, 3, 3, 2, 2, 2, 2, 2])):
+            for seed in range(3):
+                layout = sample_fleet(size, lengths, random.Random(seed), avoid_edges=True)
+                assert_valid_layout(self, size, lengths, layout)
+
+    def test_impossible_fleets_raise(self):
+        # Le plateau 10x10 ne se pave pas de barres de 4 ; 101 cases ne tiennent pas sur 100
+        for size, lengths in ((10, [4] * 25), (10, [5] * 20 + [1]), (4, [5])):
+            with self.assertRaises(FleetPlacementError):
+                sample_fleet(size, lengths, random.Random(0))
+
+    def test_uniform_mode_does_not_fall_back(self):
+        self.assertIsNone(sample_fleet(10, [5] * 20, random.Random(0), uniform=True, max_rejections=10))
+        layout = sample_fleet(10, [5, 4, 3, 3, 2], random.Random(0), uniform=True)
+        assert_valid_layout(self, 10, [5, 4, 3, 3, 2], layout)
+
+    def test_player_never_keeps_a_partial_fleet(self):
+        ai = AIPlayer("IA", 4, rng=random.Random(0))
+        with self.assertRaises(FleetPlacementError):
+            ai.place_ships()
+        self.assertEqual(ai.own_board.ships, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Tests de l'enregistrement binaire des parties, y compris après un arrêt brutal."""
+import os
+import tempfile
+import unittest
+
+from src.game_record import GameRecordReader, GameRecordWriter
+
+
+def write_game(writer, shots):
+    writer.begin_game(board_size=10, first=0)
+    writer.add_ship(0, 3, (0, 0), "H")
+    writer.add_ship(1, 2, (5, 5), "V")
+    for turn in range(shots):
+        writer.add_shot(turn % 2, (turn % 10, turn // 10), "miss")
+    writer.end_game(winner=None)
+
+
+def crash(writer):
+    """Simule la mort du processus : les parties sont écrites, mais ni l'index ni le pied de page."""
+    writer._file.close()
+
+
+class GameRecordTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".bnr")
+        os.close(handle)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def read_shot_counts(self):
+        with GameRecordReader(self.path) as reader:
+            return [game.shot_count for game in reader], reader.recovered
+
+    def test_round_trip_and_reopen(self):
+        with GameRecordWriter(self.path) as writer:
+            write_game(writer, 3)
+        with GameRecordWriter(self.path) as writer:
+            self.assertEqual(len(writer), 1)
+            write_game(writer, 5)
+        self.assertEqual(self.read_shot_counts(), ([3, 5], False))
+        with GameRecordReader(self.path) as reader:
+            self.assertEqual(reader[1].shot(4).coord, (4, 0))
+            self.assertEqual(reader[0].ships[1].start, (5, 5))
+
+    def test_new_file_without_close_is_readable(self):
+        writer = GameRecordWriter(self.path)
+        write_game(writer, 4)
+        write_game(writer, 6)
+        crash(writer)
+        self.assertEqual(self.read_shot_counts(), ([4, 6], True))
+
+    def test_reopened_file_without_close_keeps_old_games(self):
+        with GameRecordWriter(self.path) as writer:
+            write_game(writer, 2)
+        writer = GameRecordWriter(self.path)
+        write_game(writer, 7)
+        crash(writer)
+        self.assertEqual(self.read_shot_counts(), ([2, 7], True))
+
+    def test_partial_game_is_dropped_and_overwritten(self):
+        writer = GameRecordWriter(self.path)
+        write_game(writer, 4)
+        crash(writer)
+        with open(self.path, "ab") as f:
+            f.write(b"\x0a\x00\x02")  # Début d'en-tête d'une partie interrompue
+        self.assertEqual(self.read_shot_counts(), ([4], True))
+        with GameRecordWriter(self.path) as writer:
+            self.assertEqual(len(writer), 1)
+            write_game(writer, 1)
+        self.assertEqual(self.read_shot_counts(), ([4, 1], False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""IA Monte Carlo : les échantillons respectent les observations et sont tirés uniformément."""
+import itertools
+import random
+import unittest
+
+from src.ai_player import AIPlayer
+from src.monte_carlo_ai import MonteCarloAIPlayer, _LayoutSampler
+from src.placements import placements_for
+
+
+class MonteCarloSamplesTest(unittest.TestCase):
+    def assert_samples_agree(self, ai):
+        target = ai.target_board
+        misses = set(target.miss_indexes())
+        unresolved_hits = set(target.hit_indexes()) - ai.resolved_cells
+        remaining = sorted(ai.probability_counts.remaining_lengths)
+        for occupied, ships in ai.samples:
+            self.assertEqual(sorted(length for length, _ in ships), remaining)
+            cells = [index for length, pid in ships for index in ai._placements[length].cells[pid]]
+            self.assertEqual(len(cells), len(set(cells)))  # aucun chevauchement
+            self.assertEqual(set(cells), occupied)
+            self.assertTrue(occupied.isdisjoint(misses))
+            self.assertTrue(occupied.isdisjoint(ai.resolved_cells))  # navires coulés
+            self.assertTrue(occupied.issuperset(unresolved_hits))
+
+    def test_samples_agree_with_hits_misses_and_sunk_ships(self):
+        for seed in range(4):
+            ai = MonteCarloAIPlayer("IA", 10, sample_count=50, time_budget=None, rng=random.Random(seed))
+            opponent = AIPlayer("Cible", 10, rng=random.Random(seed + 100))
+            opponent.place_ships()
+            board = opponent.own_board
+            while not board.all_ships_sunk():
+                coord = ai.get_shot_coordinates()
+                result = board.receive_shot(coord)
+                ai.target_board.mark_shot(coord, result)
+                ai.process_shot_result(coord, result, sunk_length=board.last_sunk_ship.length if result == 'sunk' else None)
+                self.assert_samples_agree(ai)
+
+    def test_layouts_are_drawn_uniformly(self):
+        size, lengths = 5, [3, 2, 2]
+        placements = {length: placements_for(size, length) for length in set(lengths)}
+        blocked, uncovered = {6, 18}, {12, 13}
+
+        # Toutes les dispositions compatibles, comptées par ensemble de cases occupées
+        expected = {}
+        for pids in itertools.product(*(range(len(placements[length])) for length in lengths)):
+            occupied = set()
+            for length, pid in zip(lengths, pids):
+                cells = placements[length].cells[pid]
+                if not blocked.isdisjoint(cells) or not occupied.isdisjoint(cells):
+                    break
+                occupied.update(cells)
+            else:
+                if occupied.issuperset(uncovered):
+                    key = frozenset(occupied)
+                    expected[key] = expected.get(key, 0) + 1
+        total = sum(expected.values())
+
+        sampler = _LayoutSampler(placements, sorted(lengths, reverse=True), blocked, uncovered, random.Random(1))
+        drawn = []
+        while len(drawn) < 20000:
+            sample = sampler.draw()
+            if sample is not None:
+                drawn.append(sample[0])
+        self.assertTrue(set(drawn) <= set(expected))
+        # La fréquence d'occupation de chaque case suit la loi a posteriori exacte
+        for index in range(size * size):
+            exact = sum(count for cells, count in expected.items() if index in cells) / total
+            observed = sum(index in cells for cells in drawn) / len(drawn)
+            self.assertAlmostEqual(observed, exact, delta=0.015, msg=index)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Les structures creuses des très grands plateaux donnent les mêmes résultats que les denses."""
+import random
+import unittest
+
+from src.coordinate_set import SparseCoordinateSet
+from src.placement_counts import PlacementCounts, SparsePlacementCounts, make_placement_counts
+from src.placements import LARGE_BOARD_SIZE, PlacementRange, PlacementTable
+
+
+def best_cells(counts):
+    """Les cases de densité maximale, trouvées comme le fait la chasse d'AIPlayer."""
+    max_value, best = 0, []
+    for level, cells in counts.candidates():
+        if level < max_value:
+            break
+        for index in cells:
+            value = counts.value(index)
+            if value > max_value:
+                max_value, best = value, [index]
+            elif value == max_value and max_value > 0:
+                best.append(index)
+    return max_value, sorted(best)
+
+
+class SparsePlacementCountsTest(unittest.TestCase):
+    def test_matches_dense_counts(self):
+        for seed in range(60):
+            rng = random.Random(seed)
+            size = rng.choice([5, 8, 10])
+            fleet = rng.choice([[5, 4, 3, 3, 2], [2, 2], [3, 1]])
+            dense, sparse = PlacementCounts(size, fleet), SparsePlacementCounts(size, fleet)
+            cells = list(range(size * size))
+            rng.shuffle(cells)
+            for index in cells[:rng.randrange(len(cells))]:
+                hit = rng.random() < 0.3
+                dense.record_shot(index, hit)
+                sparse.record_shot(index, hit)
+                if rng.random() < 0.05 and dense.remaining_lengths:
+                    length = rng.choice(dense.remaining_lengths)
+                    dense.retire_length(length)
+                    sparse.retire_length(length)
+                self.assertEqual(dense.zobrist, sparse.zobrist)
+            self.assertEqual(dense.grid(), sparse.grid())
+            self.assertEqual(best_cells(dense), best_cells(sparse))
+            self.assertEqual([dense.covering_count(i) for i in range(size * size)],
+                             [sparse.covering_count(i) for i in range(size * size)])
+
+    def test_factory_picks_storage_by_size(self):
+        self.assertIs(type(make_placement_counts(10, [3])), PlacementCounts)
+        self.assertIs(type(make_placement_counts(LARGE_BOARD_SIZE, [3])), SparsePlacementCounts)
+
+    def test_placement_range_covering_matches_table(self):
+        for size, length in ((6, 1), (7, 3), (10, 5), (4, 4)):
+            table, computed = PlacementTable(size, length), PlacementRange(size, length)
+            for index in range(size * size):
+                self.assertEqual(table.placements_covering(index), computed.placements_covering(index))
+
+
+class SparseCoordinateSetTest(unittest.TestCase):
+    def test_remove_until_empty(self):
+        rng = random.Random(3)
+        size = 5
+        coords = SparseCoordinateSet(size)
+        cells = [(r, c) for r in range(size) for c in range(size)]
+        rng.shuffle(cells)
+        for removed, cell in enumerate(cells):
+            self.assertEqual(set(coords), set(cells[removed:]))
+            self.assertEqual(len(coords.parity(0)) + len(coords.parity(1)), size * size - removed)
+            parity_class = coords.larger_parity()
+            choice = parity_class.choice(rng)
+            self.assertIn(choice, coords)
+            self.assertIn(choice, parity_class)
+            coords.remove(cell)
+        self.assertFalse(coords)
+        self.assertIsNone(coords.larger_parity())
+        with self.assertRaises(ValueError):
+            coords.remove(cells[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Tests du serveur de parties, avec un vrai client sur la boucle locale."""
+import asyncio
+import json
+import unittest
+
+from src.server import GameServer
+
+
+class ServerLoopbackTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = GameServer(idle_timeout=10)
+        listener = await self.server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self.server.close()
+
+    async def send(self, message):
+        self.writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        await self.writer.drain()
+
+    async def receive(self):
+        line = await asyncio.wait_for(self.reader.readline(), 10)
+        self.assertTrue(line, "le serveur a fermé la connexion")
+        return json.loads(line)
+
+    async def request(self, message):
+        """Envoie un message puis un "state", et retourne les réponses jusqu'à l'état inclus."""
+        await self.send(message)
+        await self.send({"type": "state"})
+        replies = []
+        while not replies or replies[-1]["type"] != "state":
+            replies.append(await self.receive())
+        return replies
+
+    async def new_game(self, **options):
+        await self.send(dict({"type": "new", "seed": 1}, **options))
+        return await self.receive()
+
+    async def test_full_game(self):
+        started = await self.new_game()
+        self.assertEqual(started["type"], "started")
+        size = started["board_size"]
+
+        winner = None
+        for r in range(size):
+            for c in range(size):
+                replies = await self.request({"type": "shoot", "coord": [r, c]})
+                kinds = [reply["type"] for reply in replies]
+                self.assertEqual(kinds[0], "shot")
+                self.assertNotIn("error", kinds)
+                if "game_over" in kinds:
+                    winner = replies[kinds.index("game_over")]["winner"]
+                    break
+            if winner is not None:
+                break
+
+        self.assertIsNotNone(winner)
+        state = replies[-1]
+        self.assertEqual(state["winner"], winner)
+        self.assertTrue(state["remaining"] == 0 or state["ai_remaining"] == 0)
+        # Une partie terminée refuse les tirs, sans fermer la connexion
+        replies = await self.request({"type": "shoot", "coord": [0, 0]})
+        self.assertEqual(replies[0]["type"], "error")
+        self.assertEqual(replies[-1]["type"], "state")
+
+    async def test_invalid_shots_are_errors(self):
+        await self.new_game()
+        for coord in ([-1, 3], [0, 10], "12", [1], [1, 2, 3], ["a", 0], [True, 0], None):
+            replies = await self.request({"type": "shoot", "coord": coord})
+            self.assertEqual([reply["type"] for reply in replies], ["error", "state"], coord)
+            self.assertEqual(replies[-1]["shots"], [])
+
+    async def test_invalid_fleets_are_errors(self):
+        fleet = [{"start": [r, 0], "orientation": "H"} for r in range(5)]
+        for bad_entry in ({"start": ["a", 0], "orientation": "H"},
+                          {"start": [-1, 0], "orientation": "H"},
+                          {"start": [0, 0], "orientation": "X"},
+                          {"start": [0, 0]},
+                          "navire"):
+            reply = await self.new_game(fleet=[bad_entry] + fleet[1:])
+            self.assertEqual(reply["type"], "error", bad_entry)
+        # La connexion sert encore, sans partie créée
+        await self.send({"type": "state"})
+        self.assertEqual((await self.receive())["type"], "error")
+
+    async def test_valid_fleet_and_unknown_messages(self):
+        fleet = [{"start": [2 * r, 0], "orientation": "H"} for r in range(5)]
+        started = await self.new_game(fleet=fleet)
+        self.assertEqual(started["type"], "started")
+        self.assertEqual([ship["coords"][0] for ship in started["fleet"]], [[2 * r, 0] for r in range(5)])
+        await self.send({"type": "teleport"})
+        self.assertEqual((await self.receive())["type"], "error")
+        await self.send({"type": "new", "board_size": 1000})
+        self.assertEqual((await self.receive())["type"], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
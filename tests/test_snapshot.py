@@ -0,0 +1,55 @@
+"""Instantanés de partie : une partie reprise continue exactement comme l'originale."""
+import random
+import unittest
+
+from src.ai_player import AIPlayer
+from src.events import EventBus
+from src.game import Game, resolve_shot
+from src.simulation import RandomPlayer
+from src.snapshot import GAME_HEADER, VERSION, dump_game, load_game
+
+
+def new_game(seed):
+    events = EventBus()
+    ai = AIPlayer("IA", 10, events=events, rng=random.Random(seed))
+    opponent = RandomPlayer("Aléatoire", 10, events=events, rng=random.Random(seed + 1))
+    ai.place_ships()
+    opponent.place_ships()
+    return Game.from_players(ai, opponent, events=events)
+
+
+def play(game, turns=None):
+    """Joue `turns` tirs (par défaut jusqu'à la fin) et retourne (tireur, case, résultat) de chacun."""
+    log = []
+    while turns is None or len(log) < turns:
+        if game.player_human.has_lost() or game.player_ai.has_lost():
+            break
+        shooter, target = game.current_player, game.opponent_player
+        coord = shooter.get_shot_coordinates(opponent_remaining_hp=target.get_remaining_ship_hp())
+        log.append((shooter.name, coord, resolve_shot(shooter, target, coord)))
+        game.current_player, game.opponent_player = target, shooter
+    return log
+
+
+class SnapshotTest(unittest.TestCase):
+    def test_loaded_game_continues_identically(self):
+        for seed in range(3):
+            game = new_game(seed)
+            play(game, turns=25 + 10 * seed)
+            copy = load_game(dump_game(game))
+            self.assertIsNot(copy.player_ai.own_board, game.player_ai.own_board)
+            self.assertEqual(play(copy), play(game))
+            self.assertEqual(dump_game(copy), dump_game(game))
+
+    def test_unknown_version_is_rejected(self):
+        data = dump_game(new_game(0))
+        magic, _, current, reserved = GAME_HEADER.unpack_from(data)
+        newer = GAME_HEADER.pack(magic, VERSION + 1, current, reserved) + data[GAME_HEADER.size:]
+        with self.assertRaises(ValueError):
+            load_game(newer)
+        with self.assertRaises(ValueError):
+            load_game(b"XXXX" + data[4:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""Solveur de ciblage par grappes : prolonger les lignes, séparer les navires collés, abandonner l'inexplicable."""
+import unittest
+
+from src.board import Board
+from src.target_solver import ClusterTargetSolver
+
+
+def solver_with_hits(hits, misses=()):
+    board = Board(10)
+    solver = ClusterTargetSolver(10)
+    for coord in hits:
+        board.mark_shot(coord, 'hit')
+        solver.record_hit(coord)
+    for coord in misses:
+        board.mark_shot(coord, 'miss')
+    return board, solver
+
+
+class ClusterTargetSolverTest(unittest.TestCase):
+    def test_line_is_extended_at_both_ends(self):
+        board, solver = solver_with_hits([(4, 4), (4, 5)])
+        self.assertEqual(solver.best_targets(board, [5, 4, 3, 3, 2]), [(4, 3), (4, 6)])
+        board.mark_shot((4, 6), 'miss')
+        self.assertEqual(solver.best_targets(board, [5, 4, 3, 3, 2]), [(4, 3)])
+
+    def test_sunk_ship_leaves_adjacent_hits_targeted(self):
+        board, solver = solver_with_hits([(2, 2), (2, 3), (2, 4), (3, 4)])
+        self.assertEqual(solver.clusters(), [[(2, 2), (2, 3), (2, 4), (3, 4)]])
+        self.assertEqual(solver.record_sunk((2, 4), 3), [(2, 2), (2, 3), (2, 4)])
+        self.assertEqual(solver.unresolved, {(3, 4)})
+        # (2, 4) est tirée : le navire touché en (3, 4) ne peut que descendre ou s'étendre en ligne
+        self.assertEqual(solver.best_targets(board, [5, 4, 2]), [(3, 3), (3, 5)])
+
+    def test_unexplained_cluster_is_dropped(self):
+        board, solver = solver_with_hits([(0, 0)], misses=[(0, 1), (1, 0)])
+        self.assertEqual(solver.best_targets(board, [3]), [])
+        self.assertEqual((solver.unresolved, solver.resolved), (set(), {(0, 0)}))
+
+    def test_all_clusters_are_scored_together(self):
+        board, solver = solver_with_hits([(0, 0), (9, 9)], misses=[(0, 1), (9, 8)])
+        self.assertEqual(solver.best_targets(board, [2]), [(1, 0)])
+        self.assertEqual(solver.best_targets(board, [2], all_clusters=True), [(1, 0), (8, 9)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Table de transposition : limites de l'LRU, hachage de Zobrist et réutilisation par l'IA."""
+import itertools
+import random
+import unittest
+
+from src.ai_player import AIPlayer
+from src.placement_counts import PlacementCounts
+from src.transposition import ENTRY_OVERHEAD_BYTES, TranspositionTable
+
+
+class TranspositionTableTest(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        table = TranspositionTable(max_entries=2)
+        table.put("a", 1)
+        table.put("b", 2)
+        self.assertEqual(table.get("a"), 1)  # "b" devient la moins récemment utilisée
+        table.put("c", 3)
+        self.assertIsNone(table.get("b"))
+        self.assertEqual((table.get("a"), table.get("c")), (1, 3))
+        self.assertEqual(len(table), 2)
+        self.assertEqual((table.hits, table.misses), (3, 1))
+        self.assertAlmostEqual(table.hit_rate, 0.75)
+
+    def test_byte_limit(self):
+        table = TranspositionTable(max_bytes=3 * (ENTRY_OVERHEAD_BYTES + 100))
+        for key in range(5):
+            table.put(key, key, nbytes=100)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.nbytes, 3 * (ENTRY_OVERHEAD_BYTES + 100))
+        self.assertIsNone(table.get(1))
+        # Remplacer une position ne compte pas deux fois sa taille
+        table.put(4, "nouveau", nbytes=100)
+        self.assertEqual(table.nbytes, 3 * (ENTRY_OVERHEAD_BYTES + 100))
+        # Un résultat plus gros que toute la table n'est pas gardé, et n'évince rien
+        table.put("énorme", 0, nbytes=table.max_bytes)
+        self.assertEqual(len(table), 3)
+        self.assertIsNone(table.get("énorme"))
+
+    def test_disabled_table(self):
+        table = TranspositionTable(max_entries=0)
+        table.put("a", 1)
+        self.assertIsNone(table.get("a"))
+        self.assertEqual(table.stats()["entries"], 0)
+
+
+class ZobristHashTest(unittest.TestCase):
+    def test_hash_depends_on_position_not_on_move_order(self):
+        shots = [(3, True), (17, False), (42, False), (8, True)]
+        hashes = set()
+        for order in itertools.permutations(shots):
+            counts = PlacementCounts(7, [3, 2, 2])
+            for index, hit in order:
+                counts.record_shot(index, hit)
+            counts.retire_length(2)
+            hashes.add(counts.zobrist)
+        self.assertEqual(len(hashes), 1)
+
+    def test_distinct_positions_do_not_collide(self):
+        # Toutes les positions de deux tirs (résultats et navire coulé compris) sur un 5x5
+        seen = {}
+        for (a, b), results, retired in itertools.product(
+                itertools.combinations(range(25), 2), itertools.product((False, True), repeat=2), (None, 3, 2)):
+            counts = PlacementCounts(5, [3, 2])
+            counts.record_shot(a, results[0])
+            counts.record_shot(b, results[1])
+            if retired is not None:
+                counts.retire_length(retired)
+            position = (a, b, results, retired)
+            self.assertEqual(seen.setdefault(counts.zobrist, position), position)
+
+
+class AIPlayerCacheTest(unittest.TestCase):
+    def play(self, table, seed):
+        ai = AIPlayer("IA", 10, rng=random.Random(seed), transposition_table=table)
+        shots = []
+        for _ in range(30):
+            coord = ai.get_shot_coordinates()
+            ai.target_board.mark_shot(coord, 'miss')
+            ai.process_shot_result(coord, 'miss')
+            shots.append(coord)
+        return shots
+
+    def test_cached_positions_give_the_same_shots(self):
+        table = TranspositionTable()
+        first = self.play(table, seed=5)
+        self.assertEqual(table.hits, 0)
+        self.assertEqual(self.play(table, seed=5), first)
+        self.assertGreater(table.hits, 0)
+        self.assertEqual(self.play(TranspositionTable(max_entries=0), seed=5), first)
+
+
+if __name__ == "__main__":
+    unittest.main()